@@ -4,12 +4,26 @@ __author__ = """Qiusheng Wu"""
 __email__ = "giswqs@gmail.com"
 __version__ = "0.38.3.post0"
 
+import importlib
+import importlib.util
 import os
 import sys
+import threading
+from typing import Any
 
 import eerepr
 
-from .report import Report
+# The map backend (geemap.geemap or geemap.foliumap) pulls in common, conversion,
+# timelapse, plot and their heavy dependencies, so it is only imported on the first
+# access to one of its names, e.g., geemap.Map.
+_backend = None
+_backend_lock = threading.RLock()
+
+# Attributes provided by a submodule other than the backend.
+_LAZY_ATTRS = {"Report": ".report"}
+
+# Submodule names that the backend shadows with another object.
+_BACKEND_NAMES = {"basemaps"}
 
 
 def in_colab_shell() -> bool:
@@ -27,23 +41,70 @@ def _use_eerepr(token: str = "USE_EEREPR") -> bool:
     return os.environ.get(token) is None
 
 
-if use_folium():
-    from .foliumap import *
-else:
-    try:
-        from .geemap import *
-    except Exception as e:
-        if in_colab_shell():
-            print(
-                "Please restart Colab runtime after installation if you encounter any "
-                "errors when importing geemap."
-            )
-        else:
-            print(
-                "Please restart Jupyter kernel after installation if you encounter any "
-                "errors when importing geemap."
-            )
-        raise e
+def _public_names(module) -> list[str]:
+    """Returns the names exported by `from module import *`."""
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    return list(names)
+
+
+def _load_backend():
+    """Imports the map backend and exports its names from the package."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+        try:
+            if use_folium():
+                module = importlib.import_module(".foliumap", __name__)
+            else:
+                module = importlib.import_module(".geemap", __name__)
+        except Exception as e:
+            if in_colab_shell():
+                print(
+                    "Please restart Colab runtime after installation if you encounter "
+                    "any errors when importing geemap."
+                )
+            else:
+                print(
+                    "Please restart Jupyter kernel after installation if you encounter "
+                    "any errors when importing geemap."
+                )
+            raise e
+        names = _public_names(module)
+        globals().update({name: getattr(module, name) for name in names})
+        _backend = module
+        return module
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__all__":
+        _load_backend()
+        return [name for name in globals() if not name.startswith("_")] + list(
+            _LAZY_ATTRS
+        )
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+
+    if name not in _BACKEND_NAMES and importlib.util.find_spec(f".{name}", __name__):
+        return importlib.import_module(f".{name}", __name__)
+
+    _load_backend()
+    if name in globals():
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    _load_backend()
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 if _use_eerepr():
     eerepr.initialize()
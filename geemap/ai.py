@@ -6,9 +6,11 @@ The DataExplorer class source code is adapted from <https://bit.ly/48cE24D>.
 Credit to the original author Renee Johnston (<https://github.com/raj02006>)
 """
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from concurrent import futures
 from contextlib import redirect_stdout
+import functools
+import hashlib
 import io
 import json
 import math
@@ -50,8 +52,10 @@ try:
     from langchain.indexes.vectorstore import VectorStoreIndexWrapper
     from langchain_core.language_models.base import BaseLanguageModel
 except ImportError:
-    print("Please install the required packages.")
-    print("pip install 'geemap[ai]'")
+    raise ImportError(
+        "The ai module needs the packages of the geemap[ai] extra. "
+        "Use \"pip install 'geemap[ai]'\" to install them."
+    )
 
 import iso8601
 import tenacity
@@ -771,7 +775,7 @@ def matches_datetime(
     wait=tenacity.wait_fixed(1),
     retry=tenacity.retry_if_exception_type(LayerException),
 )
-def run_ee_code(code: str, ee: Any, geemap_instance: Map) -> None:
+def run_ee_code(code: str, ee: Any, geemap_instance: geemap.Map) -> None:
     """Executes Earth Engine Python code within the context of a geemap instance.
 
     Args:
@@ -1374,6 +1378,23 @@ class Catalog:
 # @title Embeddings classes and helper methods
 
 
+@functools.lru_cache(maxsize=None)
+def _text_embedding_model(
+    model_name: str = "google/text-embedding-004",
+) -> TextEmbeddingModel:
+    """Returns the text embedding model, loaded on first use."""
+    return TextEmbeddingModel.from_pretrained(model_name)
+
+
+def embed_query(text: str) -> list[float]:
+    """Returns the embedding of a query, comparable to the catalog embeddings.
+
+    Args:
+        text: The query text to embed.
+    """
+    return _text_embedding_model().get_embeddings([text])[0].values
+
+
 class PrecomputedEmbeddings(Embeddings):
     """Class for handling precomputed embeddings."""
 
@@ -1384,7 +1405,11 @@ class PrecomputedEmbeddings(Embeddings):
             embeddings_dict: A dictionary mapping texts to their embeddings.
         """
         self.embeddings_dict = embeddings_dict
-        self.model = TextEmbeddingModel.from_pretrained("google/text-embedding-004")
+
+    @property
+    def model(self) -> TextEmbeddingModel:
+        """The model used to embed queries, loaded on first use."""
+        return _text_embedding_model()
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embeds a list of documents.
@@ -1439,12 +1464,140 @@ def make_langchain_index(embeddings_df: pd.DataFrame) -> VectorStoreIndexWrapper
     return index_creator.from_documents(documents)
 
 
+class DatasetEmbeddingIndex:
+    """A NumPy index of the catalog embeddings for cosine similarity search.
+
+    The embeddings are stored as a matrix of unit-length float32 rows, so the scores
+    of all datasets are a single matrix-vector product with the query embedding.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        embeddings: np.ndarray,
+        embed_query_fn: Callable[[str], Sequence[float]] | None = None,
+        normalized: bool = False,
+    ) -> None:
+        """Initializes the DatasetEmbeddingIndex.
+
+        Args:
+            ids: The dataset IDs, one per row of `embeddings`.
+            embeddings: The embeddings matrix.
+            embed_query_fn: The function that embeds query texts. Defaults to
+                `embed_query`.
+            normalized: Whether the rows of `embeddings` are already unit-length
+                float32, e.g., when memory-mapped from a saved index. Otherwise they
+                are normalized in memory. Defaults to False.
+        """
+        if not normalized:
+            embeddings = _normalize_rows(embeddings)
+        self.ids = np.asarray(ids, dtype=object)
+        self.embeddings = embeddings
+        self.embed_query_fn = embed_query_fn or embed_query
+        self._positions = {dataset_id: i for i, dataset_id in enumerate(ids)}
+
+    @classmethod
+    def from_df(
+        cls,
+        embeddings_df: pd.DataFrame,
+        embed_query_fn: Callable[[str], Sequence[float]] | None = None,
+    ) -> "DatasetEmbeddingIndex":
+        """Creates an index from a dataframe with id and embedding columns."""
+        embeddings = np.array(embeddings_df["embedding"].tolist())
+        return cls(embeddings_df["id"].tolist(), embeddings, embed_query_fn)
+
+    @classmethod
+    def from_jsonl(
+        cls,
+        path: str,
+        embed_query_fn: Callable[[str], Sequence[float]] | None = None,
+    ) -> "DatasetEmbeddingIndex":
+        """Creates an index from a JSON lines file of precomputed embeddings.
+
+        The matrix is saved to the geemap cache directory, keyed by the file content,
+        and later indexes of the same file memory-map it instead of parsing the JSON.
+
+        Args:
+            path: The JSON lines file, with id and embedding fields.
+            embed_query_fn: The function that embeds query texts.
+        """
+        with open(path, "rb") as f:
+            key = hashlib.sha256(f.read()).hexdigest()
+        cache_path = os.path.join(coreutils.get_cache_dir("ai"), f"embeddings-{key}")
+        try:
+            return cls.load(cache_path, embed_query_fn)
+        except (OSError, ValueError):
+            index = cls.from_df(pd.read_json(path, lines=True), embed_query_fn)
+            try:
+                index.save(cache_path)
+                return cls.load(cache_path, embed_query_fn)
+            except OSError:
+                return index  # The cache is an optimization.
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embed_query_fn: Callable[[str], Sequence[float]] | None = None,
+    ) -> "DatasetEmbeddingIndex":
+        """Loads an index saved with `save`, memory-mapping the embeddings."""
+        with open(f"{path}.ids.json", encoding="utf-8") as f:
+            ids = json.load(f)
+        embeddings = np.load(f"{path}.npy", mmap_mode="r")
+        if len(ids) != len(embeddings):
+            raise ValueError(f"The index at {path} is incomplete.")
+        return cls(ids, embeddings, embed_query_fn, normalized=True)
+
+    def save(self, path: str) -> None:
+        """Saves the index to `{path}.npy` and `{path}.ids.json`."""
+        tmp_suffix = f".{os.getpid()}.tmp"
+        np.save(f"{path}{tmp_suffix}.npy", np.asarray(self.embeddings))
+        with open(f"{path}.ids.json{tmp_suffix}", "w", encoding="utf-8") as f:
+            json.dump(self.ids.tolist(), f)
+        os.replace(f"{path}{tmp_suffix}.npy", f"{path}.npy")
+        os.replace(f"{path}.ids.json{tmp_suffix}", f"{path}.ids.json")
+
+    def search(
+        self, query: str, k: int, ids: Iterable[str] | None = None
+    ) -> list[tuple[str, float]]:
+        """Returns the k datasets most similar to a query and their scores.
+
+        Args:
+            query: The query text.
+            k: The number of datasets to return.
+            ids: If set, only these datasets are considered.
+
+        Returns:
+            The dataset IDs and their cosine similarity, most similar first.
+        """
+        query_vector = _normalize_rows(
+            np.asarray(self.embed_query_fn(query))[np.newaxis, :]
+        )[0]
+        scores = self.embeddings @ query_vector
+        if ids is not None:
+            positions = [self._positions[i] for i in ids if i in self._positions]
+            candidates = np.array(positions, dtype=np.int64)
+        else:
+            candidates = np.arange(len(scores))
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in candidates]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Returns the rows of a matrix scaled to unit length, as float32."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
 # Wrap Langchain embeddings in our own EE dataset wrapper.
 class EarthEngineDatasetIndex:
     """Class for indexing and searching Earth Engine datasets."""
 
-    index: VectorStoreIndexWrapper
-    vectorstore: VectorStore
+    index: "DatasetEmbeddingIndex | VectorStoreIndexWrapper"
     data_catalog: Catalog
     llm: BaseLanguageModel
 
@@ -1453,14 +1606,70 @@ class EarthEngineDatasetIndex:
 
         Args:
             data_catalog (Catalog): The data catalog containing the datasets.
-            index (VectorStoreIndexWrapper): The vector store index wrapper.
+            index (DatasetEmbeddingIndex | VectorStoreIndexWrapper): The embeddings
+                index of the catalog.
             llm (BaseLanguageModel): The language model for query processing.
         """
         self.index = index
         self.data_catalog = data_catalog
-        self.vectorstore = index.vectorstore
         self.llm = llm
 
+    @property
+    def vectorstore(self) -> VectorStore | None:
+        """The langchain vector store of the index, if it has one."""
+        return getattr(self.index, "vectorstore", None)
+
+    def _candidates(
+        self,
+        bounding_box: list[float] | None,
+        temporal_interval: tuple[datetime.datetime, datetime.datetime] | None,
+    ) -> CollectionList:
+        """Returns the collections that match the spatial and temporal filters."""
+        collections = self.data_catalog.collections
+        if bounding_box is not None:
+            collections = collections.filter_by_bounding_box(
+                BBox.from_list(bounding_box)
+            )
+        if temporal_interval is not None:
+            collections = collections.filter_by_interval(temporal_interval)
+        return collections
+
+    def _search(
+        self,
+        query: str,
+        results: int,
+        bounding_box: list[float] | None = None,
+        temporal_interval: tuple[datetime.datetime, datetime.datetime] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Returns the IDs and scores of the best matches, best first."""
+        ids = None
+        if bounding_box is not None or temporal_interval is not None:
+            candidates = self._candidates(bounding_box, temporal_interval)
+            ids = {c.public_id() for c in candidates}
+        if isinstance(self.index, DatasetEmbeddingIndex):
+            return self.index.search(query, results, ids)
+
+        # A langchain store cannot be restricted to the candidates, so the filters
+        # are applied to its matches.
+        similar_docs = self.index.vectorstore.similarity_search_with_score(
+            query, llm=self.llm, k=results
+        )
+        return [
+            (doc.page_content, score)
+            for doc, score in similar_docs
+            if ids is None or doc.page_content in ids
+        ]
+
+    def _collections_by_id(self, dataset_ids: Sequence[str]) -> CollectionList:
+        """Returns the catalog collections with the given IDs, in the same order."""
+        wanted = set(dataset_ids)
+        by_id = {
+            c.public_id(): c
+            for c in self.data_catalog.collections
+            if c.public_id() in wanted
+        }
+        return CollectionList([by_id[i] for i in dataset_ids if i in by_id])
+
     @tenacity.retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -1489,16 +1698,12 @@ class EarthEngineDatasetIndex:
                 Defaults to None.
 
         Returns:
-            A list of collections that match the query.
+            A list of collections that match the query, best match first.
         """
-        del threshold, bounding_box, temporal_interval  # Unused.
+        del threshold  # Unused.
 
-        similar_docs = self.index.vectorstore.similarity_search_with_score(
-            query, llm=self.llm, k=results
-        )
-        dataset_ids = [doc[0].page_content for doc in similar_docs]
-        datasets = self.data_catalog.collections.filter_by_ids(dataset_ids)
-        return datasets
+        matches = self._search(query, results, bounding_box, temporal_interval)
+        return self._collections_by_id([dataset_id for dataset_id, _ in matches])
 
     @tenacity.retry(
         stop=stop_after_attempt(3),
@@ -1536,7 +1741,7 @@ class EarthEngineDatasetIndex:
             query, results, bounding_box, temporal_interval
         )
         dataset_ids = scores_df["id"].tolist()
-        col_list = self.data_catalog.collections.filter_by_ids(dataset_ids)
+        col_list = self._collections_by_id(dataset_ids)
         collection_df = col_list.to_df()
         df = pd.merge(collection_df, scores_df, on="id", how="inner")
         return df.sort_values(by="match_score", ascending=False)
@@ -1561,16 +1766,8 @@ class EarthEngineDatasetIndex:
         Returns:
             A DataFrame containing the dataset IDs and their match scores.
         """
-        del bounding_box, temporal_interval  # Unused.
-
-        similar_docs = self.index.vectorstore.similarity_search_with_score(
-            query, llm=self.llm, k=results
-        )
-        dataset_ids, scores = zip(
-            *[(doc[0].page_content, doc[1]) for doc in similar_docs]
-        )
-
-        return pd.DataFrame({"id": dataset_ids, "match_score": scores})
+        matches = self._search(query, results, bounding_box, temporal_interval)
+        return pd.DataFrame(matches, columns=["id", "match_score"])
 
 
 def explain_relevance(
@@ -1696,7 +1893,10 @@ class CodeThoughts(typing_extensions.TypedDict):
     ),
 )
 def fix_ee_python_code(
-    code: str, ee: Any, geemap_instance: Map, model_name: str = "gemini-3-pro-preview"
+    code: str,
+    ee: Any,
+    geemap_instance: geemap.Map,
+    model_name: str = "gemini-3-pro-preview",
 ) -> str:
     """Asks a model to do ee python code correction in the event of error.
 
@@ -1777,7 +1977,7 @@ class DatasetSearchInterface:
     code_output: ipywidgets.Widget
     details_output: ipywidgets.Widget
     map_output: ipywidgets.Widget
-    geemap_instance: Map
+    geemap_instance: geemap.Map
 
     # Parent containers for controlling widget visibility.
     details_code_box: ipywidgets.Widget
@@ -2148,19 +2348,15 @@ class DatasetExplorer:
             blob.download_to_filename(local_path)
             return local_path
 
-        # Load our embeddings data into a dataframe:
-        local_path = load_embeddings(EMBEDDINGS_CLOUD_PATH, EMBEDDINGS_LOCAL_PATH)
-        embeddings_df = pd.read_json(local_path, lines=True)
-
         llm = ChatGoogleGenerativeAI(
             model=model, google_api_key=coreutils.get_env_var(google_api_key)
         )
 
+        # Load our embeddings into a NumPy index, cached by the file content.
         local_path = load_embeddings(EMBEDDINGS_CLOUD_PATH, EMBEDDINGS_LOCAL_PATH)
-        embeddings_df = pd.read_json(local_path, lines=True)
-        langchain_index = make_langchain_index(embeddings_df)
+        embeddings_index = DatasetEmbeddingIndex.from_jsonl(local_path)
 
-        self.ee_index = EarthEngineDatasetIndex(catalog, langchain_index, llm)
+        self.ee_index = EarthEngineDatasetIndex(catalog, embeddings_index, llm)
 
     def show(self, query: str | None = None, **kwargs) -> ipywidgets.VBox:
         """Displays a query interface for searching datasets.
@@ -20,9 +20,15 @@ More WMS basemaps can be found at the following websites:
 # pylint: disable=line-too-long
 
 import collections
+from collections.abc import Callable, Iterator, Mapping
+import functools
+import json
 import os
+import threading
+import types
 from typing import Any
 
+import box
 import folium
 import ipyleaflet
 import requests
@@ -380,9 +386,68 @@ def get_google_map_tile_providers(
     return gmap_providers
 
 
+def _xyz_index_file(free_only: bool, france: bool) -> str:
+    """Returns the cache file of the xyzservices index for the installed version."""
+    version = getattr(xyzservices, "__version__", "unknown")
+    return os.path.join(
+        coreutils.get_cache_dir("basemaps", make_dirs=False),
+        f"xyz-{version}-{int(free_only)}-{int(france)}.json",
+    )
+
+
+def _build_xyz_index(free_only: bool, france: bool) -> list[tuple[str, dict]]:
+    """Flattens and filters the xyzservices providers, sorted by key."""
+    xyz_bunch = xyzservices.providers
+
+    if free_only:
+        xyz_bunch = xyz_bunch.filter(requires_token=False)
+    if not france:
+        xyz_bunch = xyz_bunch.filter(
+            function=lambda tile: "france" not in dict(tile)["name"].lower()
+        )
+
+    index = []
+    for key, value in sorted(xyz_bunch.flatten().items()):
+        tile = dict(value)
+        if "type" not in tile:
+            tile["type"] = "xyz"
+        index.append((key, tile))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _xyz_index(
+    free_only: bool = True, france: bool = False
+) -> tuple[tuple[str, Mapping[str, Any]], ...]:
+    """Returns the immutable xyzservices index, built once per process.
+
+    The index is also saved to the geemap cache directory, keyed by the xyzservices
+    version, so later sessions load it instead of walking the provider catalog.
+    """
+    path = _xyz_index_file(free_only, france)
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = [(key, tile) for key, tile in json.load(f)]
+    except (OSError, ValueError):
+        index = _build_xyz_index(free_only, france)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError):
+            pass
+
+    return tuple((key, types.MappingProxyType(tile)) for key, tile in index)
+
+
 def get_xyz_dict(free_only: bool = True, france: bool = False) -> dict[str, Any]:
     """Returns a dictionary of xyz services.
 
+    The providers are read from an index built once per process, and each call
+    returns new TileProvider objects that can be modified freely.
+
     Args:
         free_only: Whether to return only free xyz tile services that do not require an
             access token.
@@ -391,25 +456,55 @@ def get_xyz_dict(free_only: bool = True, france: bool = False) -> dict[str, Any]
     Returns:
         dict: A dictionary of xyz services.
     """
-    xyz_bunch = xyzservices.providers
+    return collections.OrderedDict(
+        (key, xyzservices.TileProvider(dict(tile)))
+        for key, tile in _xyz_index(free_only, france)
+    )
 
-    if free_only:
-        xyz_bunch = xyz_bunch.filter(requires_token=False)
-    if not france:
-        xyz_bunch = xyz_bunch.filter(
-            function=lambda tile: "france" not in dict(tile)["name"].lower()
-        )
 
-    xyz_dict = xyz_bunch.flatten()
+class LazyBasemaps(Mapping):
+    """A read-only basemap registry that is built on first use.
 
-    for key, value in xyz_dict.items():
-        tile = xyzservices.TileProvider(value)
-        if "type" not in tile:
-            tile["type"] = "xyz"
-        xyz_dict[key] = tile
+    Building a registry iterates the whole xyzservices catalog, so the map modules
+    defer it until a basemap is looked up. Items and attributes are read from the
+    built registry, so it can be used like the box.Box it wraps.
+    """
 
-    xyz_dict = collections.OrderedDict(sorted(xyz_dict.items()))
-    return xyz_dict
+    def __init__(self, factory: Callable[[], dict[str, Any]], frozen: bool = True):
+        """Initializes the registry.
+
+        Args:
+            factory: A function returning the basemap dictionary, e.g., xyz_to_leaflet.
+            frozen: Whether to wrap the dictionary in a frozen box.Box.
+        """
+        self._factory = factory
+        self._frozen = frozen
+        self._registry = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Mapping[str, Any]:
+        if self._registry is None:
+            with self._lock:
+                if self._registry is None:
+                    registry = self._factory()
+                    if self._frozen:
+                        registry = box.Box(registry, frozen_box=True)
+                    self._registry = registry
+        return self._registry
+
+    def __getitem__(self, key: str) -> Any:
+        return self._get()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get())
+
+    def __len__(self) -> int:
+        return len(self._get())
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._get(), name)
 
 
 def xyz_to_leaflet() -> dict[str, Any]:
@@ -578,6 +673,12 @@ def xyz_to_plotly() -> dict[str, Any]:
     return plotly_dict
 
 
+# Basemap registries shared by all map instances of each backend.
+leaflet_basemaps = LazyBasemaps(xyz_to_leaflet)
+folium_basemaps = LazyBasemaps(xyz_to_folium)
+plotly_basemaps = LazyBasemaps(xyz_to_plotly, frozen=False)
+
+
 def search_qms(keywords: str, limit: int = 10) -> list[Any] | None:
     """Search qms files for keywords.
 
@@ -5,8 +5,10 @@
 # The geemap community will maintain the extra features.                         #
 # *******************************************************************************#
 
+import collections
 from collections.abc import Iterable
 import io
+import multiprocessing as mp
 import os
 from typing import Any
 import warnings
@@ -30,7 +32,7 @@ import numpy as np
 from PIL import Image
 import requests
 
-from . import basemaps
+from .basemaps import custom_tiles
 from . import common
 
 
@@ -83,7 +85,7 @@ def get_map(
         if isinstance(basemap, str):
             if basemap.upper() in ["ROADMAP", "SATELLITE", "TERRAIN", "HYBRID"]:
                 basemap = cimgt.GoogleTiles(
-                    url=basemaps.custom_tiles["xyz"][basemap.upper()]["url"]
+                    url=custom_tiles["xyz"][basemap.upper()]["url"]
                 )
 
         try:
@@ -130,6 +132,40 @@ def add_layer(
         ValueError: If `imgObj` is not of type ee.Image.
         ValueError: If `ax` if not of type cartopy.mpl.geoaxes.GeoAxesSubplot.
     """
+    if not isinstance(ax, (GeoAxes, GeoAxesSubplot)):
+        raise ValueError(
+            "provided axes not of type cartopy.mpl.geoaxes.GeoAxes "
+            "or cartopy.mpl.geoaxes.GeoAxesSubplot"
+        )
+
+    image, view_extent = _fetch_layer(
+        ee_object, dims, region, cmap, vis_params, **kwargs
+    )
+    _show_layer(ax, image, view_extent)
+
+
+def _fetch_layer(
+    ee_object,
+    dims=1000,
+    region=None,
+    cmap: str | None = None,
+    vis_params=None,
+    **kwargs,
+) -> tuple[np.ndarray, list[float]]:
+    """Downloads an Earth Engine object as an RGB(A) array for add_layer().
+
+    Args:
+        ee_object (ee.Image | ee.FeatureCollection): Earth Engine image result to plot.
+        dims (list | tuple | int, optional): dimensions to request earth engine result
+            as [WIDTH,HEIGHT].
+        region (list | tuple, optional): Geospatial region of the image to render in
+            format [E,S,W,N]. By default, the whole image.
+        cmap: String specifying matplotlib colormap to colorize image.
+        vis_params (dict, optional): visualization parameters as a dictionary.
+
+    Returns:
+        The image array and its extent as [W, E, S, N].
+    """
     if isinstance(ee_object, (ee.Geometry, ee.Feature, ee.FeatureCollection)):
         features = ee.FeatureCollection(ee_object)
 
@@ -169,12 +205,6 @@ def add_layer(
     if not isinstance(dims, (list, tuple, int)):
         raise ValueError("provided dims not of type list, tuple, or int")
 
-    if not isinstance(ax, (GeoAxes, GeoAxesSubplot)):
-        raise ValueError(
-            "provided axes not of type cartopy.mpl.geoaxes.GeoAxes "
-            "or cartopy.mpl.geoaxes.GeoAxesSubplot"
-        )
-
     args = {"format": "png", "crs": "EPSG:4326"}
     args["region"] = map_region
     if dims:
@@ -207,6 +237,11 @@ def add_layer(
             [np.repeat(image[:, :, 0:1], 3, axis=2), image[:, :, -1:]], axis=2
         )
 
+    return image, view_extent
+
+
+def _show_layer(ax, image: np.ndarray, view_extent) -> None:
+    """Draws an array downloaded by _fetch_layer() on a cartopy plot."""
     ax.imshow(
         np.squeeze(image),
         extent=view_extent,
@@ -1115,10 +1150,16 @@ def get_image_collection_gif(
     overlay_styles: list | None = None,
     colorbar_dict: dict | None = None,
     verbose: bool = True,
+    max_workers: int = 8,
+    processes: int = 1,
     **kwargs,
 ):
     """Download all images in an image collection and generate a gif/video.
 
+    The frames are downloaded concurrently and the overlay layers are downloaded only
+    once. With `processes` > 1, the frames are rendered in a pool of worker processes,
+    since matplotlib is not thread-safe.
+
     Args:
         ee_ic (object): ee.ImageCollection.
         out_dir: The output directory of images and video.
@@ -1154,6 +1195,9 @@ def get_image_collection_gif(
             Defaults to {}.
         verbose: Whether or not to print text when the program is
             running.
+        max_workers: The maximum number of concurrent frame downloads.
+        processes: The number of processes used to render the frames. Defaults to 1,
+            which renders the frames in the current process.
         **kwargs: Additional keyword arguments are passed to the add_layer() function.
     """
     north_arrow_dict = north_arrow_dict or {}
@@ -1168,6 +1212,12 @@ def get_image_collection_gif(
 
     out_gif = os.path.join(out_dir, out_gif)
 
+    # Check length of overlay layers and styles.
+    if len(overlay_layers) != len(overlay_styles):
+        raise ValueError(
+            "The length of overlay_layers and overlay_styles must be the same."
+        )
+
     count = int(ee_ic.size().getInfo())
     images = ee_ic.toList(count)
 
@@ -1177,47 +1227,29 @@ def get_image_collection_gif(
     digits = len(str(len(dates)))
 
     # List of file names.
-    img_list = []
-
-    for i, date in enumerate(dates):
-        image = ee.Image(images.get(i))
-        name = str(i + 1).zfill(digits) + "." + file_format
-        out_img = os.path.join(out_dir, name)
-        img_list.append(out_img)
-
-        if verbose:
-            print(f"Downloading {i + 1}/{count}: {name} ...")
-
-        # Size plot.
-        fig = plt.figure(figsize=fig_size)
-
-        fig.patch.set_facecolor("white")
-
-        # Plot image.
-        ax = get_map(image, region=region, vis_params=vis_params, cmap=cmap, proj=proj)
-
-        # Check length of overlay layers and styles.
-        if len(overlay_layers) != len(overlay_styles):
+    img_list = [
+        os.path.join(out_dir, str(i + 1).zfill(digits) + "." + file_format)
+        for i in range(len(dates))
+    ]
+
+    # The overlays are the same in every frame, so they are only downloaded once.
+    overlays = []
+    for ee_object, style in zip(overlay_layers, overlay_styles):
+        if isinstance(ee_object, (ee.Geometry, ee.Feature, ee.FeatureCollection)):
+            overlay_vis_params = (
+                None  # For vector data, we can pass style parameters directly.
+            )
+        elif isinstance(ee_object, (ee.Image, ee.ImageCollection)):
+            overlay_vis_params = style  # For raster, need to pass vis_params.
+            style = None
+        else:
             raise ValueError(
-                "The length of overlay_layers and overlay_styles must be the same."
+                "The overlay object must be an ee.Geometry, ee.Feature, "
+                "ee.FeatureCollection, ee.Image, or ee.ImageCollection."
             )
 
-        for ee_object, style in zip(overlay_layers, overlay_styles):
-            if isinstance(ee_object, (ee.Geometry, ee.Feature, ee.FeatureCollection)):
-                overlay_vis_params = (
-                    None  # For vector data, we can pass style parameters directly.
-                )
-            elif isinstance(ee_object, (ee.Image, ee.ImageCollection)):
-                overlay_vis_params = style  # For raster, need to pass vis_params.
-                style = None
-            else:
-                raise ValueError(
-                    "The overlay object must be an ee.Geometry, ee.Feature, "
-                    "ee.FeatureCollection, ee.Image, or ee.ImageCollection."
-                )
-
-            add_layer(
-                ax,
+        overlays.append(
+            _fetch_layer(
                 ee_object,
                 region=region,
                 cmap=cmap,
@@ -1225,32 +1257,48 @@ def get_image_collection_gif(
                 style=style,
                 **kwargs,
             )
-
-        if colorbar_dict:
-            add_colorbar(ax, vis_params, **colorbar_dict)
-
-        if grid_interval is not None:
-            add_gridlines(ax, interval=grid_interval, linestyle=":")
-
-        if len(plot_title) > 0:
-            ax.set_title(label=plot_title + " " + date + "\n", fontsize=15)
-
-        # Add scale bar.
-        if len(scale_bar_dict) > 0:
-            add_scale_bar_lite(ax, **scale_bar_dict)
-        # Add north arrow.
-        if len(north_arrow_dict) > 0:
-            add_north_arrow(ax, **north_arrow_dict)
-
-        plt.savefig(
-            fname=out_img,
-            dpi=dpi_plot,
-            bbox_inches="tight",
-            facecolor=fig.get_facecolor(),
         )
 
-        plt.clf()
-        plt.close()
+    def fetch_frame(i: int) -> tuple[np.ndarray, list[float]]:
+        if verbose:
+            print(f"Downloading {i + 1}/{count}: {os.path.basename(img_list[i])} ...")
+        image = ee.Image(images.get(i))
+        return _fetch_layer(image, region=region, cmap=cmap, vis_params=vis_params)
+
+    frame_options = {
+        "proj": proj,
+        "fig_size": fig_size,
+        "dpi_plot": dpi_plot,
+        "vis_params": vis_params,
+        "colorbar_dict": colorbar_dict,
+        "grid_interval": grid_interval,
+        "scale_bar_dict": scale_bar_dict,
+        "north_arrow_dict": north_arrow_dict,
+    }
+
+    def frame_args(i: int, frame: tuple[np.ndarray, list[float]]) -> tuple:
+        title = plot_title + " " + dates[i] + "\n" if plot_title else ""
+        return (img_list[i], [frame] + overlays, title, frame_options)
+
+    frames = common._imap_concurrently(fetch_frame, range(len(dates)), max_workers)
+    if processes > 1:
+        # Bound the queue of downloaded frames waiting to be rendered.
+        pending = collections.deque()
+        # Workers render without a display, whatever the notebook backend is.
+        with mp.Pool(
+            processes, initializer=plt.switch_backend, initargs=("agg",)
+        ) as pool:
+            for i, frame in enumerate(frames):
+                if len(pending) >= 2 * processes:
+                    pending.popleft().get()
+                pending.append(
+                    pool.apply_async(_render_gif_frame, frame_args(i, frame))
+                )
+            for result in pending:
+                result.get()
+    else:
+        for i, frame in enumerate(frames):
+            _render_gif_frame(*frame_args(i, frame))
 
     out_gif = os.path.abspath(out_gif)
     if file_format == "png":
@@ -1310,6 +1358,57 @@ def get_image_collection_gif(
             print(f"MP4 saved to {output_video_file_name}")
 
 
+def _render_gif_frame(
+    out_img: str,
+    layers: list[tuple[np.ndarray, list[float]]],
+    title: str,
+    options: dict[str, Any],
+) -> None:
+    """Renders a frame of get_image_collection_gif() and saves it to a file.
+
+    Args:
+        out_img: The output image file.
+        layers: The image arrays and extents returned by _fetch_layer().
+        title: The plot title.
+        options: The plot options of get_image_collection_gif().
+    """
+    # Size plot.
+    fig = plt.figure(figsize=options["fig_size"])
+
+    fig.patch.set_facecolor("white")
+
+    # Plot image and overlays.
+    ax = plt.axes(projection=options["proj"] or ccrs.PlateCarree())
+    for image, view_extent in layers:
+        _show_layer(ax, image, view_extent)
+
+    if options["colorbar_dict"]:
+        add_colorbar(ax, options["vis_params"], **options["colorbar_dict"])
+
+    if options["grid_interval"] is not None:
+        add_gridlines(ax, interval=options["grid_interval"], linestyle=":")
+
+    if title:
+        ax.set_title(label=title, fontsize=15)
+
+    # Add scale bar.
+    if len(options["scale_bar_dict"]) > 0:
+        add_scale_bar_lite(ax, **options["scale_bar_dict"])
+    # Add north arrow.
+    if len(options["north_arrow_dict"]) > 0:
+        add_north_arrow(ax, **options["north_arrow_dict"])
+
+    plt.savefig(
+        fname=out_img,
+        dpi=options["dpi_plot"],
+        bbox_inches="tight",
+        facecolor=fig.get_facecolor(),
+    )
+
+    plt.clf()
+    plt.close()
+
+
 def savefig(
     fig, fname: str, dpi: int | str = "figure", bbox_inches: str = "tight", **kwargs
 ) -> None:
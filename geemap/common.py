@@ -9,15 +9,17 @@
 
 import base64
 import collections
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Sequence
 import concurrent.futures
 import contextlib
 import copy
 import csv
 import datetime
 import decimal
+import email.utils
 import functools
 import glob
+import hashlib
 import importlib.resources
 import io
 import itertools
@@ -32,6 +34,7 @@ import subprocess
 import sys
 import tarfile
 import tempfile
+import threading
 import time
 from typing import Any, Iterator
 import urllib
@@ -2606,6 +2609,52 @@ def dict_to_csv(data_dict, out_csv, by_row=False, timeout=300, proxies=None):
     ee_export_vector(csv_feat_col, out_csv, timeout=timeout, proxies=proxies)
 
 
+def _map_concurrently(
+    func: Callable, items: Sequence[Any], max_workers: int = 1
+) -> list[Any]:
+    """Applies a function to each item, optionally in a bounded thread pool.
+
+    At most `max_workers` calls are in flight at any time. Results are returned in the
+    order of `items` and the first exception raised by a call is re-raised.
+
+    Args:
+        func: The function to call with each item.
+        items: The items to process.
+        max_workers: The maximum number of concurrent calls. Defaults to 1, which runs
+            the calls serially in the current thread.
+    """
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _imap_concurrently(
+    func: Callable, items: Iterable[Any], max_workers: int = 1
+) -> Iterator[Any]:
+    """Lazily applies a function to each item in a bounded thread pool.
+
+    Unlike `_map_concurrently`, results are yielded as soon as they are ready, in the
+    order of `items`, and at most `max_workers` results are pending at any time.
+
+    Args:
+        func: The function to call with each item.
+        items: The items to process. May be a lazy iterable.
+        max_workers: The maximum number of concurrent calls. Defaults to 1.
+    """
+    items = iter(items)
+    max_workers = max(max_workers or 1, 1)
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        for item in itertools.islice(items, max_workers):
+            pending.append(executor.submit(func, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(items, 1):
+                pending.append(executor.submit(func, item))
+            yield result
+
+
 def get_image_thumbnail(
     ee_object,
     out_img,
@@ -2678,6 +2727,7 @@ def get_image_collection_thumbnails(
     verbose=True,
     timeout=300,
     proxies=None,
+    max_workers=1,
 ):
     """Download thumbnails for all images in an ImageCollection.
 
@@ -2692,6 +2742,7 @@ def get_image_collection_thumbnails(
         verbose (bool, optional): Whether or not to print hints. Defaults to True.
         timeout (int, optional): The number of seconds after which the request will be terminated. Defaults to 300.
         proxies (dict, optional): A dictionary of proxy servers to use for the request. Defaults to None.
+        max_workers (int, optional): The maximum number of thumbnails to download concurrently. Defaults to 1.
     """
     if not isinstance(ee_object, ee.ImageCollection):
         print("The ee_object must be an ee.ImageCollection.")
@@ -2717,7 +2768,7 @@ def get_image_collection_thumbnails(
 
         images = ee_object.toList(count)
 
-        for i in range(0, count):
+        def download_thumbnail(i: int) -> None:
             image = ee.Image(images.get(i))
             name = str(names[i])
             ext = os.path.splitext(name)[1][1:]
@@ -2730,7 +2781,7 @@ def get_image_collection_thumbnails(
             get_image_thumbnail(
                 image,
                 out_img,
-                vis_params,
+                dict(vis_params),
                 dimensions,
                 region,
                 format,
@@ -2738,6 +2789,8 @@ def get_image_collection_thumbnails(
                 proxies=proxies,
             )
 
+        _map_concurrently(download_thumbnail, range(count), max_workers)
+
     except Exception as e:
         print(e)
 
@@ -2824,16 +2877,107 @@ def netcdf_to_ee(nc_file, var_names, band_names=None, lon="lon", lat="lat", deci
     return image
 
 
-def numpy_to_ee(np_array, crs=None, transform=None, transformWkt=None, band_names=None):
+def _is_finite_array(np_array: np.ndarray) -> bool:
+    """Returns whether an array has no NaN or infinite values."""
+    if not np.issubdtype(np_array.dtype, np.inexact):
+        return True
+    return bool(np.isfinite(np_array).all())
+
+
+def _numpy_to_json(np_array: np.ndarray) -> str:
+    """Encodes a numpy array as compact JSON text.
+
+    Numbers are formatted with the shortest representation that round-trips for the
+    array's data type, so float32 values do not expand to 17 significant digits.
+
+    Raises:
+        ValueError: If the array contains NaN or infinite values, which JSON cannot
+            represent.
+    """
+    if not _is_finite_array(np_array):
+        raise ValueError(
+            "The array contains NaN or infinite values, which cannot be encoded as "
+            "JSON. Replace them, e.g., with np.nan_to_num."
+        )
+    if np_array.dtype == bool:
+        np_array = np_array.astype(np.uint8)
+    text = np_array.astype(str)
+    if text.ndim == 1:
+        return "[" + ",".join(text) + "]"
+    return "[" + ",".join(_numpy_to_json(a) for a in text) + "]"
+
+
+def _upload_numpy_to_gcs(
+    np_array: np.ndarray,
+    bucket: str,
+    crs: str,
+    transform: list[float],
+    prefix: str = "geemap",
+    project: str | None = None,
+) -> str:
+    """Writes a (bands, x, y) numpy array to a COG on Cloud Storage.
+
+    Returns:
+        The gs:// URI of the uploaded COG.
+    """
+    import rasterio
+    from google.cloud import storage
+
+    # numpy_to_ee indexes pixels as [band][x][y], while rasters are [band][y][x].
+    raster = np.ascontiguousarray(np.swapaxes(np_array, 1, 2))
+    scale_x, shear_x, translate_x, shear_y, scale_y, translate_y = transform
+    profile = dict(
+        driver="COG",
+        dtype=str(raster.dtype),
+        count=raster.shape[0],
+        height=raster.shape[1],
+        width=raster.shape[2],
+        crs=crs,
+        transform=rasterio.Affine(
+            scale_x, shear_x, translate_x, shear_y, scale_y, translate_y
+        ),
+        compress="deflate",
+    )
+    temp_tif = coreutils.temp_file_path(extension=".tif")
+    try:
+        with rasterio.open(temp_tif, "w", **profile) as dst:
+            dst.write(raster)
+        blob_name = f"{prefix.strip('/')}/{os.path.basename(temp_tif)}"
+        client = storage.Client(project=project)
+        client.bucket(bucket).blob(blob_name).upload_from_filename(temp_tif)
+    finally:
+        if os.path.exists(temp_tif):
+            os.remove(temp_tif)
+    return f"gs://{bucket}/{blob_name}"
+
+
+def numpy_to_ee(
+    np_array,
+    crs=None,
+    transform=None,
+    transformWkt=None,
+    band_names=None,
+    max_inline_bytes=8 * 1024**2,
+    bucket=None,
+    project=None,
+):
     """
     Creates an ee.Image from a 3D numpy array where each 2D numpy slice is added to a band, and a geospatial transform that indicates where to put the data. If the np_array is already 2D only, then it is only a one-band image.
 
+    Small arrays are sent inline, encoded as a single compact JSON string that is decoded by Earth Engine. Arrays
+    whose encoding exceeds max_inline_bytes are staged as a Cloud Optimized GeoTIFF in the given Cloud Storage
+    bucket and loaded with ee.Image.loadGeoTIFF.
+
     Args:
         np_array (np.array): the 3D (or 2D) numpy array to add to an image
         crs (str): The base coordinate reference system of this Projection, given as a well-known authority code (e.g. 'EPSG:4326') or a WKT string.
         transform (list): The transform between projected coordinates and the base coordinate system, specified as a 2x3 affine transform matrix in row-major order: [xScale, xShearing, xTranslation, yShearing, yScale, yTranslation]. May not specify both this and 'transformWkt'.
         transformWkt (str): The transform between projected coordinates and the base coordinate system, specified as a WKT string. May not specify both this and 'transform'.
         band_names (str or list, optional): The list of names for the bands. The default names are 'constant', and 'constant_1', 'constant_2', etc.
+        max_inline_bytes (int, optional): The maximum size of the inline encoding in bytes. Defaults to 8 MB.
+        bucket (str, optional): The Cloud Storage bucket used to stage arrays that are too large to send inline.
+            Requires rasterio and google-cloud-storage. Defaults to None.
+        project (str, optional): The Google Cloud project used for the Cloud Storage upload. Defaults to None.
 
     Returns:
         image: An ee.Image
@@ -2849,32 +2993,55 @@ def numpy_to_ee(np_array, crs=None, transform=None, transformWkt=None, band_name
         return
 
     try:
-        projection = ee.Projection(crs, transform, transformWkt)
-        coords = ee.Image.pixelCoordinates(projection).floor().int32()
-        x = coords.select("x")
-        y = coords.select("y")
-        s = np_array.shape
-        if len(s) < 3:
-            dimx = s[0]
-            dimy = s[1]
+        if np_array.ndim < 3:
+            np_array = np_array[np.newaxis]
+        dimz, dimx, dimy = np_array.shape
+
+        # The number of characters is a lower bound of the size of the encoding.
+        size_estimate = np_array.size * 2
+        # JSON has no NaN or infinity, so arrays with nodata values are staged.
+        finite = _is_finite_array(np_array)
+        text = None
+        if finite and size_estimate <= max_inline_bytes:
+            text = _numpy_to_json(np_array)
+
+        if text is None or len(text) > max_inline_bytes:
+            if bucket is None and not finite:
+                raise ValueError(
+                    "The array contains NaN or infinite values, which cannot be sent "
+                    "inline. Replace them, e.g., with np.nan_to_num, or specify a "
+                    "Cloud Storage bucket to stage it as a Cloud Optimized GeoTIFF."
+                )
+            if bucket is None:
+                raise ValueError(
+                    "The array is too large to be sent inline. Specify a Cloud Storage "
+                    "bucket to stage it as a Cloud Optimized GeoTIFF."
+                )
+            if crs is None or transform is None:
+                raise ValueError("crs and transform are required to stage the array.")
+            uri = _upload_numpy_to_gcs(
+                np_array, bucket, crs, transform, project=project
+            )
+            image = ee.Image.loadGeoTIFF(uri)
+            if not band_names:
+                band_names = ["constant"] + [f"constant_{z}" for z in range(1, dimz)]
         else:
-            dimx = s[1]
-            dimy = s[2]
-            dimz = s[0]
+            projection = ee.Projection(crs, transform, transformWkt)
+            coords = ee.Image.pixelCoordinates(projection).floor().int32()
+            x = coords.select("x")
+            y = coords.select("y")
 
-        coord_mask = x.gte(0).And(y.gte(0)).And(x.lt(dimx)).And(y.lt(dimy))
-        coords = coords.updateMask(coord_mask)
+            coord_mask = x.gte(0).And(y.gte(0)).And(x.lt(dimx)).And(y.lt(dimy))
+            coords = coords.updateMask(coord_mask)
 
-        def list_to_ee(a_list):
-            ee_data = ee.Array(a_list)
-            return ee.Image(ee_data).arrayGet(coords)
-
-        if len(s) < 3:
-            image = list_to_ee(np_array.tolist())
-        else:
-            image = list_to_ee(np_array[0].tolist())
-            for z in np.arange(1, dimz):
-                image = image.addBands(list_to_ee(np_array[z].tolist()))
+            # A single array literal holds all bands, indexed by [band, x, y].
+            ee_data = ee.Image(ee.Array(ee.String(text).decodeJSON()))
+            image = ee.Image.cat(
+                [
+                    ee_data.arrayGet(ee.Image.constant(z).int32().addBands(coords))
+                    for z in range(dimz)
+                ]
+            )
 
         if band_names:
             image = image.rename(band_names)
@@ -2885,18 +3052,98 @@ def numpy_to_ee(np_array, crs=None, transform=None, transformWkt=None, band_name
         print(e)
 
 
-def ee_to_numpy(ee_object, region=None, scale=None, bands=None, **kwargs):
+# The maximum size of a single computePixels response (48 MB).
+_COMPUTE_PIXELS_MAX_BYTES = 50331648
+
+
+def _is_request_size_error(error: Exception) -> bool:
+    """Returns whether an Earth Engine error was caused by the request size limits."""
+    message = str(error).lower()
+    return any(
+        text in message
+        for text in ["request size", "must be less than or equal to", "too large"]
+    )
+
+
+def _ee_pixel_grid(image: ee.Image, bands: list[str] | None = None) -> dict[str, Any]:
+    """Returns the computePixels grid covering the footprint of a bounded image."""
+    info = image.getInfo()
+    band_info = info["bands"][0]
+    if bands:
+        band_info = next(b for b in info["bands"] if b["id"] == bands[0])
+    if "dimensions" not in band_info:
+        raise ValueError(
+            "The image is unbounded. Specify a region and scale to read it in chunks."
+        )
+    width, height = band_info["dimensions"]
+    x_origin, y_origin = band_info.get("origin", [0, 0])
+    scale_x, shear_x, translate_x, shear_y, scale_y, translate_y = band_info[
+        "crs_transform"
+    ]
+    grid = {
+        "dimensions": {"width": width, "height": height},
+        "affineTransform": {
+            "scaleX": scale_x,
+            "shearX": shear_x,
+            "translateX": translate_x + x_origin * scale_x + y_origin * shear_x,
+            "shearY": shear_y,
+            "scaleY": scale_y,
+            "translateY": translate_y + x_origin * shear_y + y_origin * scale_y,
+        },
+    }
+    crs = band_info["crs"]
+    if crs.upper().startswith(("EPSG:", "SR-ORG:")):
+        grid["crsCode"] = crs
+    else:
+        grid["crsWkt"] = crs
+    return grid
+
+
+def _grid_window(
+    grid: dict[str, Any], row: int, col: int, height: int, width: int
+) -> dict[str, Any]:
+    """Returns the sub-grid of a computePixels grid starting at a pixel offset."""
+    transform = dict(grid["affineTransform"])
+    transform["translateX"] += col * transform["scaleX"] + row * transform["shearX"]
+    transform["translateY"] += col * transform["shearY"] + row * transform["scaleY"]
+    return {
+        **grid,
+        "dimensions": {"width": width, "height": height},
+        "affineTransform": transform,
+    }
+
+
+def ee_to_numpy(
+    ee_object,
+    region=None,
+    scale=None,
+    bands=None,
+    chunk_size=None,
+    max_workers=8,
+    out_file=None,
+    **kwargs,
+):
     """Extracts a rectangular region of pixels from an image into a numpy array.
 
+    Regions that exceed the computePixels request limits are split into grid-aligned
+    chunks that are fetched concurrently and written into a preallocated array.
+
     Args:
         ee_object (ee.Image): The image to sample.
         region (ee.Geometry, optional): The region to sample. Defaults to None.
         bands (list, optional): The list of band names to extract. Defaults to None.
         scale (int, optional): A nominal scale in meters of the projection to sample in. Defaults to None.
+        chunk_size (int, optional): The width and height in pixels of the chunks to fetch. Defaults to None, which
+            fetches the region in a single request and only splits it into chunks if the request is too large.
+        max_workers (int, optional): The maximum number of chunks to fetch concurrently. Defaults to 8.
+        out_file (str, optional): The path of a .npy file to memory-map the output array to, so that large
+            regions can be read with bounded memory. Defaults to None.
 
     Returns:
         np.ndarray: A 3D numpy array in the format of [row, column, band].
     """
+    from numpy.lib import recfunctions
+
     if (region is not None) or (scale is not None):
         ee_object = ee_object.clipToBoundsAndScale(geometry=region, scale=scale)
 
@@ -2905,8 +3152,51 @@ def ee_to_numpy(ee_object, region=None, scale=None, bands=None, **kwargs):
     if bands is not None:
         kwargs["bandIds"] = bands
 
-    struct_array = ee.data.computePixels(kwargs)
-    return np.dstack([struct_array[band] for band in struct_array.dtype.names])
+    if chunk_size is None and out_file is None:
+        try:
+            struct_array = ee.data.computePixels(kwargs)
+            return recfunctions.structured_to_unstructured(struct_array)
+        except ee.EEException as e:
+            if not _is_request_size_error(e):
+                raise
+
+    grid = kwargs.pop("grid", None) or _ee_pixel_grid(ee_object, bands)
+    width = grid["dimensions"]["width"]
+    height = grid["dimensions"]["height"]
+
+    def fetch(window: tuple[int, int, int, int]) -> np.ndarray:
+        row, col, rows, cols = window
+        request = {**kwargs, "grid": _grid_window(grid, row, col, rows, cols)}
+        struct_array = ee.data.computePixels(request)
+        return recfunctions.structured_to_unstructured(struct_array)
+
+    # The first chunk determines the data type and the number of bands.
+    first = fetch((0, 0, 1, 1))
+    if chunk_size is None:
+        pixel_bytes = max(first.shape[-1], 1) * 8
+        chunk_size = int(math.sqrt(_COMPUTE_PIXELS_MAX_BYTES / 2 / pixel_bytes))
+    shape = (height, width, first.shape[-1])
+    if out_file is not None:
+        out = np.lib.format.open_memmap(
+            out_file, mode="w+", dtype=first.dtype, shape=shape
+        )
+    else:
+        out = np.empty(shape, dtype=first.dtype)
+
+    windows = [
+        (row, col, min(chunk_size, height - row), min(chunk_size, width - col))
+        for row in range(0, height, chunk_size)
+        for col in range(0, width, chunk_size)
+    ]
+
+    def fetch_into(window: tuple[int, int, int, int]) -> None:
+        row, col, rows, cols = window
+        out[row : row + rows, col : col + cols] = fetch(window)
+
+    _map_concurrently(fetch_into, windows, max_workers)
+    if out_file is not None:
+        out.flush()
+    return out
 
 
 def ee_to_xarray(
@@ -6629,6 +6919,92 @@ def adjust_longitude(in_fc):
         return None
 
 
+def _is_reduce_regions_limit_error(error: Exception) -> bool:
+    """Returns whether an Earth Engine error may succeed with a larger tileScale."""
+    message = str(error).lower()
+    return any(
+        text in message
+        for text in ["memory limit", "out of memory", "timed out", "too many"]
+    )
+
+
+def _reduce_regions_in_batches(
+    reduce_batch: Callable[[ee.FeatureCollection, float], ee.FeatureCollection],
+    zones: ee.FeatureCollection,
+    filename: str,
+    batch_size: int,
+    max_workers: int = 4,
+    tile_scale: float = 1.0,
+    max_retries: int = 2,
+    verbose: bool = True,
+) -> None:
+    """Runs a zonal reduction over batches of zones and writes the merged results.
+
+    The zones are split into batches of `batch_size` features. Each batch is reduced
+    and fetched with ee.data.computeFeatures, with at most `max_workers` batches in
+    flight. A batch that runs out of memory or times out is retried with twice the
+    tileScale, up to `max_retries` times. Results are appended to the output file in
+    zone order as they arrive, so memory use is bounded by the number of batches in
+    flight.
+
+    Args:
+        reduce_batch: A function that takes a batch of zones and a tileScale and
+            returns the reduced ee.FeatureCollection.
+        zones: The ee.FeatureCollection that defines the zones.
+        filename: The output file. The file type can be csv or parquet.
+        batch_size: The number of zones per batch.
+        max_workers: The maximum number of batches to compute concurrently. Defaults
+            to 4.
+        tile_scale: The initial tileScale. Defaults to 1.0.
+        max_retries: The maximum number of retries with a larger tileScale per
+            batch. Defaults to 2.
+        verbose: Whether to print the progress. Defaults to True.
+    """
+    count = zones.size().getInfo()
+    offsets = range(0, count, batch_size)
+
+    def reduce(offset: int) -> pd.DataFrame:
+        batch = ee.FeatureCollection(zones.toList(batch_size, offset))
+        scale = tile_scale
+        for attempt in range(max_retries + 1):
+            try:
+                result = _remove_geometry(reduce_batch(batch, scale))
+                df = ee.data.computeFeatures(
+                    {"expression": result, "fileFormat": "PANDAS_DATAFRAME"}
+                )
+                return df.drop(columns=["geo"], errors="ignore")
+            except ee.EEException as e:
+                if (
+                    attempt == max_retries
+                    or scale >= 16
+                    or not _is_reduce_regions_limit_error(e)
+                ):
+                    raise
+                scale = min(scale * 2, 16)
+                if verbose:
+                    print(f"Retrying zones {offset}+ with tileScale={scale} ...")
+
+    def report(batches: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for index, df in enumerate(batches, start=1):
+            if verbose:
+                print(f"Processed batch {index}/{len(offsets)}")
+            yield df
+
+    batches = report(_imap_concurrently(reduce, offsets, max_workers))
+    if filename.lower().endswith(".parquet"):
+        _write_parquet_batches(batches, filename)
+        return
+
+    columns = None
+    with open(filename, "w", newline="") as f:
+        for df in batches:
+            if columns is None:
+                columns = list(df.columns)
+                df.to_csv(f, index=False)
+            else:
+                df.reindex(columns=columns).to_csv(f, index=False, header=False)
+
+
 def zonal_stats(
     in_value_raster,
     in_zone_vector,
@@ -6641,11 +7017,16 @@ def zonal_stats(
     verbose: bool = True,
     timeout: int = 300,
     proxies: dict[str, str] | None = None,
+    batch_size: int | None = None,
+    max_workers: int = 4,
+    max_retries: int = 2,
     **kwargs,
 ):
     """Summarizes the values of a raster within the zones of another dataset.
 
-    Exports the results as a csv, shp, json, kml, or kmz.
+    Exports the results as a csv, shp, json, kml, or kmz. For large zone collections,
+    set `batch_size` to reduce the zones in concurrent batches and write the results
+    incrementally to a csv or parquet file.
 
     Args:
         in_value_raster (object): An ee.Image or ee.ImageCollection that contains the
@@ -6670,6 +7051,12 @@ def zonal_stats(
             False.
         timeout: Timeout in seconds. Default to 300.
         proxies: A dictionary of proxy servers to use for the request. Default to None.
+        batch_size: The number of zones to reduce per request. If None, all zones are
+            reduced and downloaded in a single request. Defaults to None.
+        max_workers: The maximum number of batches to compute concurrently when
+            `batch_size` is set. Defaults to 4.
+        max_retries: The maximum number of times a batch that runs out of memory or
+            times out is retried with twice the tile_scale. Defaults to 2.
     """
     if isinstance(in_value_raster, ee.ImageCollection):
         in_value_raster = in_value_raster.toBands()
@@ -6689,6 +7076,8 @@ def zonal_stats(
         stat_type = kwargs.pop("statistics_type")
 
     allowed_formats = ["csv", "geojson", "kml", "kmz", "shp"]
+    if batch_size is not None:
+        allowed_formats = ["csv", "parquet"]
     filename = os.path.abspath(out_file_path)
     basename = os.path.basename(filename)
     filetype = os.path.splitext(basename)[1][1:].lower()
@@ -6776,18 +7165,34 @@ def zonal_stats(
     if scale is None:
         scale = in_value_raster.projection().nominalScale().multiply(10)
 
+    def reduce_zones(zones, tile_scale):
+        return in_value_raster.reduceRegions(
+            collection=zones,
+            reducer=reducer,
+            scale=scale,
+            crs=crs,
+            tileScale=tile_scale,
+        )
+
     if verbose:
         print("Computing statistics ...")
-    result = in_value_raster.reduceRegions(
-        collection=in_zone_vector,
-        reducer=reducer,
-        scale=scale,
-        crs=crs,
-        tileScale=tile_scale,
-    )
     if return_fc:
-        return result
+        return reduce_zones(in_zone_vector, tile_scale)
+
+    if batch_size is not None:
+        _reduce_regions_in_batches(
+            reduce_zones,
+            in_zone_vector,
+            check_file_path(filename),
+            batch_size,
+            max_workers,
+            tile_scale,
+            max_retries,
+            verbose,
+        )
+        return
 
+    result = reduce_zones(in_zone_vector, tile_scale)
     ee_export_vector(result, filename, timeout=timeout, proxies=proxies)
 
 
@@ -6812,11 +7217,16 @@ def zonal_stats_by_group(
     verbose: bool = True,
     timeout: int = 300,
     proxies: dict[str, str] | None = None,
+    batch_size: int | None = None,
+    max_workers: int = 4,
+    max_retries: int = 2,
     **kwargs,
 ):
     """Summarizes the area or percentage of a raster by group within the zones of another dataset.
 
-    Exports the results as a csv, shp, json, kml, or kmz.
+    Exports the results as a csv, shp, json, kml, or kmz. For large zone collections,
+    set `batch_size` to reduce the zones in concurrent batches and write the results
+    incrementally to a csv or parquet file.
 
     Args:
         in_value_raster (object): An integer Image that contains the values on which to
@@ -6847,6 +7257,12 @@ def zonal_stats_by_group(
             False.
         timeout: Timeout in seconds. Defaults to 300.
         proxies: A dictionary of proxies to use. Defaults to None.
+        batch_size: The number of zones to reduce per request. If None, all zones are
+            reduced and downloaded in a single request. Defaults to None.
+        max_workers: The maximum number of batches to compute concurrently when
+            `batch_size` is set. Defaults to 4.
+        max_retries: The maximum number of times a batch that runs out of memory or
+            times out is retried with twice the tile_scale. Defaults to 2.
     """
     if isinstance(in_value_raster, ee.ImageCollection):
         in_value_raster = in_value_raster.toBands()
@@ -6880,6 +7296,8 @@ def zonal_stats_by_group(
         return
 
     allowed_formats = ["csv", "geojson", "kml", "kmz", "shp"]
+    if batch_size is not None:
+        allowed_formats = ["csv", "parquet"]
     filename = os.path.abspath(out_file_path)
     basename = os.path.basename(filename)
     filetype = os.path.splitext(basename)[1][1:]
@@ -6932,22 +7350,12 @@ def zonal_stats_by_group(
     class_names = class_values.map(
         lambda c: ee.String("Class_").cat(ee.Number(c).format())
     )
+    if batch_size is not None and not return_fc:
+        # Evaluate the classes once, rather than in the request of every batch.
+        class_names = ee.List(class_names.getInfo())
 
     dataset = ee.Image.pixelArea().divide(denominator).addBands(in_value_raster)
 
-    init_result = dataset.reduceRegions(
-        **{
-            "collection": in_zone_vector,
-            "reducer": ee.Reducer.sum().group(
-                **{
-                    "groupField": 1,
-                    "groupName": "group",
-                }
-            ),
-            "scale": scale,
-        }
-    )
-
     def get_keys(input_list):
         return input_list.map(
             lambda x: ee.String("Class_").cat(
@@ -6985,10 +7393,39 @@ def zonal_stats_by_group(
 
         return f.set(attr_dict).set("groups", None)
 
-    final_result = init_result.map(set_attribute)
+    def reduce_zones(zones, zones_tile_scale):
+        init_result = dataset.reduceRegions(
+            **{
+                "collection": zones,
+                "reducer": ee.Reducer.sum().group(
+                    **{
+                        "groupField": 1,
+                        "groupName": "group",
+                    }
+                ),
+                "scale": scale,
+                "tileScale": zones_tile_scale,
+            }
+        )
+        return init_result.map(set_attribute)
+
     if return_fc:
-        return final_result
+        return reduce_zones(in_zone_vector, tile_scale)
+
+    if batch_size is not None:
+        _reduce_regions_in_batches(
+            reduce_zones,
+            in_zone_vector,
+            check_file_path(filename),
+            batch_size,
+            max_workers,
+            tile_scale,
+            max_retries,
+            verbose,
+        )
+        return
 
+    final_result = reduce_zones(in_zone_vector, tile_scale)
     ee_export_vector(final_result, filename, timeout=timeout, proxies=proxies)
 
 
@@ -8846,6 +9283,8 @@ def ee_to_df(
     columns=None,
     remove_geom=True,
     sort_columns=False,
+    chunk_size=None,
+    max_workers=4,
     **kwargs,
 ):
     """Converts an ee.FeatureCollection to pandas dataframe.
@@ -8855,6 +9294,9 @@ def ee_to_df(
         columns (list): List of column names. Defaults to None.
         remove_geom (bool): Whether to remove the geometry column. Defaults to True.
         sort_columns (bool): Whether to sort the column names. Defaults to False.
+        chunk_size (int, optional): If set, the collection is fetched in chunks of this many features, which are
+            requested concurrently. See ee_to_batches(). Defaults to None.
+        max_workers (int, optional): The maximum number of chunks to fetch concurrently. Defaults to 4.
         kwargs: Additional arguments passed to ee.data.computeFeature.
 
     Raises:
@@ -8869,10 +9311,24 @@ def ee_to_df(
     if not isinstance(ee_object, ee.FeatureCollection):
         raise TypeError("ee_object must be an ee.FeatureCollection")
 
-    if remove_geom:
-        data = ee_object.map(
-            lambda f: ee.Feature(None, f.toDictionary(f.propertyNames().sort()))
+    if chunk_size is not None:
+        batches = ee_to_batches(
+            ee_object,
+            chunk_size,
+            max_workers,
+            geometry=False,
+            remove_geom=remove_geom,
+            **kwargs,
         )
+        df = pd.concat([pd.DataFrame(), *batches], ignore_index=True)
+        if isinstance(columns, list):
+            df = df[columns]
+        if sort_columns:
+            df = df.reindex(sorted(df.columns), axis=1)
+        return df
+
+    if remove_geom:
+        data = _remove_geometry(ee_object)
     else:
         data = ee_object
 
@@ -8885,7 +9341,7 @@ def ee_to_df(
         df = df[columns]
 
     if remove_geom and ("geo" in df.columns):
-        df = df.drop(columns=["geo"], axis=1)
+        df = df.drop(columns=["geo"])
 
     if sort_columns:
         df = df.reindex(sorted(df.columns), axis=1)
@@ -8923,6 +9379,8 @@ def ee_to_gdf(
     ee_object,
     columns=None,
     sort_columns=False,
+    chunk_size=None,
+    max_workers=4,
     **kwargs,
 ):
     """Converts an ee.FeatureCollection to GeoPandas GeoDataFrame.
@@ -8931,6 +9389,9 @@ def ee_to_gdf(
         ee_object (ee.FeatureCollection): ee.FeatureCollection.
         columns (list): List of column names. Defaults to None.
         sort_columns (bool): Whether to sort the column names. Defaults to False.
+        chunk_size (int, optional): If set, the collection is fetched in chunks of this many features, which are
+            requested concurrently. See ee_to_batches(). Defaults to None.
+        max_workers (int, optional): The maximum number of chunks to fetch concurrently. Defaults to 4.
         kwargs: Additional arguments passed to ee.data.computeFeature.
 
     Raises:
@@ -8945,11 +9406,17 @@ def ee_to_gdf(
     if not isinstance(ee_object, ee.FeatureCollection):
         raise TypeError("ee_object must be an ee.FeatureCollection")
 
-    kwargs["expression"] = ee_object
-    kwargs["fileFormat"] = "GEOPANDAS_GEODATAFRAME"
+    if chunk_size is not None:
+        import geopandas as gpd
 
-    crs = ee_object.first().geometry().projection().crs().getInfo()
-    gdf = ee.data.computeFeatures(kwargs)
+        batches = ee_to_batches(ee_object, chunk_size, max_workers, **kwargs)
+        gdf = gpd.GeoDataFrame(
+            pd.concat([gpd.GeoDataFrame(), *batches], ignore_index=True)
+        )
+    else:
+        kwargs["expression"] = ee_object
+        kwargs["fileFormat"] = "GEOPANDAS_GEODATAFRAME"
+        gdf = ee.data.computeFeatures(kwargs)
 
     if isinstance(columns, list):
         gdf = gdf[columns]
@@ -8957,10 +9424,149 @@ def ee_to_gdf(
     if sort_columns:
         gdf = gdf.reindex(sorted(gdf.columns), axis=1)
 
-    gdf.crs = crs
+    # computeFeatures always returns geometries reprojected to EPSG:4326.
+    if gdf.crs is None:
+        gdf.crs = "EPSG:4326"
     return gdf
 
 
+def _remove_geometry(ee_object: ee.FeatureCollection) -> ee.FeatureCollection:
+    """Returns the features of a collection without their geometries."""
+    return ee_object.map(
+        lambda f: ee.Feature(None, f.toDictionary(f.propertyNames().sort()))
+    )
+
+
+def ee_to_batches(
+    ee_object: ee.FeatureCollection,
+    chunk_size: int = 5000,
+    max_workers: int = 4,
+    geometry: bool = True,
+    remove_geom: bool = True,
+    **kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """Yields the features of an ee.FeatureCollection in chunks.
+
+    The collection is split into chunks of `chunk_size` features that are fetched
+    concurrently, with at most `max_workers` requests in flight. Chunks are yielded
+    in order, so only a bounded number of chunks are held in memory at any time.
+
+    Args:
+        ee_object: The feature collection to fetch.
+        chunk_size: The number of features per chunk. Defaults to 5000.
+        max_workers: The maximum number of chunks to fetch concurrently. Defaults
+            to 4.
+        geometry: Whether to yield GeoDataFrames with a geometry column in EPSG:4326.
+            Requires geopandas. Defaults to True.
+        remove_geom: Whether to drop the geometries on the server when `geometry` is
+            False, which reduces the amount of data transferred. Defaults to True.
+        kwargs: Additional arguments passed to ee.data.computeFeatures.
+
+    Yields:
+        A pandas DataFrame, or a GeoPandas GeoDataFrame if `geometry` is True, for
+        each chunk.
+    """
+    if isinstance(ee_object, ee.Feature):
+        ee_object = ee.FeatureCollection([ee_object])
+
+    if not isinstance(ee_object, ee.FeatureCollection):
+        raise TypeError("ee_object must be an ee.FeatureCollection")
+
+    count = ee_object.size().getInfo()
+    if not geometry and remove_geom:
+        ee_object = _remove_geometry(ee_object)
+    file_format = "GEOPANDAS_GEODATAFRAME" if geometry else "PANDAS_DATAFRAME"
+
+    def fetch(offset: int) -> pd.DataFrame:
+        page = ee.FeatureCollection(ee_object.toList(chunk_size, offset))
+        params = {**kwargs, "expression": page, "fileFormat": file_format}
+        df = ee.data.computeFeatures(params)
+        if geometry:
+            df.crs = "EPSG:4326"
+        elif remove_geom and ("geo" in df.columns):
+            df = df.drop(columns=["geo"])
+        return df
+
+    yield from _imap_concurrently(fetch, range(0, count, chunk_size), max_workers)
+
+
+def ee_to_parquet(
+    ee_object: ee.FeatureCollection,
+    filename: str,
+    chunk_size: int = 5000,
+    max_workers: int = 4,
+    geometry: bool = True,
+    **kwargs: Any,
+) -> None:
+    """Streams an ee.FeatureCollection to a Parquet or GeoParquet file.
+
+    Chunks are written to the file as they arrive, so collections with millions of
+    features can be exported in bounded memory. All chunks must share the column types
+    of the first chunk. Requires pyarrow.
+
+    Args:
+        ee_object: The feature collection to export.
+        filename: The output Parquet file.
+        chunk_size: The number of features per chunk. Defaults to 5000.
+        max_workers: The maximum number of chunks to fetch concurrently. Defaults
+            to 4.
+        geometry: Whether to write the geometries as a GeoParquet WKB column named
+            "geometry". If False, only the properties are written. Defaults to True.
+        kwargs: Additional arguments passed to ee.data.computeFeatures.
+    """
+    filename = check_file_path(filename)
+    batches = ee_to_batches(ee_object, chunk_size, max_workers, geometry, **kwargs)
+    _write_parquet_batches(batches, filename, geometry)
+
+
+def _write_parquet_batches(
+    batches: Iterable[pd.DataFrame], filename: str, geometry: bool = False
+) -> None:
+    """Writes DataFrames to a single Parquet file as they arrive.
+
+    All batches are written with the columns and types of the first batch.
+
+    Args:
+        batches: The (Geo)DataFrames to write.
+        filename: The output Parquet file.
+        geometry: Whether the batches are GeoDataFrames in EPSG:4326 to write as
+            GeoParquet. Defaults to False.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    schema = None
+    try:
+        for df in batches:
+            if geometry:
+                wkb = df.geometry.to_wkb()
+                df = pd.DataFrame(df.drop(columns=df.geometry.name))
+                df["geometry"] = wkb
+            if schema is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                schema = table.schema
+                if geometry:
+                    # Without a "crs" key, GeoParquet readers assume OGC:CRS84.
+                    geo = {
+                        "version": "1.0.0",
+                        "primary_column": "geometry",
+                        "columns": {
+                            "geometry": {"encoding": "WKB", "geometry_types": []}
+                        },
+                    }
+                    schema = schema.with_metadata(
+                        {**(schema.metadata or {}), b"geo": json.dumps(geo).encode()}
+                    )
+                writer = pq.ParquetWriter(filename, schema)
+            df = df.reindex(columns=schema.names)
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def delete_shp(in_shp: str, verbose: bool = False) -> None:
     """Deletes a shapefile.
 
@@ -9010,7 +9616,58 @@ def df_to_ee(df, latitude="latitude", longitude="longitude", **kwargs):
 pandas_to_ee = df_to_ee
 
 
-def gdf_to_ee(gdf, geodesic=True, date=None, date_format="YYYY-MM-dd"):
+def _gdf_to_features(gdf, geodesic=True, simplify=None, precision=None):
+    """Converts a GeoDataFrame to a list of GeoJSON feature dictionaries in EPSG:4326.
+
+    Geometries and properties are encoded with vectorized shapely and pandas calls
+    instead of writing the GeoDataFrame to a GeoJSON file.
+    """
+    import shapely
+
+    if gdf.crs is not None:
+        gdf = gdf.to_crs(4326)
+    geometries = gdf.geometry.values
+    if simplify is not None:
+        geometries = shapely.simplify(geometries, simplify, preserve_topology=True)
+    if precision is not None:
+        geometries = shapely.set_precision(geometries, precision)
+
+    properties = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    records = json.loads(
+        properties.to_json(orient="records", date_format="iso", default_handler=str)
+    )
+
+    features = []
+    for geometry, record in zip(shapely.to_geojson(geometries), records):
+        if geometry is not None:
+            geometry = json.loads(geometry)
+            if geometry["type"] != "Point":
+                geometry["geodesic"] = geodesic
+        features.append({"type": "Feature", "geometry": geometry, "properties": record})
+    return features
+
+
+def _features_to_ee(features, date=None, date_format="YYYY-MM-dd"):
+    """Creates an ee.FeatureCollection from a list of GeoJSON feature dictionaries."""
+    fc = ee.FeatureCollection({"type": "FeatureCollection", "features": features})
+    if date is not None:
+        fc = fc.map(
+            lambda x: x.set(
+                "system:time_start",
+                ee.Date.parse(date_format, x.get(date)).millis(),
+            )
+        )
+    return fc
+
+
+def gdf_to_ee(
+    gdf,
+    geodesic=True,
+    date=None,
+    date_format="YYYY-MM-dd",
+    simplify=None,
+    precision=None,
+):
     """Converts a GeoPandas GeoDataFrame to ee.FeatureCollection.
 
     Args:
@@ -9018,6 +9675,9 @@ def gdf_to_ee(gdf, geodesic=True, date=None, date_format="YYYY-MM-dd"):
         geodesic (bool, optional): Whether line segments should be interpreted as spherical geodesics. If false, indicates that line segments should be interpreted as planar lines in the specified CRS. If absent, defaults to true if the CRS is geographic (including the default EPSG:4326), or to false if the CRS is projected. Defaults to True.
         date (str, optional): Column name for the date column. Defaults to None.
         date_format (str, optional): Date format. A pattern, as described at http://joda-time.sourceforge.net/apidocs/org/joda/time/format/DateTimeFormat.html. Defaults to 'YYYY-MM-dd'.
+        simplify (float, optional): The tolerance in degrees used to simplify the geometries before the upload. Defaults to None.
+        precision (float, optional): The grid size in degrees that coordinates are snapped to, e.g., 1e-6 (about 0.1 m).
+            Fewer digits make the request smaller. Defaults to None.
 
     Raises:
         TypeError: The input data type must be geopandas.GeoDataFrame.
@@ -9030,23 +9690,73 @@ def gdf_to_ee(gdf, geodesic=True, date=None, date_format="YYYY-MM-dd"):
     if not isinstance(gdf, gpd.GeoDataFrame):
         raise TypeError("The input data type must be geopandas.GeoDataFrame.")
 
-    out_json = os.path.join(os.getcwd(), coreutils.random_string(6) + ".geojson")
-    gdf = gdf.to_crs(4326)
-    gdf.to_file(out_json, driver="GeoJSON")
+    features = _gdf_to_features(gdf, geodesic, simplify, precision)
+    return _features_to_ee(features, date, date_format)
+
+
+def gdf_to_ee_batches(
+    gdf,
+    max_bytes: int = 8 * 1024**2,
+    geodesic: bool = True,
+    date: str | None = None,
+    date_format: str = "YYYY-MM-dd",
+    simplify: float | None = None,
+    precision: float | None = None,
+) -> list[ee.FeatureCollection]:
+    """Converts a GeoPandas GeoDataFrame to a list of size-bounded ee.FeatureCollections.
+
+    Each collection is built from consecutive features whose GeoJSON encoding fits in
+    `max_bytes`, so each one can be used in a separate request (e.g., exported to an
+    asset with ee_export_vector_to_asset) without exceeding the Earth Engine payload
+    limit.
+
+    Args:
+        gdf: The input GeoDataFrame.
+        max_bytes: The maximum size in bytes of the GeoJSON encoding of each batch.
+            Defaults to 8 MB.
+        geodesic: Whether line segments should be interpreted as spherical geodesics.
+            Defaults to True.
+        date: Column name for the date column. Defaults to None.
+        date_format: Date format. Defaults to 'YYYY-MM-dd'.
+        simplify: The tolerance in degrees used to simplify the geometries. Defaults to
+            None.
+        precision: The grid size in degrees that coordinates are snapped to. Defaults
+            to None.
 
-    fc = coreutils.geojson_to_ee(out_json, geodesic=geodesic)
+    Raises:
+        TypeError: The input data type must be geopandas.GeoDataFrame.
+        ValueError: A single feature is larger than max_bytes.
 
-    if date is not None:
-        fc = fc.map(
-            lambda x: x.set(
-                "system:time_start",
-                ee.Date.parse(date_format, x.get(date)).millis(),
-            )
-        )
+    Returns:
+        The list of ee.FeatureCollections.
+    """
+    import geopandas as gpd
 
-    os.remove(out_json)
+    if not isinstance(gdf, gpd.GeoDataFrame):
+        raise TypeError("The input data type must be geopandas.GeoDataFrame.")
 
-    return fc
+    batches = []
+    batch = []
+    batch_size = 0
+    for index, feature in enumerate(
+        _gdf_to_features(gdf, geodesic, simplify, precision)
+    ):
+        size = len(json.dumps(feature))
+        if size > max_bytes:
+            raise ValueError(
+                f"Feature {index} is {size} bytes, which exceeds max_bytes. "
+                "Use simplify or precision to reduce its size."
+            )
+        if batch and batch_size + size > max_bytes:
+            batches.append(batch)
+            batch = []
+            batch_size = 0
+        batch.append(feature)
+        batch_size += size
+    if batch:
+        batches.append(batch)
+
+    return [_features_to_ee(batch, date, date_format) for batch in batches]
 
 
 geopandas_to_ee = gdf_to_ee
@@ -12439,6 +13149,70 @@ def download_ee_image_tiles(
     print(f"Downloaded {count} tiles in {time.time() - start} seconds.")
 
 
+_DOWNLOAD_MANIFEST = ".geemap_manifest.jsonl"
+
+
+@functools.cache
+def _ee_initialize_worker(project_id: str | None = None) -> None:
+    """Initializes Earth Engine once per worker process for parallel downloads."""
+    coreutils.ee_initialize(
+        opt_url=ee.data.HIGH_VOLUME_API_BASE_URL,
+        project=project_id,
+    )
+
+
+def _file_sha256(filename: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_download_manifest(manifest: str) -> dict[str, dict[str, Any]]:
+    """Reads a JSONL download manifest, keeping the latest record per file.
+
+    Lines that cannot be parsed (e.g. a partial write from an interrupted run) are
+    ignored.
+    """
+    records = {}
+    if not os.path.exists(manifest):
+        return records
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "filename" in record:
+                records[record["filename"]] = record
+    return records
+
+
+def _append_download_manifest(manifest: str, record: dict[str, Any]) -> None:
+    """Appends a single record to a JSONL download manifest."""
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+
+
+def _is_download_complete(
+    record: dict[str, Any] | None, filename: str, job_id: str
+) -> bool:
+    """Returns whether a manifest record marks a file as completely downloaded.
+
+    The file must still match the size and SHA-256 checksum in the record.
+    """
+    if record is None or record.get("status") != "completed":
+        return False
+    if record.get("job") != job_id or not os.path.exists(filename):
+        return False
+    if os.path.getsize(filename) != record.get("size"):
+        return False
+    return _file_sha256(filename) == record.get("sha256")
+
+
 def download_ee_image_tiles_parallel(
     image: ee.Image,
     features: ee.FeatureCollection,
@@ -12460,6 +13234,9 @@ def download_ee_image_tiles_parallel(
     job_args: dict[str, Any] = {"n_jobs": -1},
     ee_init: bool = True,
     project_id: str | None = None,
+    resume: bool = True,
+    max_retries: int = 3,
+    backoff_factor: float = 2.0,
     **kwargs,
 ):
     """Download an Earth Engine Image as small tiles based on ee.FeatureCollection.
@@ -12468,6 +13245,11 @@ def download_ee_image_tiles_parallel(
     tiles, then re-assembled into a single GeoTIFF. See
     https://github.com/dugalh/geedim/blob/main/geedim/download.py#L574
 
+    The status, byte size and SHA-256 checksum of every tile are journaled to a
+    `.geemap_manifest.jsonl` file in `out_dir`. When `resume` is True, rerunning the
+    same download skips tiles that already completed and only retries the failed or
+    missing ones.
+
     Args:
         image: The image to be downloaded.
         features: The features to loop through to download image.
@@ -12494,9 +13276,17 @@ def download_ee_image_tiles_parallel(
             you should set the unmask value to a  non-zero value so that the zero values are not treated as missing data. Defaults to None.
         column: The column name in the feature collection to use as the filename. Defaults to None.
         job_args: The arguments to pass to joblib.Parallel. Defaults to {"n_jobs": -1}.
-        ee_init: Whether to initialize Earth Engine. Defaults to True.
+        ee_init: Whether to initialize Earth Engine. Earth Engine is initialized once
+            per worker process. Defaults to True.
         project_id: The Earth Engine project ID. Defaults to None.
+        resume: Whether to skip tiles recorded as completed in the download manifest
+            of a previous run with the same image and parameters. Defaults to True.
+        max_retries: The maximum number of attempts for each tile. Defaults to 3.
+        backoff_factor: The base of the exponential backoff in seconds between
+            retries. Defaults to 2.0.
 
+    Returns:
+        The list of filenames that failed to download.
     """
     import joblib
 
@@ -12521,43 +13311,99 @@ def download_ee_image_tiles_parallel(
         count_len = len(str(count))
         names = [str(i + 1).zfill(count_len) for i in range(count)]
     collection = features.toList(count)
+    filenames = [
+        os.path.join(out_dir, "{}{}.tif".format(prefix, name.replace("/", "_")))
+        for name in names
+    ]
 
-    def download_data(index: int) -> None:
+    # Fingerprint of the image expression and download parameters, so a manifest
+    # left by a different job in the same directory is not mistaken for this one.
+    job_params = [
+        crs,
+        crs_transform,
+        scale,
+        resampling,
+        dtype,
+        shape,
+        scale_offset,
+        unmask_value,
+        sorted(kwargs.items()),
+    ]
+    job_id = hashlib.sha256(
+        (image.serialize() + json.dumps(job_params, default=str)).encode("utf-8")
+    ).hexdigest()
+
+    manifest = os.path.join(out_dir, _DOWNLOAD_MANIFEST)
+    records = _read_download_manifest(manifest) if resume else {}
+    pending = [
+        index
+        for index in range(count)
+        if not _is_download_complete(
+            records.get(os.path.basename(filenames[index])), filenames[index], job_id
+        )
+    ]
+    if len(pending) < count:
+        print(f"Skipping {count - len(pending)} tiles completed in a previous run.")
+
+    def download_data(index: int) -> dict[str, Any]:
         if ee_init:
-            coreutils.ee_initialize(
-                opt_url=ee.data.HIGH_VOLUME_API_BASE_URL,
-                project=project_id,
-            )
+            _ee_initialize_worker(project_id)
         region = ee.Feature(collection.get(index)).geometry()
-        filename = os.path.join(
-            out_dir, "{}{}.tif".format(prefix, names[index].replace("/", "_"))
-        )
+        filename = filenames[index]
         print(f"Downloading {index + 1}/{count}: {filename}")
 
-        download_ee_image(
-            image,
-            filename,
-            region,
-            crs,
-            crs_transform,
-            scale,
-            resampling,
-            dtype,
-            overwrite,
-            num_threads,
-            max_tile_size,
-            max_tile_dim,
-            shape,
-            scale_offset,
-            unmask_value,
-            **kwargs,
-        )
-
-    with joblib.Parallel(**job_args) as parallel:
-        parallel(joblib.delayed(download_data)(index) for index in range(count))
+        record = {"filename": os.path.basename(filename), "job": job_id}
+        for attempt in range(1, max(max_retries, 1) + 1):
+            try:
+                download_ee_image(
+                    image,
+                    filename,
+                    region,
+                    crs,
+                    crs_transform,
+                    scale,
+                    resampling,
+                    dtype,
+                    overwrite,
+                    num_threads,
+                    max_tile_size,
+                    max_tile_dim,
+                    shape,
+                    scale_offset,
+                    unmask_value,
+                    **kwargs,
+                )
+                record.pop("error", None)
+                record.update(
+                    status="completed",
+                    size=os.path.getsize(filename),
+                    sha256=_file_sha256(filename),
+                    attempts=attempt,
+                )
+                return record
+            except Exception as e:
+                record.update(status="failed", error=str(e), attempts=attempt)
+                if attempt < max_retries:
+                    time.sleep(backoff_factor**attempt)
+        return record
+
+    failed = []
+    if pending:
+        job_args = {**job_args, "return_as": "generator"}
+        with joblib.Parallel(**job_args) as parallel:
+            results = parallel(joblib.delayed(download_data)(i) for i in pending)
+            for record in results:
+                record["time"] = datetime.datetime.now().isoformat()
+                _append_download_manifest(manifest, record)
+                if record["status"] != "completed":
+                    failed.append(os.path.join(out_dir, record["filename"]))
+                    print(f"Failed to download {record['filename']}: {record['error']}")
 
     end = time.time()
     print(f"Finished in {end - start} seconds.")
+    if failed:
+        print(f"{len(failed)} tiles failed. Rerun the function to retry them.")
+    return failed
 
 
 def download_ee_image_collection(
@@ -12577,6 +13423,7 @@ def download_ee_image_collection(
     shape=None,
     scale_offset=False,
     unmask_value=None,
+    max_workers=1,
     **kwargs,
 ):
     """Download an Earth Engine ImageCollection as GeoTIFFs. Images larger than the `Earth Engine size limit are split and downloaded as
@@ -12610,6 +13457,8 @@ def download_ee_image_collection(
             Whether to apply any EE band scales and offsets to the image.
         unmask_value (float, optional): The value to use for pixels that are masked in the input image. If the exported image contains zero values,
             you should set the unmask value to a  non-zero value so that the zero values are not treated as missing data. Defaults to None.
+        max_workers (int, optional): The maximum number of images to download concurrently. Each image download may use up to
+            `num_threads` requests of its own. Defaults to 1.
     """
 
     if not isinstance(collection, ee.ImageCollection):
@@ -12631,14 +13480,15 @@ def download_ee_image_collection(
                     f"The number of filenames must match the number of image: {count}"
                 )
 
-        for i in range(0, count):
-            image = ee.Image(collection.toList(count).get(i))
-            if filenames is not None:
-                name = filenames[i]
-                if not name.endswith(".tif"):
-                    name = name + ".tif"
-            else:
-                name = image.get("system:index").getInfo() + ".tif"
+        if filenames is None:
+            filenames = collection.aggregate_array("system:index").getInfo()
+        images = collection.toList(count)
+
+        def download_image(i: int) -> None:
+            image = ee.Image(images.get(i))
+            name = filenames[i]
+            if not name.endswith(".tif"):
+                name = name + ".tif"
             filename = os.path.join(os.path.abspath(out_dir), name)
             print(f"Downloading {i + 1}/{count}: {name}")
             download_ee_image(
@@ -12660,6 +13510,8 @@ def download_ee_image_collection(
                 **kwargs,
             )
 
+        _map_concurrently(download_image, range(count), max_workers)
+
     except Exception as e:
         raise Exception(f"Error downloading image collection: {e}")
 
@@ -14371,6 +15223,167 @@ def landsat_scaling(
             return image.addBands(opticalBands, None, True)
 
 
+class TileCache:
+    """A persistent on-disk cache for XYZ map tiles.
+
+    Tiles are stored under a content-addressed path derived from the tile URL, with a
+    JSON sidecar holding the HTTP validators (ETag, Last-Modified) and the expiry time
+    computed from the Cache-Control and Expires response headers. Expired tiles are
+    revalidated with a conditional request. When the cache grows beyond `max_size`,
+    the least recently used tiles are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        max_size: int = 1024**3,
+        default_ttl: float = 7 * 24 * 3600,
+    ):
+        """Initializes the tile cache.
+
+        Args:
+            cache_dir: The cache directory. Defaults to the `tiles` subdirectory of
+                coreutils.get_cache_dir().
+            max_size: The maximum size of the cache in bytes. Defaults to 1 GB.
+            default_ttl: The lifetime in seconds of tiles whose response does not
+                specify an expiry. Defaults to 7 days.
+        """
+        if cache_dir is None:
+            cache_dir = coreutils.get_cache_dir("tiles")
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _files(self) -> list[str]:
+        files = glob.glob(os.path.join(self.cache_dir, "*", "*"))
+        return [f for f in files if not f.endswith((".json", ".tmp"))]
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            self._size = sum(os.path.getsize(f) for f in self._files())
+        return self._size
+
+    def size(self) -> int:
+        """Returns the total size of the cached tiles in bytes."""
+        with self._lock:
+            return self._total_size()
+
+    def _expiry(self, headers) -> float | None:
+        """Returns the expiry time of a response, or None if it must not be stored."""
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        if match := re.search(r"max-age=(\d+)", cache_control):
+            return time.time() + int(match.group(1))
+        if expires := headers.get("Expires"):
+            with contextlib.suppress(TypeError, ValueError):
+                return email.utils.parsedate_to_datetime(expires).timestamp()
+        return time.time() + self.default_ttl
+
+    def get(self, url: str) -> tuple[bytes | None, dict[str, Any]]:
+        """Returns the cached content and metadata of a tile.
+
+        The content is None if the tile is not cached.
+        """
+        path = self._path(url)
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path, "rb") as f:
+                content = f.read()
+        except (OSError, json.JSONDecodeError):
+            return None, {}
+        with contextlib.suppress(OSError):
+            os.utime(path)  # Marks the tile as recently used.
+        return content, meta
+
+    def put(self, url: str, content: bytes, meta: dict[str, Any]) -> None:
+        """Stores a tile in the cache and evicts old tiles if needed."""
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            total_size = self._total_size()
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            for suffix, data in [("", content), (".json", json.dumps(meta).encode())]:
+                temp = f"{path}{suffix}.{threading.get_ident()}.tmp"
+                with open(temp, "wb") as f:
+                    f.write(data)
+                os.replace(temp, path + suffix)
+
+            self._size = total_size + len(content) - old_size
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used tiles until the cache fits max_size."""
+        files = sorted(self._files(), key=lambda f: os.stat(f).st_mtime)
+        for path in files:
+            if self._size <= self.max_size * 0.9:
+                break
+            with contextlib.suppress(OSError):
+                size = os.path.getsize(path)
+                os.remove(path)
+                os.remove(path + ".json")
+                self._size -= size
+
+    def clear(self) -> None:
+        """Removes all tiles from the cache."""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._size = 0
+
+    def fetch(self, url: str, session, timeout: int = 60) -> bytes | None:
+        """Returns a tile from the cache, downloading or revalidating it if needed.
+
+        Args:
+            url: The tile URL.
+            session: The requests.Session or httpx.Client used for HTTP requests.
+            timeout: The request timeout in seconds. Defaults to 60.
+
+        Returns:
+            The tile content, or None if the tile does not exist.
+        """
+        content, meta = self.get(url)
+        if content is not None and meta.get("expires", 0) > time.time():
+            return content
+
+        headers = {}
+        if content is not None:
+            if etag := meta.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := meta.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        r = session.get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and content is not None:
+            expires = self._expiry(r.headers)
+            if expires is not None:
+                self.put(url, content, {**meta, "expires": expires})
+            return content
+        if r.status_code == 404 or not r.content:
+            return None
+        r.raise_for_status()
+
+        expires = self._expiry(r.headers)
+        if expires is not None:
+            meta = {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "expires": expires,
+            }
+            self.put(url, r.content, meta)
+        return r.content
+
+
 def tms_to_geotiff(
     output,
     bbox,
@@ -14380,11 +15393,16 @@ def tms_to_geotiff(
     crs="EPSG:3857",
     to_cog=False,
     quiet=False,
+    max_workers=5,
+    cache=False,
     **kwargs,
 ):
     """Download TMS tiles and convert them to a GeoTIFF. The source is adapted from https://github.com/gumblex/tms2geotiff.
         Credits to the GitHub user @gumblex.
 
+    Tiles are written into a tiled GeoTIFF as they arrive, so the peak memory use
+    depends on the number of tiles in flight rather than on the output size.
+
     Args:
         output (str): The output GeoTIFF file.
         bbox (list): The bounding box [minx, miny, maxx, maxy], e.g., [-122.5216, 37.733, -122.3661, 37.8095]
@@ -14395,6 +15413,10 @@ def tms_to_geotiff(
         crs (str, optional): The coordinate reference system. Defaults to "EPSG:3857".
         to_cog (bool, optional): Convert to Cloud Optimized GeoTIFF. Defaults to False.
         quiet (bool, optional): Suppress output. Defaults to False.
+        max_workers (int, optional): The maximum number of tiles to download concurrently. Defaults to 5.
+        cache (bool | TileCache, optional): Whether to reuse tiles from a persistent on-disk TileCache. If True, the
+            default cache directory is used. A TileCache instance can be passed to use a custom directory or size limit.
+            Defaults to False.
         **kwargs: Additional arguments to pass to gdal.GetDriverByName("GTiff").Create().
 
     """
@@ -14410,6 +15432,10 @@ def tms_to_geotiff(
     except ImportError:
         SESSION = requests.Session()
 
+    if cache is True:
+        cache = TileCache()
+    tile_cache = cache or None
+
     from .basemaps import XYZ_TILES
 
     if isinstance(source, str) and source.upper() in XYZ_TILES:
@@ -14450,8 +15476,6 @@ def tms_to_geotiff(
 
     EARTH_EQUATORIAL_RADIUS = 6378137.0
 
-    Image.MAX_IMAGE_PIXELS = None
-
     web_mercator = osr.SpatialReference()
     web_mercator.ImportFromEPSG(3857)
 
@@ -14483,53 +15507,29 @@ def tms_to_geotiff(
 
         return extrema[0] == (0, 0)
 
-    def paste_tile(bigim, base_size, tile, corner_xy, bbox):
-        if tile is None:
-            return bigim
+    def read_tile(tile, mode=None):
+        """Decodes a tile into a uint8 (height, width, bands) array.
+
+        Returns the array, which is None for empty tiles, the mode and the tile size.
+        """
         im = Image.open(io.BytesIO(tile))
-        mode = "RGB" if im.mode == "RGB" else "RGBA"
         size = im.size
-        if bigim is None:
-            base_size[0] = size[0]
-            base_size[1] = size[1]
-            newim = Image.new(
-                mode, (size[0] * (bbox[2] - bbox[0]), size[1] * (bbox[3] - bbox[1]))
-            )
-        else:
-            newim = bigim
-
-        dx = abs(corner_xy[0] - bbox[0])
-        dy = abs(corner_xy[1] - bbox[1])
-        xy0 = (size[0] * dx, size[1] * dy)
-        if mode == "RGB":
-            newim.paste(im, xy0)
-        else:
-            if im.mode != mode:
-                im = im.convert(mode)
-            if not is_empty(im):
-                newim.paste(im, xy0)
+        if mode is None:
+            mode = "RGB" if im.mode == "RGB" else "RGBA"
+        if im.mode != mode:
+            im = im.convert(mode)
+        array = None
+        if mode == "RGB" or not is_empty(im):
+            array = np.asarray(im, dtype=np.uint8)
         im.close()
-        return newim
-
-    def finish_picture(bigim, base_size, bbox, x0, y0, x1, y1):
-        xfrac = x0 - bbox[0]
-        yfrac = y0 - bbox[1]
-        x2 = round(base_size[0] * xfrac)
-        y2 = round(base_size[1] * yfrac)
-        imgw = round(base_size[0] * (x1 - x0))
-        imgh = round(base_size[1] * (y1 - y0))
-        # pytype: disable=attribute-error
-        retim = bigim.crop((x2, y2, x2 + imgw, y2 + imgh))
-        # pytype: enable=attribute-error
-        if retim.mode == "RGBA" and retim.getextrema()[3] == (255, 255):
-            retim = retim.convert("RGB")
-        bigim.close()  # pytype: disable=attribute-error
-        return retim
+        return array, mode, size
 
     def get_tile(url):
         retry = 3
         while 1:
             try:
+                if tile_cache is not None:
+                    return tile_cache.fetch(url, SESSION, timeout=60)
                 r = SESSION.get(url, timeout=60)
                 break
             except Exception:
@@ -14546,9 +15546,27 @@ def tms_to_geotiff(
         r.raise_for_status()
         return r.content
 
+    def fetch_tiles(urls):
+        """Yields tile contents in order with a bounded number of tiles in flight."""
+        pending = collections.deque()
+        urls = iter(urls)
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for url in itertools.islice(urls, max_workers * 2):
+                pending.append(executor.submit(get_tile, url))
+            while pending:
+                tile = pending.popleft().result()
+                for url in itertools.islice(urls, 1):
+                    pending.append(executor.submit(get_tile, url))
+                yield tile
+
     def draw_tile(
         source, lat0, lon0, lat1, lon1, zoom, filename, quiet=False, **kwargs
     ):
+        """Streams tiles into a tiled GeoTIFF without building the full image.
+
+        Returns whether the output has an alpha band that is fully opaque, in which
+        case the alpha band can be dropped.
+        """
         x0, y0 = deg2num(lat0, lon0, zoom)
         x1, y1 = deg2num(lat1, lon1, zoom)
         x0, x1 = sorted([x0, x1])
@@ -14560,71 +15578,116 @@ def tms_to_geotiff(
             )
         )
         totalnum = len(corners)
-        futures = []
-        with concurrent.futures.ThreadPoolExecutor(5) as executor:
-            for x, y in corners:
-                # pytype: disable=attribute-error
-                futures.append(
-                    executor.submit(get_tile, source.format(z=zoom, x=x, y=y))
+        bbox = (math.floor(x0), math.floor(y0), math.ceil(x1), math.ceil(y1))
+
+        # pytype: disable=attribute-error
+        urls = (source.format(z=zoom, x=x, y=y) for x, y in corners)
+        # pytype: enable=attribute-error
+        gtiff = None
+        mode = None
+        opaque = True
+        written = 0
+        for k, (tile, (cx, cy)) in enumerate(zip(fetch_tiles(urls), corners), 1):
+            if not quiet:
+                print("Downloaded image %d/%d" % (k, totalnum))
+            if tile is None:
+                continue
+            array, mode, tile_size = read_tile(tile, mode)
+
+            if gtiff is None:
+                # The first tile sets the tile size and the band layout.
+                size = tile_size
+                x_off = round(size[0] * (x0 - bbox[0]))
+                y_off = round(size[1] * (y0 - bbox[1]))
+                width = round(size[0] * (x1 - x0))
+                height = round(size[1] * (y1 - y0))
+                gtiff = gdal.GetDriverByName("GTiff").Create(
+                    filename, width, height, len(mode), gdal.GDT_Byte, **kwargs
                 )
-                # pytype: enable=attribute-error
-            bbox = (math.floor(x0), math.floor(y0), math.ceil(x1), math.ceil(y1))
-            bigim = None
-            base_size = [256, 256]
-            for k, (fut, corner_xy) in enumerate(zip(futures, corners), 1):
-                bigim = paste_tile(bigim, base_size, fut.result(), corner_xy, bbox)
-                if not quiet:
-                    print("Downloaded image %d/%d" % (k, totalnum))
+            if array is None:
+                continue
+
+            # Clip the tile to the output window and write it in place.
+            left = (cx - bbox[0]) * size[0] - x_off
+            top = (cy - bbox[1]) * size[1] - y_off
+            col0, row0 = max(0, -left), max(0, -top)
+            col1 = min(array.shape[1], size[0], width - left)
+            row1 = min(array.shape[0], size[1], height - top)
+            if col1 <= col0 or row1 <= row0:
+                continue
+            window = array[row0:row1, col0:col1]
+            for band in range(window.shape[2]):
+                gtiff.GetRasterBand(band + 1).WriteArray(
+                    window[..., band], left + col0, top + row0
+                )
+            if mode == "RGBA" and opaque:
+                opaque = bool((window[..., 3] == 255).all())
+            written += window.shape[0] * window.shape[1]
+
+        if gtiff is None:
+            raise ValueError("No tiles were found for the given bbox and zoom level.")
+
+        # Pixels not covered by any tile are transparent.
+        opaque = opaque and mode == "RGBA" and written == width * height
 
         if not quiet:
             print("Saving GeoTIFF. Please wait...")
-        img = finish_picture(bigim, base_size, bbox, x0, y0, x1, y1)
-        imgbands = len(img.getbands())
-        driver = gdal.GetDriverByName("GTiff")
-
-        if "options" not in kwargs:
-            kwargs["options"] = [
-                "COMPRESS=DEFLATE",
-                "PREDICTOR=2",
-                "ZLEVEL=9",
-                "TILED=YES",
-            ]
-
-        gtiff = driver.Create(
-            filename,
-            img.size[0],
-            img.size[1],
-            imgbands,
-            gdal.GDT_Byte,
-            **kwargs,
-        )
         xp0, yp0 = from4326_to3857(lat0, lon0)
         xp1, yp1 = from4326_to3857(lat1, lon1)
-        pwidth = abs(xp1 - xp0) / img.size[0]
-        pheight = abs(yp1 - yp0) / img.size[1]
+        pwidth = abs(xp1 - xp0) / width
+        pheight = abs(yp1 - yp0) / height
         gtiff.SetGeoTransform((min(xp0, xp1), pwidth, 0, max(yp0, yp1), 0, -pheight))
         gtiff.SetProjection(WKT_3857)
-        for band in range(imgbands):
-            array = np.array(img.getdata(band), dtype="u8")
-            array = array.reshape((img.size[1], img.size[0]))
-            band = gtiff.GetRasterBand(band + 1)
-            band.WriteArray(array)
         gtiff.FlushCache()
+        gtiff = None
 
         if not quiet:
             print(f"Image saved to {filename}")
-        return img
+        return opaque
+
+    if "options" not in kwargs:
+        kwargs["options"] = [
+            "COMPRESS=DEFLATE",
+            "PREDICTOR=2",
+            "ZLEVEL=9",
+            "TILED=YES",
+            "BIGTIFF=IF_SAFER",
+        ]
 
     try:
         temp_tif = coreutils.temp_file_path(extension=".tif")
-        draw_tile(source, south, west, north, east, zoom, temp_tif, quiet, **kwargs)
+        opaque = draw_tile(
+            source, south, west, north, east, zoom, temp_tif, quiet, **kwargs
+        )
+        # Drop a fully opaque alpha band while copying the output.
+        band_list = [1, 2, 3] if opaque else None
         if crs.upper() != "EPSG:3857":
+            if band_list is not None:
+                rgb_tif = coreutils.temp_file_path(extension=".tif")
+                gdal.Translate(
+                    rgb_tif,
+                    temp_tif,
+                    bandList=band_list,
+                    creationOptions=kwargs["options"],
+                )
+                shutil.move(rgb_tif, temp_tif)
             reproject(temp_tif, output, crs, to_cog=to_cog)
         elif to_cog:
-            image_to_cog(temp_tif, output)
+            gdal.Translate(
+                output,
+                temp_tif,
+                format="COG",
+                bandList=band_list,
+                creationOptions=["COMPRESS=DEFLATE", "BIGTIFF=IF_SAFER"],
+            )
+        elif band_list is not None:
+            gdal.Translate(
+                output, temp_tif, bandList=band_list, creationOptions=kwargs["options"]
+            )
         else:
             shutil.move(temp_tif, output)
-        os.remove(temp_tif)
+        if os.path.exists(temp_tif):
+            os.remove(temp_tif)
     except Exception as e:
         print(e)
 
@@ -14731,8 +15794,7 @@ def ee_to_geotiff(
                 "The palette must be a list of colors or a string or a Box object."
             )
 
-    map_id_dict = ee.Image(image).getMapId(vis_params)
-    url = map_id_dict["tile_fetcher"].url_format
+    url = coreutils.ee_tile_url_format(image, vis_params)
 
     if bbox is None:
         bbox = ee_to_bbox(image)
@@ -10,7 +10,7 @@ import ee
 import ipyleaflet
 import ipywidgets
 
-from . import basemaps
+from .basemaps import get_google_map_tile_providers, get_xyz_dict
 from . import coreutils
 from . import ee_tile_layers
 from . import map_widgets
@@ -18,6 +18,9 @@ from . import toolbar
 
 _DRAWN_FEATURES_LAYER = "Drawn Features"
 
+# Available basemaps, built once per map class and Google Maps API key.
+_AVAILABLE_BASEMAPS: dict[tuple[type, str | None], dict[str, Any]] = {}
+
 
 class DrawActions(str, enum.Enum):
     """Action types for the draw control."""
@@ -1349,10 +1352,15 @@ class Map(ipyleaflet.Map, MapInterface):
         Returns:
             Dict[str, Any]: The available basemaps.
         """
-        tile_providers = list(basemaps.get_xyz_dict().values())
-        if coreutils.get_google_maps_api_key():
+        api_key = coreutils.get_google_maps_api_key()
+        cache_key = (type(self), api_key)
+        if cache_key in _AVAILABLE_BASEMAPS:
+            return dict(_AVAILABLE_BASEMAPS[cache_key])
+
+        tile_providers = list(get_xyz_dict().values())
+        if api_key:
             tile_providers = tile_providers + list(
-                basemaps.get_google_map_tile_providers().values()
+                get_google_map_tile_providers().values()
             )
 
         ret_dict = {}
@@ -1369,7 +1377,8 @@ class Map(ipyleaflet.Map, MapInterface):
                 if provider := ret_dict.get(map_name):
                     aliased_maps[alias] = provider
                     break
-        return {**aliased_maps, **ret_dict}  # pytype: disable=bad-return-type
+        _AVAILABLE_BASEMAPS[cache_key] = {**aliased_maps, **ret_dict}
+        return dict(_AVAILABLE_BASEMAPS[cache_key])
 
     def _get_preferred_basemap_name(self, basemap_name: str) -> str:
         """Returns the aliased basemap name.
@@ -5,6 +5,8 @@ import random
 import string
 import sys
 import tempfile
+import threading
+import time
 from typing import Any
 import uuid
 import webbrowser
@@ -213,7 +215,28 @@ def build_computed_object_tree(
     if isinstance(ee_object, ee.FeatureCollection):
         ee_object = ee_object.map(lambda f: ee.Feature(None, f.toDictionary()))
 
-    layer_info = ee_object.getInfo()
+    return build_info_tree(
+        ee_object.getInfo(), layer_name, opened, ee_object.__class__.__name__
+    )
+
+
+def build_info_tree(
+    layer_info: dict[str, Any] | None,
+    layer_name: str = "",
+    opened: bool = False,
+    default_type: str = "",
+) -> dict[str, Any]:
+    """Return a tree structure representing the info of an EE object.
+
+    Args:
+        layer_info: The result of getInfo() on the Earth Engine object.
+        layer_name: The name of the layer.
+        opened: Whether to expand the tree.
+        default_type: The type to show if layer_info has no type.
+
+    Returns:
+        The node representing the Earth Engine object information.
+    """
     if not layer_info:
         return {}
 
@@ -227,7 +250,7 @@ def build_computed_object_tree(
     ordering_list = ["type", "id", "version", "bands", "properties"]
     layer_info = _order_items(layer_info, ordering_list)
 
-    ee_type = layer_info.get("type", ee_object.__class__.__name__)
+    ee_type = layer_info.get("type", default_type)
 
     band_info = ""
     if bands := layer_info.get("bands"):
@@ -657,6 +680,184 @@ def temp_file_path(extension: str) -> str:
     return file_path
 
 
+def get_cache_dir(subdir: str | None = None, make_dirs: bool = True) -> str:
+    """Returns the directory used to cache geemap data between sessions.
+
+    The directory can be set with the GEEMAP_CACHE_DIR environment variable. Otherwise
+    it is `geemap` under XDG_CACHE_HOME, which defaults to `~/.cache`.
+
+    Args:
+        subdir: An optional subdirectory of the cache directory.
+        make_dirs: Whether to create the directory if it does not exist.
+    """
+    cache_dir = os.environ.get("GEEMAP_CACHE_DIR")
+    if not cache_dir:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        cache_dir = os.path.join(base_dir, "geemap")
+    if subdir:
+        cache_dir = os.path.join(cache_dir, subdir)
+    if make_dirs:
+        os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+_VIS_STATS_CACHE: dict[str, dict[str, float]] = {}
+_VIS_STATS_CACHE_SIZE = 256
+_VIS_STATS_LOCK = threading.Lock()
+
+
+def ee_cache_key(*objects: Any) -> str:
+    """Returns a string key identifying EE objects and plain values.
+
+    EE objects are identified by their serialized expression, so equal expressions
+    built separately share a key. Other values are identified by their JSON encoding.
+
+    Args:
+        objects: The EE objects and values, e.g., an image and its vis params.
+    """
+
+    def encode(value: Any) -> Any:
+        if hasattr(value, "serialize"):
+            serialized = value.serialize()
+            if isinstance(serialized, str):
+                return serialized
+        return repr(value)
+
+    return json.dumps(objects, default=encode, sort_keys=True)
+
+
+def image_vis_stats(
+    image: ee.Image,
+    region: ee.Geometry | ee.Feature | ee.FeatureCollection | None = None,
+    bands: list[str] | None = None,
+    scale: float | None = None,
+    crs: str | None = None,
+    percentiles: list[int] | None = None,
+    max_pixels: float = 1e12,
+) -> dict[str, float]:
+    """Computes the statistics used to stretch an image for visualization.
+
+    The minimum, maximum, mean, standard deviation and optional percentiles are
+    computed with one combined reducer in a single request. Results are cached by the
+    image expression, region, bands, scale and crs, so repeated stretches of the same
+    image do not call Earth Engine again.
+
+    Args:
+        image: The image to compute statistics for.
+        region: The region over which to reduce data. Defaults to the footprint of
+            the image.
+        bands: The bands to use. Defaults to all bands.
+        scale: A nominal scale in meters of the projection to work in.
+        crs: The projection to work in.
+        percentiles: Percentiles to compute, e.g., [2, 98].
+        max_pixels: The maximum number of pixels to reduce. Statistics are computed
+            with bestEffort, so a coarser scale is used for larger regions.
+
+    Returns:
+        A dictionary with the "min", "max", "mean" and "stdDev" across the bands, and
+            one "p{N}" entry per percentile. Minimums and low percentiles are the
+            lowest across bands, maximums and high percentiles the highest, and the
+            mean and standard deviation are averaged across bands.
+
+    Raises:
+        ValueError: If no unmasked pixels were sampled.
+    """
+    percentiles = sorted(percentiles or [])
+    key = ee_cache_key(image, region, bands, scale, crs, percentiles, max_pixels)
+    with _VIS_STATS_LOCK:
+        if key in _VIS_STATS_CACHE:
+            return dict(_VIS_STATS_CACHE[key])
+
+    reducer = (
+        ee.Reducer.minMax()
+        .combine(ee.Reducer.mean().unweighted(), sharedInputs=True)
+        .combine(ee.Reducer.stdDev(), sharedInputs=True)
+    )
+    if percentiles:
+        reducer = reducer.combine(ee.Reducer.percentile(percentiles), sharedInputs=True)
+
+    if bands is not None:
+        image = image.select(bands)
+    if region is None:
+        region = image.geometry()
+    kwargs = {"scale": scale, "crs": crs}
+    stats = image.reduceRegion(
+        reducer=reducer,
+        geometry=region,
+        bestEffort=True,
+        maxPixels=max_pixels,
+        **{k: v for k, v in kwargs.items() if v is not None},
+    ).getInfo()
+
+    def values(suffix: str) -> list[float]:
+        return [v for k, v in stats.items() if k.endswith(suffix) and v is not None]
+
+    aggregates = {"min": min, "max": max, "mean": _average, "stdDev": _average}
+    suffixes = {"min": "_min", "max": "_max", "mean": "_mean", "stdDev": "_stdDev"}
+    for percentile in percentiles:
+        name = f"p{percentile}"
+        aggregates[name] = min if percentile <= 50 else max
+        suffixes[name] = f"_{name}"
+
+    result = {}
+    for name, aggregate in aggregates.items():
+        found = values(suffixes[name])
+        if not found:
+            raise ValueError("No unmasked pixels were sampled.")
+        result[name] = aggregate(found)
+
+    with _VIS_STATS_LOCK:
+        if len(_VIS_STATS_CACHE) >= _VIS_STATS_CACHE_SIZE:
+            _VIS_STATS_CACHE.pop(next(iter(_VIS_STATS_CACHE)))
+        _VIS_STATS_CACHE[key] = result
+    return dict(result)
+
+
+_TILE_URL_CACHE: dict[str, tuple[float, str]] = {}
+_TILE_URL_CACHE_SIZE = 512
+# Seconds a cached tile URL is reused, well within the lifetime of an EE map ID.
+_TILE_URL_CACHE_TTL = 3600
+_TILE_URL_LOCK = threading.Lock()
+
+
+def ee_tile_url_format(image: ee.Image, vis_params: dict[str, Any] | None) -> str:
+    """Returns the XYZ tile URL format of an image, reusing recent map IDs.
+
+    Map IDs are cached in memory for all map backends, keyed by the serialized image
+    expression, the visualization parameters and the Earth Engine project, so adding
+    an identical layer again does not call getMapId.
+
+    Args:
+        image: The image to render.
+        vis_params: The visualization parameters passed to getMapId.
+    """
+    # pylint: disable-next=protected-access
+    project = ee.data._get_state().cloud_api_user_project
+    key = ee_cache_key(image, vis_params, project)
+    now = time.monotonic()
+    with _TILE_URL_LOCK:
+        cached = _TILE_URL_CACHE.get(key)
+        if cached is not None and now - cached[0] < _TILE_URL_CACHE_TTL:
+            return cached[1]
+
+    map_id_dict = ee.Image(image).getMapId(vis_params)
+    url_format = map_id_dict["tile_fetcher"].url_format
+
+    with _TILE_URL_LOCK:
+        _TILE_URL_CACHE.pop(key, None)
+        if len(_TILE_URL_CACHE) >= _TILE_URL_CACHE_SIZE:
+            _TILE_URL_CACHE.pop(next(iter(_TILE_URL_CACHE)))
+        _TILE_URL_CACHE[key] = (now, url_format)
+    return url_format
+
+
+def _average(values: list[float]) -> float:
+    """Returns the arithmetic mean of the values."""
+    return sum(values) / len(values)
+
+
 def download_file(
     url: str | None = None,
     output: str | None = None,
@@ -5,11 +5,14 @@
 # The geemap community will maintain the extra features.                         #
 # *******************************************************************************#
 
+import csv
 import importlib
 import json
 import os
 import pathlib
 import shutil
+import threading
+import time
 from typing import Any
 import urllib.request
 
@@ -18,6 +21,15 @@ import ipywidgets
 from IPython.display import display
 
 from . import common
+from . import coreutils
+
+# Bump when the layout of the cached catalog index changes.
+CATALOG_INDEX_VERSION = 1
+
+# The age in seconds after which the cached catalog index is refreshed (1 day).
+CATALOG_INDEX_MAX_AGE = 86400
+
+_refresh_lock = threading.Lock()
 
 
 def get_data_csv() -> str:
@@ -125,21 +137,108 @@ def merge_dict(dict1: dict[Any, Any], dict2: dict[Any, Any]) -> dict[Any, Any]:
     return {**dict1, **dict2}
 
 
-def get_data_dict() -> dict[str, Any]:
-    """Returns the Earth Engine Data Catalog as a nested dictionary."""
-    data_dict = {}
+def get_catalog_index_path() -> str:
+    """Returns the path to the cached Earth Engine Data Catalog index."""
+    return os.path.join(
+        coreutils.get_cache_dir("datasets"),
+        f"catalog_index_v{CATALOG_INDEX_VERSION}.json",
+    )
+
+
+def get_bundled_data_list() -> list[str]:
+    """Returns the dataset IDs of the catalog CSV shipped with geemap."""
+    with open(get_data_csv(), newline="", encoding="utf-8") as f:
+        datasets = [row["id"] for row in csv.DictReader(f)]
+    return datasets + get_geemap_data_list()
+
+
+def update_catalog_index() -> list[str]:
+    """Downloads the dataset IDs and saves them to the catalog index cache.
+
+    Raises:
+        Exception: If the catalog fails to download.
+
+    Returns:
+        The list of dataset IDs.
+    """
     datasets = get_data_list()
+    index = {
+        "version": CATALOG_INDEX_VERSION,
+        "updated": time.time(),
+        "datasets": datasets,
+    }
+    index_path = get_catalog_index_path()
+    tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+    return datasets
+
 
+def _refresh_catalog_index() -> None:
+    """Refreshes the catalog index, ignoring network errors."""
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        update_catalog_index()
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass
+    finally:
+        _refresh_lock.release()
+
+
+def load_catalog_index(refresh: bool = True) -> list[str]:
+    """Returns the dataset IDs of the Earth Engine Data Catalog.
+
+    The IDs are read from a versioned index cached under the geemap cache directory
+    (see coreutils.get_cache_dir). If the index is older than CATALOG_INDEX_MAX_AGE,
+    it is refreshed in a background thread for the next session. Without a cached
+    index, the catalog is downloaded once, falling back to the catalog CSV shipped
+    with geemap when offline.
+
+    Args:
+        refresh: Whether to download the catalog when the index is missing or stale.
+            Defaults to True.
+    """
+    try:
+        with open(get_catalog_index_path(), encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+
+    if index is None or index.get("version") != CATALOG_INDEX_VERSION:
+        if refresh:
+            try:
+                return update_catalog_index()
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+        return get_bundled_data_list()
+
+    if refresh and time.time() - index.get("updated", 0) > CATALOG_INDEX_MAX_AGE:
+        threading.Thread(target=_refresh_catalog_index, daemon=True).start()
+    return index["datasets"]
+
+
+def get_data_dict(datasets: list[str] | None = None) -> dict[str, Any]:
+    """Returns the Earth Engine Data Catalog as a nested dictionary.
+
+    Args:
+        datasets: The dataset IDs to include. Defaults to None, which uses the cached
+            catalog index (see load_catalog_index).
+    """
+    if datasets is None:
+        datasets = load_catalog_index()
+
+    data_dict = {}
     for dataset in datasets:
-        tree_dict = {}
-        items = dataset.split("/")
-        for index, key in enumerate(reversed(items)):
-            if index == 0:
-                tree_dict = {key: dataset}
-            else:
-                tree_dict = {key: tree_dict}
-
-        data_dict = merge_dict(data_dict, tree_dict)
+        *parents, name = dataset.split("/")
+        node = data_dict
+        for key in parents:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                break
+        else:
+            node.setdefault(name, dataset)
         data_dict[dataset.replace("/", "_")] = dataset
 
     return data_dict
@@ -162,4 +261,10 @@ def get_metadata(asset_id: str, source: str = "ee") -> None:
     display(html_widget)
 
 
-DATA = box.Box(get_data_dict(), frozen_box=True)
+def __getattr__(name: str) -> Any:
+    """Builds DATA on first access so importing this module needs no network."""
+    if name == "DATA":
+        data = box.Box(get_data_dict(), frozen_box=True)
+        globals()["DATA"] = data
+        return data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
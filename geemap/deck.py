@@ -208,8 +208,7 @@ class Map(pdk.Deck):
                     "The palette must be a list of colors or a string or a Box object."
                 )
 
-        map_id_dict = ee.Image(image).getMapId(vis_params)
-        url = map_id_dict["tile_fetcher"].url_format
+        url = coreutils.ee_tile_url_format(image, vis_params)
         self.add_layer(url, layer_name=name, **kwargs)
 
     addLayer = add_ee_layer
@@ -5,7 +5,6 @@
 # The Earth Engine team and the geemap community will maintain the core features.#
 # *******************************************************************************#
 
-from functools import lru_cache
 from typing import Any
 
 import box
@@ -29,8 +28,7 @@ def _get_tile_url_format(
         vis_params: The visualization parameters.
     """
     image = _ee_object_to_image(ee_object, vis_params)
-    map_id_dict = ee.Image(image).getMapId(vis_params)
-    return map_id_dict["tile_fetcher"].url_format
+    return coreutils.ee_tile_url_format(image, vis_params)
 
 
 def _validate_vis_params(vis_params: dict[str, Any] | None) -> dict[str, Any]:
@@ -202,7 +200,6 @@ class EELeafletTileLayer(ipyleaflet.TileLayer):
             **kwargs,
         )
 
-    @lru_cache
     def _calculate_vis_stats(
         self,
         *,
@@ -212,7 +209,8 @@ class EELeafletTileLayer(ipyleaflet.TileLayer):
         """Calculate stats used for visualization parameters.
 
         Stats are calculated consistently with the Code Editor visualization parameters,
-        and are cached to avoid recomputing for the same bounds and bands.
+        and are cached by coreutils.image_vis_stats to avoid recomputing for the same
+        image, bounds and bands.
 
         Args:
             bounds: The bounds to sample.
@@ -223,38 +221,15 @@ class EELeafletTileLayer(ipyleaflet.TileLayer):
                 specified bands.
 
         """
-        stat_reducer = (
-            ee.Reducer.minMax()
-            .combine(ee.Reducer.mean().unweighted(), sharedInputs=True)
-            .combine(ee.Reducer.stdDev(), sharedInputs=True)
+        stats = coreutils.image_vis_stats(
+            self._ee_object,
+            region=bounds,
+            bands=bands,
+            scale=1,
+            crs="SR-ORG:6627",
+            max_pixels=10_000,
         )
-
-        stats = (
-            self._ee_object.select(bands)
-            .reduceRegion(
-                reducer=stat_reducer,
-                geometry=bounds,
-                bestEffort=True,
-                maxPixels=10_000,
-                crs="SR-ORG:6627",
-                scale=1,
-            )
-            .getInfo()
-        )
-
-        mins, maxs, stds, means = (
-            {v for k, v in stats.items() if k.endswith(stat) and v is not None}
-            for stat in ("_min", "_max", "_stdDev", "_mean")
-        )
-        if any(len(vals) == 0 for vals in (mins, maxs, stds, means)):
-            raise ValueError("No unmasked pixels were sampled.")
-
-        min_val = min(mins)
-        max_val = max(maxs)
-        std_dev = sum(stds) / len(stds)
-        mean = sum(means) / len(means)
-
-        return min_val, max_val, std_dev, mean
+        return stats["min"], stats["max"], stats["stdDev"], stats["mean"]
 
     def calculate_vis_minmax(
         self,
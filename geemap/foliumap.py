@@ -29,7 +29,7 @@ import pandas as pd
 import requests
 import xarray as xr
 
-from . import basemaps
+from .basemaps import folium_basemaps
 from . import common
 from .common import *
 from .conversion import *
@@ -43,7 +43,7 @@ if not coreutils.in_colab_shell():
     from .plot import *
 
 
-basemaps = box.Box(basemaps.xyz_to_folium(), frozen_box=True)
+basemaps = folium_basemaps
 
 
 class Map(folium.Map):
@@ -3348,9 +3348,8 @@ def ee_tile_layer(
                 "The palette must be a list of colors or a string or a Box object."
             )
 
-    map_id_dict = ee.Image(image).getMapId(vis_params)
     tile_layer = folium.raster_layers.TileLayer(
-        tiles=map_id_dict["tile_fetcher"].url_format,
+        tiles=coreutils.ee_tile_url_format(image, vis_params),
         attr="Google Earth Engine",
         name=name,
         overlay=True,
@@ -13,9 +13,13 @@ ipyleaflet functions use snake case, such as add_tile_layer(), add_wms_layer(),
 
 import base64
 from collections.abc import Callable
+import concurrent.futures
 import csv
+import functools
 import io
 import json
+import logging
+import math
 import os
 import random
 import threading
@@ -34,19 +38,126 @@ import requests
 import xarray as xr
 
 from IPython.display import display
-from .basemaps import get_xyz_dict, xyz_to_leaflet
+from .basemaps import get_xyz_dict, leaflet_basemaps, xyz_to_leaflet
 from . import colormaps
 from .common import *
 from .conversion import *
 from .ee_tile_layers import *
 from . import core
 from . import coreutils
+from . import ee_tile_layers
+from . import geojson_layers
 from . import map_widgets
 from .plot import *
 from .timelapse import *
 from . import toolbar
 
-basemaps = box.Box(xyz_to_leaflet(), frozen_box=True)
+basemaps = leaflet_basemaps
+
+
+class _FramePrefetcher:
+    """Resolves the tile URLs of time slider frames and warms their tiles.
+
+    Args:
+        frame_url: Returns the tile URL format of the frame with an index.
+        num_frames: The number of frames.
+        max_workers: The maximum number of concurrent requests.
+        prefetch_tiles: The number of upcoming frames whose tiles are requested.
+        progress: The progress bar of the resolved frames.
+    """
+
+    def __init__(
+        self,
+        frame_url: Callable[[int], str],
+        num_frames: int,
+        max_workers: int,
+        prefetch_tiles: int = 0,
+        progress: ipywidgets.IntProgress | None = None,
+    ):
+        self._frame_url = frame_url
+        self.num_frames = num_frames
+        self.prefetch_tiles = prefetch_tiles
+        self.progress = progress
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._lock = threading.Lock()
+        self._url_locks = [threading.Lock() for _ in range(num_frames)]
+        self._urls: dict[int, str] = {}
+        self._warmed: set[tuple[int, tuple, int]] = set()
+
+    def url(self, index: int) -> str:
+        """Returns the tile URL format of a frame, resolving it only once."""
+        with self._url_locks[index]:
+            if index not in self._urls:
+                self._urls[index] = self._frame_url(index)
+            return self._urls[index]
+
+    def resolve_all(self) -> None:
+        """Resolves the tile URLs of all frames in the background."""
+        if self.progress is not None:
+            self.progress.layout.display = "flex"
+        for index in range(self.num_frames):
+            future = self._submit(f"resolve frame {index}", self.url, index)
+            if future is not None and self.progress is not None:
+                future.add_done_callback(self._on_frame_resolved)
+
+    def _on_frame_resolved(self, future: concurrent.futures.Future) -> None:
+        del future  # Unused.
+        with self._lock:
+            self.progress.value += 1
+            if self.progress.value >= self.num_frames:
+                self.progress.layout.display = "none"
+
+    def prefetch_next(self, index: int, bounds, zoom: int) -> None:
+        """Requests the tiles in the bounds of the frames after a frame."""
+        bounds = tuple(tuple(corner) for corner in bounds)
+        for step in range(1, self.prefetch_tiles + 1):
+            key = ((index + step) % self.num_frames, bounds, zoom)
+            with self._lock:
+                if key in self._warmed:
+                    continue
+                self._warmed.add(key)
+            self._submit(f"prefetch frame {key[0]}", self._warm_tiles, *key)
+
+    def _warm_tiles(self, index: int, bounds, zoom: int) -> None:
+        (south, west), (north, east) = bounds
+        n = 2**zoom
+
+        def tile_xy(lat, lon):
+            lat_r = math.radians(max(min(lat, 85.0511), -85.0511))
+            x = (lon + 180) / 360 * n
+            y = (1 - math.log(math.tan(lat_r) + 1 / math.cos(lat_r)) / math.pi) / 2
+            return int(x), min(int(y * n), n - 1)
+
+        x0, y0 = tile_xy(north, west)
+        x1, y1 = tile_xy(south, east)
+        url_format = self.url(index)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                url = url_format.format(x=x % n, y=y, z=zoom)
+                self._submit(f"prefetch tile {url}", self._get_tile, url)
+
+    @staticmethod
+    def _get_tile(url: str) -> None:
+        response = requests.get(url, timeout=60)
+        response.raise_for_status()
+
+    def _submit(self, action: str, fn, *args) -> concurrent.futures.Future | None:
+        """Runs a function in the pool, logging its error, unless it is closed."""
+        try:
+            future = self.executor.submit(fn, *args)
+        except RuntimeError:
+            return None  # The prefetcher was closed.
+        future.add_done_callback(functools.partial(self._log_error, action))
+        return future
+
+    @staticmethod
+    def _log_error(action: str, future: concurrent.futures.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logging.warning("Failed to %s: %s", action, future.exception())
+
+    def close(self) -> None:
+        """Stops the pending requests."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 
 class Map(core.Map):
@@ -2717,6 +2828,7 @@ class Map(core.Map):
         fill_colors: list[str] | None = None,
         info_mode: str = "on_hover",
         encoding: str = "utf-8",
+        dynamic: bool | None = None,
     ) -> None:
         """Adds a GeoJSON file to the map.
 
@@ -2729,6 +2841,7 @@ class Map(core.Map):
             fill_colors: The random colors to use for filling polygons. Defaults to ["black"].
             info_mode: Displays the attributes by either on_hover or on_click. Any value other than "on_hover" or "on_click" will be treated as None. Defaults to "on_hover".
             encoding: The encoding of the GeoJSON file. Defaults to "utf-8".
+            dynamic: Whether to only show the features in the map view, simplified to the zoom level, which scales to large datasets. The style callback is then called once per feature, when it is first shown. Defaults to None, which is True for GeoJSON with more than 10,000 features.
 
         Raises:
             FileNotFoundError: The provided GeoJSON file could not be found.
@@ -2858,7 +2971,19 @@ class Map(core.Map):
         if style_callback is None:
             style_callback = random_color
 
-        if style_callback_only:
+        if dynamic is None:
+            features = data.get("features", [])
+            dynamic = len(features) > geojson_layers.MAX_STATIC_FEATURES
+
+        if dynamic:
+            geojson = geojson_layers.ViewportGeoJSON(
+                data,
+                feature_style=style_callback,
+                style={} if style_callback_only else style,
+                hover_style=hover_style,
+                name=layer_name,
+            )
+        elif style_callback_only:
             geojson = ipyleaflet.GeoJSON(
                 data=data,
                 hover_style=hover_style,
@@ -2882,6 +3007,9 @@ class Map(core.Map):
         self.add(geojson)
         self.geojson_layers.append(geojson)
 
+        if dynamic:
+            self._follow_view(geojson)
+
         if not hasattr(self, "json_layer_dict"):
             self.json_layer_dict = {}
 
@@ -3424,6 +3552,7 @@ class Map(core.Map):
         info_mode: str = "on_hover",
         zoom_to_layer: bool = True,
         encoding: str = "utf-8",
+        dynamic: bool | None = None,
     ) -> None:
         """Adds a GeoDataFrame to the map.
 
@@ -3437,6 +3566,7 @@ class Map(core.Map):
             info_mode: Displays the attributes by either on_hover or on_click. Any value other than "on_hover" or "on_click" will be treated as None. Defaults to "on_hover".
             zoom_to_layer: Whether to zoom to the layer.
             encoding: The encoding of the GeoDataFrame. Defaults to "utf-8".
+            dynamic: Whether to only show the features in the map view. See add_geojson(). Defaults to None, which is True for more than 10,000 features.
         """
         data = gdf_to_geojson(gdf, epsg="4326")
 
@@ -3453,6 +3583,7 @@ class Map(core.Map):
             fill_colors,
             info_mode,
             encoding,
+            dynamic,
         )
 
         if zoom_to_layer:
@@ -3518,6 +3649,9 @@ class Map(core.Map):
         slider_length: str = "150px",
         date_format: str = "YYYY-MM-dd",
         opacity: float = 1.0,
+        prefetch: bool = True,
+        prefetch_tiles: int = 0,
+        max_workers: int = 8,
         **kwargs,
     ) -> None:
         """Adds a time slider to the map.
@@ -3533,6 +3667,14 @@ class Map(core.Map):
             slider_length: Length of the time slider. Defaults to "150px".
             date_format: The date format to use. Defaults to 'YYYY-MM-dd'.
             opacity: The opacity of layers. Defaults to 1.0.
+            prefetch: Whether to resolve the tile URLs of all frames concurrently in
+                the background, so moving the slider does not wait for getMapId.
+                Defaults to True.
+            prefetch_tiles: The number of upcoming frames whose tiles in the current
+                view are requested ahead of playback to warm the server cache.
+                Defaults to 0.
+            max_workers: The maximum number of concurrent requests used to prefetch
+                tile URLs and tiles. Defaults to 8.
 
         Raises:
             TypeError: If the ee_object is not ee.Image | ee.ImageCollection.
@@ -3583,6 +3725,12 @@ class Map(core.Map):
             raise TypeError("The ee_object must be an ee.Image or ee.ImageCollection")
 
         first = ee.Image(ee_object.first())
+        frames = ee_object.toList(ee_object.size())
+        tile_vis_params = ee_tile_layers._validate_vis_params(vis_params)
+
+        def frame_url(index: int) -> str:
+            image = ee.Image(frames.get(index))
+            return ee_tile_layers._get_tile_url_format(image, tile_vis_params)
 
         if layer_name not in self.ee_layers:
             self.addLayer(ee_object.toBands(), {}, layer_name, False, opacity)
@@ -3622,7 +3770,21 @@ class Map(core.Map):
 
         play_chk = ipywidgets.Checkbox(value=False)
 
-        slider_widget = ipywidgets.HBox([slider, label, play_btn, pause_btn, close_btn])
+        progress = ipywidgets.IntProgress(
+            min=0,
+            max=len(labels),
+            layout=ipywidgets.Layout(width="60px", display="none"),
+        )
+
+        slider_widget = ipywidgets.HBox(
+            [slider, label, progress, play_btn, pause_btn, close_btn]
+        )
+
+        prefetcher = _FramePrefetcher(
+            frame_url, len(labels), max_workers, prefetch_tiles, progress
+        )
+        if prefetch:
+            prefetcher.resolve_all()
 
         def play_click(b):
             del b  # Unused.
@@ -3652,17 +3814,20 @@ class Map(core.Map):
             self.default_style = {"cursor": "wait"}
             index = slider.value - 1
             label.value = labels[index]
-            image = ee.Image(ee_object.toList(ee_object.size()).get(index))
+            image = ee.Image(frames.get(index))
             if layer_name not in self.ee_layers:
                 self.addLayer(ee_object.toBands(), {}, layer_name, False, opacity)
             self.addLayer(image, vis_params, "Image X", True, opacity)
             self.default_style = {"cursor": "default"}
+            if prefetch_tiles > 0 and self.bounds:
+                prefetcher.prefetch_next(index, self.bounds, int(self.zoom))
 
         slider.observe(slider_changed, "value")
 
         def close_click(b):
             del b  # Unused.
             play_chk.value = False
+            prefetcher.close()
             self.toolbar_reset()
             self.remove_ee_layer("Image X")
             self.remove_ee_layer(layer_name)
@@ -3677,6 +3842,14 @@ class Map(core.Map):
         self.add(slider_ctrl)
         self.slider_ctrl = slider_ctrl
 
+        def controls_changed(change):
+            # Stop prefetching however the slider is removed from the map.
+            if slider_ctrl not in change["new"]:
+                prefetcher.close()
+                self.unobserve(controls_changed, "controls")
+
+        self.observe(controls_changed, "controls")
+
     def add_xy_data(
         self,
         in_csv: str,
@@ -3764,6 +3937,7 @@ class Map(core.Map):
         icon_names: list[str] | None = None,
         spin: bool = False,
         add_legend: bool = True,
+        max_markers: int | None = 10_000,
         **kwargs,
     ) -> None:
         """Adds a marker cluster to the map.
@@ -3780,6 +3954,7 @@ class Map(core.Map):
             icon_names: A list of names to be used for the icons. More icons can be found at https://fontawesome.com/v4/icons. Defaults to ['info'].
             spin: If True, the icon will spin. Defaults to False.
             add_legend: If True, a legend will be added to the map. Defaults to True.
+            max_markers: Above this number of points, the points are drawn as circles in one GeoJSON layer that shows up to 5,000 points in the map view, instead of a marker cluster. None always uses a marker cluster. Defaults to 10,000.
         """
         del kwargs  # Unused.
 
@@ -3882,104 +4057,60 @@ class Map(core.Map):
         df["x"] = df.geometry.x
         df["y"] = df.geometry.y
 
-        points = list(zip(df["y"], df["x"]))
-
-        if popup is not None:
-            if isinstance(popup, str):
-                labels = df[popup]
-
-                markers = []
-                for index, point in enumerate(points):
-                    if items is not None:
-                        marker_color = marker_colors[
-                            items.index(df[color_column][index])
-                        ]
-                        icon_name = icon_names[items.index(df[color_column][index])]
-                        icon_color = icon_colors[items.index(df[color_column][index])]
-                        marker_icon = ipyleaflet.AwesomeIcon(
-                            name=icon_name,
-                            marker_color=marker_color,
-                            icon_color=icon_color,
-                            spin=spin,
-                        )
-                    else:
-                        marker_icon = None
-
-                    marker = ipyleaflet.Marker(
-                        location=point,
-                        draggable=False,
-                        popup=ipywidgets.HTML(str(labels[index])),
-                        icon=marker_icon,
-                    )
-                    markers.append(marker)
-
-            elif isinstance(popup, list):
-                labels = []
-                for i in range(len(points)):
-                    label = ""
-                    for item in popup:
-                        label = (
-                            label
-                            + "<b>"
-                            + str(item)
-                            + "</b>"
-                            + ": "
-                            + str(df[item][i])
-                            + "<br>"
-                        )
-                    labels.append(label)
-                df["popup"] = labels
-
-                markers = []
-                for index, point in enumerate(points):
-                    if items is not None:
-                        marker_color = marker_colors[
-                            items.index(df[color_column][index])
-                        ]
-                        icon_name = icon_names[items.index(df[color_column][index])]
-                        icon_color = icon_colors[items.index(df[color_column][index])]
-                        marker_icon = ipyleaflet.AwesomeIcon(
-                            name=icon_name,
-                            marker_color=marker_color,
-                            icon_color=icon_color,
-                            spin=spin,
-                        )
-                    else:
-                        marker_icon = None
-
-                    marker = ipyleaflet.Marker(
-                        location=point,
-                        draggable=False,
-                        popup=ipywidgets.HTML(labels[index]),
-                        icon=marker_icon,
-                    )
-                    markers.append(marker)
+        # Build the popup of every point with column-wise string operations.
+        if isinstance(popup, str):
+            labels = df[popup].astype(str).tolist()
+        else:
+            label_series = pd.Series("", index=df.index)
+            for item in popup:
+                label_series += f"<b>{item}</b>: " + df[item].astype(str) + "<br>"
+            labels = label_series.tolist()
+            df["popup"] = labels
 
+        # The category of each point, as an index into items.
+        if items is not None:
+            categories = pd.Index(items).get_indexer(df[color_column]).tolist()
         else:
-            markers = []
-            for point in points:
-                if items is not None:
-                    # pytype: disable=name-error
-                    marker_color = marker_colors[items.index(df[color_column][index])]
-                    icon_name = icon_names[items.index(df[color_column][index])]
-                    icon_color = icon_colors[items.index(df[color_column][index])]
-                    # pytype: enable=name-error
-                    marker_icon = ipyleaflet.AwesomeIcon(
+            categories = [None] * len(df)
+
+        if max_markers is not None and len(df) > max_markers:
+            self._add_point_features(
+                df["x"].tolist(),
+                df["y"].tolist(),
+                labels,
+                categories,
+                marker_colors,
+                layer_name,
+            )
+        else:
+            # Points of the same category share one icon.
+            icons = [None]
+            if items is not None:
+                icons = [
+                    ipyleaflet.AwesomeIcon(
                         name=icon_name,
                         marker_color=marker_color,
                         icon_color=icon_color,
                         spin=spin,
                     )
-                else:
-                    marker_icon = None
-
-                marker = ipyleaflet.Marker(
-                    location=point, draggable=False, icon=marker_icon
+                    for marker_color, icon_name, icon_color in zip(
+                        marker_colors, icon_names, icon_colors
+                    )
+                ]
+            markers = [
+                ipyleaflet.Marker(
+                    location=(lat, lon),
+                    draggable=False,
+                    popup=ipywidgets.HTML(label),
+                    icon=icons[category or 0],
+                )
+                for lon, lat, label, category in zip(
+                    df["x"], df["y"], labels, categories
                 )
-                markers.append(marker)
+            ]
 
-        marker_cluster = ipyleaflet.MarkerCluster(markers=markers, name=layer_name)
-        self.add(marker_cluster)
+            marker_cluster = ipyleaflet.MarkerCluster(markers=markers, name=layer_name)
+            self.add(marker_cluster)
 
         if items is not None and add_legend:
             marker_colors = [coreutils.check_color(c) for c in marker_colors]
@@ -3989,6 +4120,87 @@ class Map(core.Map):
 
         self.default_style = {"cursor": "default"}
 
+    def _add_point_features(
+        self,
+        xs: list[float],
+        ys: list[float],
+        labels: list[str],
+        categories: list[int | None],
+        marker_colors: list[str] | None,
+        layer_name: str,
+    ) -> None:
+        """Adds points as one GeoJSON layer of circles with a shared popup.
+
+        Args:
+            xs: The longitudes of the points.
+            ys: The latitudes of the points.
+            labels: The popup HTML of each point.
+            categories: The index of the marker color of each point, or None.
+            marker_colors: The marker colors of the categories.
+            layer_name: The name of the layer.
+        """
+        data = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [x, y]},
+                    "properties": {"popup": label, "category": category},
+                }
+                for x, y, label, category in zip(xs, ys, labels, categories)
+            ],
+        }
+
+        # Styles are shared by the points of a category.
+        styles = [
+            {"color": color, "fillColor": color}
+            for color in map(coreutils.check_color, marker_colors or [])
+        ]
+
+        def feature_style(feature):
+            category = feature["properties"]["category"]
+            return {} if category is None else styles[category]
+
+        layer = geojson_layers.ViewportGeoJSON(
+            data,
+            feature_style=feature_style,
+            point_style={"radius": 5, "weight": 1, "fillOpacity": 0.8},
+            name=layer_name,
+        )
+
+        popup_html = ipywidgets.HTML()
+        popup = ipyleaflet.Popup(child=popup_html, close_button=True)
+
+        def show_popup(feature, **kwargs):
+            del kwargs  # Unused.
+            x, y = feature["geometry"]["coordinates"][:2]
+            popup_html.value = feature["properties"]["popup"]
+            popup.location = (y, x)
+            if popup in self.layers:
+                self.remove(popup)
+            self.add(popup)
+
+        layer.on_click(show_popup)
+        self.add(layer)
+        self._follow_view(layer)
+
+    def _follow_view(self, layer: geojson_layers.ViewportGeoJSON) -> None:
+        """Updates a viewport layer whenever the map bounds change.
+
+        Args:
+            layer: The layer, which must be on the map.
+        """
+
+        def update_view(change=None):
+            del change  # Unused.
+            if layer not in self.layers:
+                self.unobserve(update_view, names="bounds")
+            elif self.bounds:
+                layer.update_view(self.bounds, self.zoom)
+
+        self.observe(update_view, names="bounds")
+        update_view()
+
     def add_circle_markers_from_xy(
         self,
         data: str | pd.DataFrame,
@@ -0,0 +1,228 @@
+"""GeoJSON layers that scale to large vector datasets."""
+
+# *******************************************************************************#
+# This module contains extra features of the geemap package.                     #
+# The geemap community will maintain the extra features.                         #
+# *******************************************************************************#
+
+from collections.abc import Callable
+from typing import Any
+
+import ipyleaflet
+import numpy as np
+
+# Layers with more features than this only send the features in the map view.
+MAX_STATIC_FEATURES = 10_000
+
+_MIN_POINTS = {"LineString": 2, "MultiLineString": 2, "Polygon": 4, "MultiPolygon": 4}
+
+
+def _is_position(coords: Any) -> bool:
+    """Returns whether GeoJSON coordinates are a single position."""
+    return bool(coords) and isinstance(coords[0], (int, float))
+
+
+def _geometry_bounds(geometry: dict[str, Any] | None) -> list[float]:
+    """Returns the [west, south, east, north] bounds of a GeoJSON geometry.
+
+    The bounds are NaN for empty geometries, so they never intersect a view.
+    """
+    bounds = [np.nan] * 4
+    if not geometry:
+        return bounds
+    if geometry.get("type") == "GeometryCollection":
+        parts = [_geometry_bounds(g) for g in geometry.get("geometries", [])]
+    else:
+        parts = []
+        stack = [geometry.get("coordinates")]
+        while stack:
+            coords = stack.pop()
+            if not coords:
+                continue
+            if _is_position(coords):
+                coords = [coords]
+            elif not _is_position(coords[0]):
+                stack.extend(coords)
+                continue
+            points = np.asarray(coords, dtype=float)[:, :2]
+            parts.append([*points.min(axis=0), *points.max(axis=0)])
+    if parts:
+        parts = np.asarray(parts)
+        bounds = [*np.nanmin(parts[:, :2], axis=0), *np.nanmax(parts[:, 2:], axis=0)]
+    return bounds
+
+
+def _simplify_line(
+    line: list[list[float]], tolerance: float, min_points: int
+) -> list[list[float]]:
+    """Drops the vertices of a line that fall in the same grid cell as the previous."""
+    points = np.asarray(line, dtype=float)
+    if len(points) <= min_points:
+        return line
+    cells = np.floor(points[:, :2] / tolerance)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(cells[1:] != cells[:-1], axis=1)
+    # Keep the end points, which also keeps polygon rings closed.
+    keep[-1] = True
+    if keep.sum() < min_points:
+        return line
+    return points[keep].tolist()
+
+
+def simplify_geometry(
+    geometry: dict[str, Any] | None, tolerance: float
+) -> dict[str, Any] | None:
+    """Returns a GeoJSON geometry without vertices closer than a tolerance.
+
+    The vertices are snapped to a grid with cells of `tolerance` degrees, and runs of
+    vertices in the same cell are reduced to one. Points are unchanged, and lines and
+    rings keep enough vertices to stay valid.
+
+    Args:
+        geometry: The GeoJSON geometry.
+        tolerance: The grid cell size in degrees, e.g., the size of a pixel.
+    """
+    if not geometry or tolerance <= 0:
+        return geometry
+    geom_type = geometry.get("type")
+    if geom_type == "GeometryCollection":
+        return {
+            **geometry,
+            "geometries": [
+                simplify_geometry(g, tolerance) for g in geometry["geometries"]
+            ],
+        }
+    min_points = _MIN_POINTS.get(geom_type)
+    if min_points is None:
+        return geometry
+
+    def simplify(coords):
+        if coords and _is_position(coords[0]):
+            return _simplify_line(coords, tolerance, min_points)
+        return [simplify(c) for c in coords]
+
+    return {**geometry, "coordinates": simplify(geometry["coordinates"])}
+
+
+class GeoJSONIndex:
+    """A spatial index of the bounding boxes of GeoJSON features."""
+
+    def __init__(self, data: dict[str, Any]):
+        """Initializes the index.
+
+        Args:
+            data: A GeoJSON FeatureCollection.
+        """
+        self.features = data.get("features", [])
+        bounds = np.array(
+            [_geometry_bounds(f.get("geometry")) for f in self.features], dtype=float
+        ).reshape(-1, 4)
+        self.west, self.south, self.east, self.north = bounds.T
+        self.sizes = np.hypot(self.east - self.west, self.north - self.south)
+
+    def query(
+        self,
+        west: float,
+        south: float,
+        east: float,
+        north: float,
+        max_features: int | None = None,
+    ) -> np.ndarray:
+        """Returns the indices of the features that intersect a bounding box.
+
+        Args:
+            west: The western bound.
+            south: The southern bound.
+            east: The eastern bound.
+            north: The northern bound.
+            max_features: If set, only the largest features are returned.
+
+        Returns:
+            The sorted indices of the features.
+        """
+        mask = (
+            (self.east >= west)
+            & (self.west <= east)
+            & (self.north >= south)
+            & (self.south <= north)
+        )
+        indices = np.flatnonzero(mask)
+        if max_features is not None and len(indices) > max_features:
+            largest = np.argsort(-self.sizes[indices], kind="stable")[:max_features]
+            indices = np.sort(indices[largest])
+        return indices
+
+    def query_point(self, lon: float, lat: float) -> np.ndarray:
+        """Returns the indices of the features whose bounding box contains a point."""
+        return self.query(lon, lat, lon, lat)
+
+
+class ViewportGeoJSON(ipyleaflet.GeoJSON):
+    """An ipyleaflet GeoJSON layer that only shows the features in the map view.
+
+    The features are looked up in a GeoJSONIndex, and simplified to the pixel size of
+    the zoom level, so the size of the widget state does not grow with the dataset.
+    Call `update_view` when the map bounds change.
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        feature_style: Callable | None = None,
+        max_features: int = 5000,
+        **kwargs: Any,
+    ):
+        """Initializes the layer.
+
+        Args:
+            data: A GeoJSON FeatureCollection.
+            feature_style: A function that returns the style of a feature. It is
+                called once per feature, the first time the feature is shown.
+            max_features: The maximum number of features to show. If more features
+                are in view, the largest ones are shown.
+            **kwargs: Additional keyword arguments are passed to ipyleaflet.GeoJSON.
+        """
+        self.spatial_index = GeoJSONIndex(data)
+        self.feature_style = feature_style
+        self.max_features = max_features
+        self._styles: dict[int, dict[str, Any]] = {}
+        self._simplified: dict[int, dict[str, Any]] = {}
+        self._zoom: int | None = None
+        super().__init__(data={"type": "FeatureCollection", "features": []}, **kwargs)
+
+    def _feature(self, index: int, tolerance: float) -> dict[str, Any]:
+        """Returns the simplified and styled feature at an index."""
+        feature = self._simplified.get(index)
+        if feature is None:
+            feature = self.spatial_index.features[index]
+            properties = dict(feature.get("properties") or {})
+            if self.feature_style is not None:
+                if index not in self._styles:
+                    self._styles[index] = self.feature_style(feature)
+                properties["style"] = self._styles[index]
+            feature = {
+                **feature,
+                "geometry": simplify_geometry(feature.get("geometry"), tolerance),
+                "properties": properties,
+            }
+            self._simplified[index] = feature
+        return feature
+
+    def update_view(self, bounds: Any, zoom: float) -> None:
+        """Shows the features in a view of the map.
+
+        Args:
+            bounds: The map bounds as ((south, west), (north, east)).
+            zoom: The zoom level of the map.
+        """
+        (south, west), (north, east) = bounds
+        zoom = int(round(zoom))
+        if zoom != self._zoom:
+            self._zoom = zoom
+            self._simplified = {}
+        tolerance = 360 / (256 * 2**zoom)
+        indices = self.spatial_index.query(west, south, east, north, self.max_features)
+        self.data = {
+            "type": "FeatureCollection",
+            "features": [self._feature(i, tolerance) for i in indices.tolist()],
+        }
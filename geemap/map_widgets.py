@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+import concurrent.futures
 import enum
 import functools
 import importlib.resources
 import json
+import logging
+import math
 import os
 import pathlib
 import re
-from typing import Any
+import time
+from typing import Any, TYPE_CHECKING
 
 import IPython
 from IPython.display import HTML, display
@@ -26,9 +30,13 @@ import traitlets
 
 from . import common
 from . import conversion
-from . import core
 from . import coreutils
-from . import geemap
+
+if TYPE_CHECKING:
+    # Only used in annotations. Importing them at runtime would form a cycle, since
+    # both import this module.
+    from . import core
+    from . import geemap
 
 
 class TypedTuple(traitlets.Container):
@@ -442,6 +450,12 @@ class Inspector(anywidget.AnyWidget):
     pixel_info = traitlets.Dict({}).tag(sync=True)
     object_info = traitlets.Dict({}).tag(sync=True)
 
+    # The half-size in degrees of the box searched for features around a click.
+    _bbox_delta = 0.005
+
+    # How long a click waits for a newer one before its layers are queried.
+    _debounce_seconds = 0.2
+
     def __init__(
         self,
         host_map: geemap.Map,
@@ -475,12 +489,21 @@ class Inspector(anywidget.AnyWidget):
 
         self.on_close = None
 
+        # Queries run on one worker thread, and only the latest click is shown.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._future: concurrent.futures.Future | None = None
+        self._click_id = 0
+        self._cache: dict[tuple[Any, ...], Any] = {}
+
         host_map.default_style = {"cursor": "crosshair"}
         host_map.on_interaction(self._on_map_interaction)
         self.on_msg(self._handle_message_event)
 
     def cleanup(self):
         """Removes the widget from the map and performs cleanup."""
+        if self._future is not None:
+            self._future.cancel()
+        self._executor.shutdown(wait=False)
         if self._host_map:
             self._host_map.default_style = {"cursor": "default"}
             self._host_map.on_interaction(self._on_map_interaction, remove=True)
@@ -507,6 +530,10 @@ class Inspector(anywidget.AnyWidget):
     def _on_map_click(self, latlon: list[float]) -> None:
         """Handles map click events.
 
+        The pixel and object info of all inspected layers is fetched with a single
+        request in a background thread, after a short debounce. A newer click
+        supersedes pending ones.
+
         Args:
             latlon: The latitude and longitude of the click event.
         """
@@ -517,10 +544,65 @@ class Inspector(anywidget.AnyWidget):
         self._host_map.default_style = {"cursor": "wait"}
 
         self.point_info = self._point_info(latlon)
-        self.pixel_info = self._pixel_info(latlon)
-        self.object_info = self._object_info(latlon)
 
-        self._host_map.default_style = {"cursor": "crosshair"}
+        self._click_id += 1
+        if self._future is not None:
+            self._future.cancel()
+        queries = self._layer_queries(latlon)
+        if not any(query[3] is not None for query in queries):
+            self._show_layer_info(latlon, queries, self._click_id)
+            return
+        self._future = self._executor.submit(
+            self._show_layer_info, latlon, queries, self._click_id
+        )
+        self._future.add_done_callback(
+            functools.partial(self._on_layer_info_done, self._click_id)
+        )
+
+    def _on_layer_info_done(
+        self, click_id: int, future: concurrent.futures.Future
+    ) -> None:
+        """Logs a failed layer query and shows the error if the click is current.
+
+        Args:
+            click_id: The click that the queries belong to.
+            future: The finished future of `_show_layer_info`.
+        """
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        logging.warning("Failed to inspect the map layers: %s", error)
+        if click_id == self._click_id:
+            self.pixel_info = coreutils.new_tree_node(
+                "Pixels",
+                [coreutils.new_tree_node(f"Error: {error}")],
+                top_level=True,
+                expanded=True,
+            )
+
+    def _show_layer_info(
+        self, latlon: list[float], queries: list[tuple[Any, ...]], click_id: int
+    ) -> None:
+        """Fetches the info of the layer queries and shows it if still current.
+
+        Args:
+            latlon: The latitude and longitude of the click event.
+            queries: The layer queries returned by `_layer_queries`.
+            click_id: The click that the queries belong to.
+        """
+        try:
+            # Only the last of clicks in quick succession is queried.
+            time.sleep(self._debounce_seconds)
+            if click_id != self._click_id:
+                return
+            results = self._fetch_layer_info(queries)
+            if click_id != self._click_id:
+                return
+            self.pixel_info = self._pixel_info(latlon, queries, results)
+            self.object_info = self._object_info(latlon, queries, results)
+        finally:
+            if click_id == self._click_id:
+                self._host_map.default_style = {"cursor": "crosshair"}
 
     def _clear_inspector_output(self) -> None:
         """Clears the inspector output."""
@@ -582,54 +664,142 @@ class Inspector(anywidget.AnyWidget):
 
     def _query_point(
         self, latlon: list[float], ee_object: ee.ComputedObject
-    ) -> dict[str, Any] | None:
-        """Queries a point on the map.
+    ) -> ee.Dictionary | None:
+        """Returns the query of the pixel values at a point.
 
         Args:
             latlon: The latitude and longitude of the point.
             ee_object: The Earth Engine object to query.
 
         Returns:
-            The query result.
+            The pixel values of an image, or None for other objects.
         """
         point = ee.Geometry.Point(latlon[::-1])
         scale = self._host_map.get_scale()
         if isinstance(ee_object, ee.ImageCollection):
             ee_object = ee_object.mosaic()
         if isinstance(ee_object, ee.Image):
-            return ee_object.reduceRegion(ee.Reducer.first(), point, scale).getInfo()
+            return ee_object.reduceRegion(ee.Reducer.first(), point, scale)
         return None
 
-    def _pixel_info(self, latlon: list[float]) -> dict[str, Any]:
-        """Gets information about pixels at a point.
+    def _query_object(
+        self, latlon: list[float], ee_object: ee.ComputedObject
+    ) -> ee.Feature | None:
+        """Returns the query of the first feature at a point.
 
         Args:
             latlon: The latitude and longitude of the point.
+            ee_object: The Earth Engine object to query.
 
         Returns:
-            The node containing the pixels information.
+            The first feature of a FeatureCollection, or None for other objects.
         """
+        if not isinstance(ee_object, ee.FeatureCollection):
+            return None
+        point = ee.Geometry.Point(latlon[::-1])
+        geom = ee.Feature(ee_object.first()).geometry()
+        bbox = self._get_bbox(latlon)
+        is_point = ee.Algorithms.If(
+            geom.type().compareTo(ee.String("Point")), point, bbox
+        )
+        return ee_object.filterBounds(is_point).first()
 
-        root = coreutils.new_tree_node("Pixels", expanded=True, top_level=True)
-        if not self._visible:
-            return root
+    def _pixel_key(self, latlon: list[float]) -> tuple[int, int, int]:
+        """Returns the zoom level and web mercator pixel containing a point."""
+        zoom = int(self._host_map.zoom)
+        size = 256 * 2**zoom
+        lat = math.radians(max(min(latlon[0], 85.0511), -85.0511))
+        x = (latlon[1] + 180) / 360 * size
+        y = (1 - math.log(math.tan(lat) + 1 / math.cos(lat)) / math.pi) / 2 * size
+        return zoom, int(x), int(y)
+
+    def _layer_queries(self, latlon: list[float]) -> list[tuple[Any, ...]]:
+        """Builds the pixel and object queries of the inspected layers.
+
+        Args:
+            latlon: The latitude and longitude of the point.
 
-        layers = self._get_visible_map_layers()
-        for layer_name, layer in layers.items():
+        Returns:
+            A list of (kind, layer name, EE object, query, cache key) tuples, where
+                kind is "pixel" or "object" and query is None if cached.
+        """
+        if not self._visible:
+            return []
+
+        # Pixels are cached by the pixel clicked at the zoom level. Objects are
+        # searched for at the click or in a box around it, so they are cached by the
+        # click point and the box size.
+        pixel_key = self._pixel_key(latlon)
+        point_key = (round(latlon[0], 7), round(latlon[1], 7), self._bbox_delta)
+        queries = []
+        for layer_name, layer in self._get_visible_map_layers().items():
             ee_object = layer["ee_object"]
-            pixel = self._query_point(latlon, ee_object)
-            if not pixel:
+            object_key = coreutils.ee_cache_key(ee_object)
+            for kind, query_func, location_key in (
+                ("pixel", self._query_point, pixel_key),
+                ("object", self._query_object, point_key),
+            ):
+                key = (kind, layer_name, object_key, location_key)
+                if key in self._cache:
+                    queries.append((kind, layer_name, ee_object, None, key))
+                    continue
+                query = query_func(latlon, ee_object)
+                if query is not None:
+                    queries.append((kind, layer_name, ee_object, query, key))
+        return queries
+
+    def _fetch_layer_info(self, queries: list[tuple[Any, ...]]) -> dict[Any, Any]:
+        """Evaluates all uncached queries in one request.
+
+        Args:
+            queries: The layer queries returned by `_layer_queries`.
+
+        Returns:
+            The results keyed by the cache keys of the queries.
+        """
+        pending = {str(i): q for i, q in enumerate(queries) if q[3] is not None}
+        if pending:
+            results = ee.Dictionary(
+                {i: query[3] for i, query in pending.items()}
+            ).getInfo()
+            if len(self._cache) >= 256:
+                self._cache.clear()
+            for i, query in pending.items():
+                self._cache[query[4]] = results.get(i)
+        return {query[4]: self._cache.get(query[4]) for query in queries}
+
+    def _pixel_info(
+        self,
+        latlon: list[float],
+        queries: list[tuple[Any, ...]],
+        results: dict[Any, Any],
+    ) -> dict[str, Any]:
+        """Gets information about pixels at a point.
+
+        Args:
+            latlon: The latitude and longitude of the point.
+            queries: The layer queries returned by `_layer_queries`.
+            results: The query results returned by `_fetch_layer_info`.
+
+        Returns:
+            The node containing the pixels information.
+        """
+        del latlon  # Unused.
+        root = coreutils.new_tree_node("Pixels", expanded=True, top_level=True)
+        for kind, layer_name, ee_object, _, key in queries:
+            pixel = results.get(key)
+            if kind != "pixel" or not pixel:
                 continue
             pluralized_band = "band" if len(pixel) == 1 else "bands"
             ee_obj_type = ee_object.__class__.__name__
             label = f"{layer_name}: {ee_obj_type} ({len(pixel)} {pluralized_band})"
             layer_node = coreutils.new_tree_node(label, expanded=self.expand_pixels)
-            for key, value in sorted(pixel.items()):
+            for band, value in sorted(pixel.items()):
                 if isinstance(value, float):
                     value = round(value, self._decimals)
                 layer_node["children"].append(
                     coreutils.new_tree_node(
-                        f"{key}: {value}", expanded=self.expand_pixels
+                        f"{band}: {value}", expanded=self.expand_pixels
                     )
                 )
             root["children"].append(layer_node)
@@ -648,38 +818,35 @@ class Inspector(anywidget.AnyWidget):
             The bounding box around the point.
         """
         lat, lon = latlon
-        delta = 0.005
+        delta = self._bbox_delta
         return ee.Geometry.BBox(lon - delta, lat - delta, lon + delta, lat + delta)
 
-    def _object_info(self, latlon: list[float]) -> dict[str, Any]:
+    def _object_info(
+        self,
+        latlon: list[float],
+        queries: list[tuple[Any, ...]],
+        results: dict[Any, Any],
+    ) -> dict[str, Any]:
         """Gets information about objects at a point.
 
         Args:
             latlon: The latitude and longitude of the point.
+            queries: The layer queries returned by `_layer_queries`.
+            results: The query results returned by `_fetch_layer_info`.
 
         Returns:
             ipytree.Node: The node containing the objects information.
         """
+        del latlon  # Unused.
         root = coreutils.new_tree_node("Objects", top_level=True, expanded=True)
-        if not self._visible:
-            return root
-
-        layers = self._get_visible_map_layers()
-        point = ee.Geometry.Point(latlon[::-1])
-        for layer_name, layer in layers.items():
-            ee_object = layer["ee_object"]
-            if isinstance(ee_object, ee.FeatureCollection):
-                geom = ee.Feature(ee_object.first()).geometry()
-                bbox = self._get_bbox(latlon)
-                is_point = ee.Algorithms.If(
-                    geom.type().compareTo(ee.String("Point")), point, bbox
-                )
-                ee_object = ee_object.filterBounds(is_point).first()
-                tree_node = coreutils.build_computed_object_tree(
-                    ee_object, layer_name, self.expand_objects
-                )
-                if tree_node:
-                    root["children"].append(tree_node)
+        for kind, layer_name, _, _, key in queries:
+            if kind != "object":
+                continue
+            tree_node = coreutils.build_info_tree(
+                results.get(key), layer_name, self.expand_objects, "Feature"
+            )
+            if tree_node:
+                root["children"].append(tree_node)
 
         return root
 
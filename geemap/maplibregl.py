@@ -36,6 +36,7 @@ from maplibre.controls import (
 )
 
 from .basemaps import (
+    leaflet_basemaps,
     xyz_to_leaflet,
     get_xyz_dict,
     get_google_map_tile_providers,
@@ -44,7 +45,10 @@ from .common import *
 
 from . import coreutils
 
-basemaps = box.Box(xyz_to_leaflet(), frozen_box=True)
+basemaps = leaflet_basemaps
+
+# Available basemaps, built once per map class and Google Maps API key.
+_AVAILABLE_BASEMAPS: dict[tuple[type, str | None], dict[str, Any]] = {}
 
 
 class Map(MapWidget):
@@ -167,8 +171,13 @@ class Map(MapWidget):
 
     def _get_available_basemaps(self) -> dict[str, Any]:
         """Convert xyz tile services to a dictionary of basemaps."""
+        api_key = coreutils.get_google_maps_api_key()
+        cache_key = (type(self), api_key)
+        if cache_key in _AVAILABLE_BASEMAPS:
+            return dict(_AVAILABLE_BASEMAPS[cache_key])
+
         tile_providers = list(get_xyz_dict().values())
-        if coreutils.get_google_maps_api_key():
+        if api_key:
             tile_providers = tile_providers + list(
                 get_google_map_tile_providers().values()
             )
@@ -186,7 +195,8 @@ class Map(MapWidget):
                 if provider := ret_dict.get(map_name):
                     aliased_maps[alias] = provider
                     break
-        return {**aliased_maps, **ret_dict}
+        _AVAILABLE_BASEMAPS[cache_key] = {**aliased_maps, **ret_dict}
+        return dict(_AVAILABLE_BASEMAPS[cache_key])
 
     def _get_preferred_basemap_name(self, basemap_name: str) -> str:
         """Returns the aliased basemap name."""
@@ -6,19 +6,38 @@
 # *******************************************************************************#
 
 from functools import partial
+import hashlib
+import json
 import multiprocessing as mp
+import os
 import pathlib
+import time
 
 import ee
 import numpy as np
-import pandas as pd
+
+from . import coreutils
+
+# Ensembles larger than this are uploaded to an asset rather than sent inline, since
+# inline trees are re-sent with every request that uses the classifier.
+MAX_INLINE_SIZE = 1_000_000
+
+# The maximum length of the part of a tree stored in each feature of an asset.
+MAX_CHUNK_LENGTH = 100_000
 
 
 def tree_to_string(
-    estimator, feature_names, labels=None, output_mode: str = "INFER"
+    estimator,
+    feature_names,
+    labels=None,
+    output_mode: str = "INFER",
+    compact: bool = False,
 ) -> str:
     """Convert a sklearn decision tree object to a string format that EE can interpret
 
+    The string is built directly from the arrays of the fitted tree, so large trees
+    convert without a per-node DataFrame lookup.
+
     Args:
         estimator (sklearn.tree.estimator): An estimator consisting of multiple decision
             tree classifiers. Expects object to contain estimators_ attribute
@@ -28,6 +47,8 @@ def tree_to_string(
             numeric values. If None, then raw outputs will be used.
         output_mode: the output mode of the estimator. Options are "INFER",
             "CLASSIFIATION", or "REGRESSION" (capitalization does not matter).
+        compact: Whether to omit the indentation of the nodes, which is only there for
+            readability. This makes the strings of deep trees much shorter.
 
     Returns:
         String representation of decision tree estimator.
@@ -37,14 +58,20 @@ def tree_to_string(
             estimator is for regression or classification problem.
     """
     # Extract out the information need to build the tree string.
-    n_nodes = estimator.tree_.node_count
     children_left = estimator.tree_.children_left
     children_right = estimator.tree_.children_right
     feature_idx = estimator.tree_.feature
     impurities = estimator.tree_.impurity
     n_samples = estimator.tree_.n_node_samples
     thresholds = estimator.tree_.threshold
-    features = [feature_names[i] for i in feature_idx]
+
+    tree_str = f"1) root {n_samples[0]} 9999 9999 ({impurities.sum()})\n"
+
+    # A tree with a single leaf has no branches, and its squeezed values have no node
+    # axis to infer the output mode from.
+    is_leaf = children_left == children_right
+    if is_leaf[0]:
+        return tree_str
 
     raw_vals = np.squeeze(estimator.tree_.value)
 
@@ -68,9 +95,9 @@ def tree_to_string(
         # Take argmax along class axis from values.
         values = raw_vals.argmax(axis=-1)
         if labels is not None:
+            # Map the i-th distinct class index to the i-th label.
             index_labels = np.unique(values)
-            lookup = {idx: labels[i] for i, idx in enumerate(index_labels)}
-            values = [lookup[v] for v in values]
+            values = np.asarray(labels)[np.searchsorted(index_labels, values)]
 
         out_type = int
 
@@ -109,147 +136,54 @@ def tree_to_string(
             "Could not understand estimator type and parse out the values."
         )
 
-    # Use iterative pre-order search to extract node depth and leaf information.
-    node_ids = np.zeros(shape=n_nodes, dtype=np.int64)
-    node_depth = np.zeros(shape=n_nodes, dtype=np.int64)
-    is_leaves = np.zeros(shape=n_nodes, dtype=bool)
-    stack = [(0, -1)]  # Seed is the root node id and its parent depth.
-    while len(stack) > 0:
-        node_id, parent_depth = stack.pop()
-        node_depth[node_id] = parent_depth + 1
-        node_ids[node_id] = node_id
-
-        # If we have a test node.
-        if children_left[node_id] != children_right[node_id]:
-            stack.append((children_left[node_id], parent_depth + 1))
-            stack.append((children_right[node_id], parent_depth + 1))
-        else:
-            is_leaves[node_id] = True
+    # Each line is the branch from a split node to one of its children. Use an
+    # iterative pre-order search so that the branch to the left child and its subtree
+    # come before the branch to the right child and its subtree. Nodes are numbered
+    # like in R's rpart: the children of node n are nodes 2n and 2n + 1.
+    lefts = children_left.tolist()
+    rights = children_right.tolist()
+    leaves = is_leaf.tolist()
+    parents, children, numbers, depths, signs = [], [], [], [], []
+    stack = [(0, rights[0], 3, 0, ">"), (0, lefts[0], 2, 0, "<=")]
+    while stack:
+        parent, child, number, depth, sign = stack.pop()
+        parents.append(parent)
+        children.append(child)
+        numbers.append(number)
+        depths.append(depth)
+        signs.append(sign)
+        if not leaves[child]:
+            stack.append((child, rights[child], 2 * number + 1, depth + 1, ">"))
+            stack.append((child, lefts[child], 2 * number, depth + 1, "<="))
+
+    # A branch to a leaf shows the stats of the leaf, and a branch to a split node
+    # shows the stats of its parent.
+    parents = np.array(parents)
+    children = np.array(children)
+    leaf_branches = is_leaf[children]
+    stats = np.where(leaf_branches, children, parents)
+
+    # Format each number column once, then only select from the columns.
+    names = np.asarray(feature_names, dtype=object)[feature_idx[parents]]
+    tresh = np.char.mod("%.6f", thresholds[parents])
+    samps = n_samples[stats].tolist()
+    criterion = np.char.mod("%.4f", impurities[stats])
+    value = [str(out_type(v)) for v in np.asarray(values)[stats].tolist()]
+    tails = np.where(leaf_branches, " *\n", "\n")
+
+    lines = [
+        f"{'' if compact else (depth + 1) * '  '}{cnt}) {fname} {sign} {t} {n} {c} {v}"
+        f"{tail}"
+        for depth, cnt, fname, sign, t, n, c, v, tail in zip(
+            depths, numbers, names, signs, tresh, samps, criterion, value, tails
+        )
+    ]
+    return tree_str + "".join(lines)
 
-    # Create a table of the initial structure.
-    # Each row is a node or leaf.
-    df = pd.DataFrame(
-        {
-            "node_id": node_ids,
-            "node_depth": node_depth,
-            "is_leaf": is_leaves,
-            "children_left": children_left,
-            "children_right": children_right,
-            "value": values,
-            "criterion": impurities,
-            "n_samples": n_samples,
-            "threshold": thresholds,
-            "feature_name": features,
-            "sign": ["<="] * n_nodes,
-        },
-        dtype="object",
-    )
 
-    # The table representation does not have lef vs right node structure.
-    # So we need to add in right nodes in the correct location.
-    # We do this by first calculating which nodes are right and
-    # then insert them at the correct index.
-
-    # Get a dict of right node rows and assign key based on index where to insert.
-    inserts = {}
-    for row in df.itertuples():
-        child_r = row.children_right
-        if child_r > row.Index:
-            ordered_row = np.array(row)
-            ordered_row[-1] = ">"
-            inserts[child_r] = ordered_row[1:]  # Drop index value.
-    # Sort the inserts as to keep track of the additive indexing.
-    inserts_sorted = {k: inserts[k] for k in sorted(inserts.keys())}
-
-    # Loop through the row inserts and add to table (array).
-    table_values = df.values
-    for i, k in enumerate(inserts_sorted.keys()):
-        table_values = np.insert(table_values, (k + i), inserts_sorted[k], axis=0)
-
-    # Make the ordered table array into a dataframe.
-    # Note: df is dtype "object". Need to cast later on.
-    ordered_df = pd.DataFrame(table_values, columns=df.columns)
-
-    max_depth = np.max(ordered_df.node_depth.astype(int))
-    tree_str = f"1) root {n_samples[0]} 9999 9999 ({impurities.sum()})\n"
-    previous_depth = -1
-    cnts: list[int] = []
-    # Loop through the nodes and calculate the node number and values per node.
-    cnt = 0
-    for row in ordered_df.itertuples():
-        node_depth = int(row.node_depth)
-        left = int(row.children_left)
-        right = int(row.children_right)
-        if left != right:
-            if row.Index == 0:
-                cnt = 2
-            elif previous_depth > node_depth:
-                depths = ordered_df.node_depth.values[: row.Index]
-                idx = np.where(depths == node_depth)[0][-1]
-                cnt = cnts[idx] + 1
-            elif previous_depth < node_depth:
-                cnt = cnts[row.Index - 1] * 2
-            elif previous_depth == node_depth:
-                cnt = cnts[row.Index - 1] + 1
-
-            if node_depth == (max_depth - 1):
-                value = out_type(ordered_df.iloc[row.Index + 1].value)
-                samps = int(ordered_df.iloc[row.Index + 1].n_samples)
-                criterion = float(ordered_df.iloc[row.Index + 1].criterion)
-                tail = " *\n"
-            else:
-                if (
-                    (bool(ordered_df.loc[ordered_df.node_id == left].iloc[0].is_leaf))
-                    and (
-                        bool(
-                            int(row.Index)
-                            < int(ordered_df.loc[ordered_df.node_id == left].index[0])
-                        )
-                    )
-                    and (str(row.sign) == "<=")
-                ):
-                    rowx = ordered_df.loc[ordered_df.node_id == left].iloc[0]
-                    tail = " *\n"
-                    value = out_type(rowx.value)
-                    samps = int(rowx.n_samples)
-                    criterion = float(rowx.criterion)
-
-                elif (
-                    (bool(ordered_df.loc[ordered_df.node_id == right].iloc[0].is_leaf))
-                    and (
-                        bool(
-                            int(row.Index)
-                            < int(ordered_df.loc[ordered_df.node_id == right].index[0])
-                        )
-                    )
-                    and (str(row.sign) == ">")
-                ):
-                    rowx = ordered_df.loc[ordered_df.node_id == right].iloc[0]
-                    tail = " *\n"
-                    value = out_type(rowx.value)
-                    samps = int(rowx.n_samples)
-                    criterion = float(rowx.criterion)
-
-                else:
-                    value = out_type(row.value)
-                    samps = int(row.n_samples)
-                    criterion = float(row.criterion)
-                    tail = "\n"
-
-            # Extract out the information needed in each line.
-            spacing = (node_depth + 1) * "  "  # For pretty printing.
-            fname = str(row.feature_name)  # Name of the feature (i.e., band name).
-            tresh = float(row.threshold)  # Threshold.
-            sign = str(row.sign)
-
-            tree_str += f"{spacing}{cnt}) {fname} {sign} {tresh:.6f} {samps} {criterion:.4f} {value}{tail}"
-            previous_depth = node_depth
-        cnts.append(cnt)
-
-    return tree_str
-
-
-def rf_to_strings(estimator, feature_names, processes=2, output_mode="INFER"):
+def rf_to_strings(
+    estimator, feature_names, processes=None, output_mode="INFER", compact=False
+):
     """Convert a ensemble of decision trees into a list of strings.
 
     Wraps `tree_to_string`.
@@ -259,10 +193,12 @@ def rf_to_strings(estimator, feature_names, processes=2, output_mode="INFER"):
             object created using sklearn.
         feature_names (list[str]): List of strings that define the name of features
             (i.e., bands) used to create the model.
-        processes (int): Number of cpu processes to spawn. Increasing processes will
-            improve speed for large models.
+        processes (int | None): Number of cpu processes to spawn. Defaults to None,
+            which converts the trees in the current process. The conversion is
+            vectorized, so spawning processes rarely pays off.
         output_mode (str): Output mode of the estimator. Options are "INFER",
             "CLASSIFIATION", or "REGRESSION" (capitalization does not matter).
+        compact (bool): Whether to omit the indentation of the nodes.
 
     Returns:
         trees (list[str]): list of strings where each string represents a decision tree
@@ -301,6 +237,17 @@ def rf_to_strings(estimator, feature_names, processes=2, output_mode="INFER"):
     else:
         class_labels = None
 
+    convert = partial(
+        tree_to_string,
+        feature_names=feature_names,
+        labels=class_labels,
+        output_mode=output_mode,
+        compact=compact,
+    )
+
+    if processes is None:
+        return [convert(tree) for tree in estimators]
+
     # Check that number of processors set to use is not more than available.
     if processes >= mp.cpu_count():
         # If so, force to use only cpu count - 1.
@@ -308,15 +255,7 @@ def rf_to_strings(estimator, feature_names, processes=2, output_mode="INFER"):
 
     # Run the tree extraction process in parallel.
     with mp.Pool(processes) as pool:
-        proc = pool.map_async(
-            partial(
-                tree_to_string,
-                feature_names=feature_names,
-                labels=class_labels,
-                output_mode=output_mode,
-            ),
-            estimators,
-        )
+        proc = pool.map_async(convert, estimators)
         trees = list(proc.get())
 
     return trees
@@ -335,7 +274,7 @@ def strings_to_classifier(trees: list[str]) -> ee.Classifier:
     return classifier
 
 
-def fc_to_classifier(fc):
+def fc_to_classifier(fc, chunked: bool = False):
     """Returns an ee.Classifier from a feature collection.
 
     The feature collection must be from  from `export_trees_to_fc`.
@@ -343,13 +282,27 @@ def fc_to_classifier(fc):
     Args:
         fc (ee.FeatureCollection): feature collection that has trees property for each
             feature that represents the decision tree
+        chunked: Whether the trees were exported in chunks, i.e., with
+            `max_chunk_length`.
 
     Returns:
         classifier (ee.Classifier): ee classifier object representing an ensemble decision tree
     """
 
+    if chunked:
+        # Concatenate the chunks of each tree in order.
+        def join_chunks(tree_id):
+            chunks = fc.filter(ee.Filter.eq("tree_id", tree_id)).sort("chunk")
+            return chunks.aggregate_array("tree").iterate(
+                lambda chunk, tree: ee.String(tree).cat(chunk), ""
+            )
+
+        trees = fc.aggregate_array("tree_id").distinct().map(join_chunks)
+    else:
+        trees = fc.aggregate_array("tree")
+
     # Get a list of tree strings from feature collection.
-    tree_strings = fc.aggregate_array("tree").map(
+    tree_strings = trees.map(
         lambda x: ee.String(x).replace(
             "#", "\n", "g"
         )  # Expects that # is ecoded to be a return.
@@ -361,7 +314,39 @@ def fc_to_classifier(fc):
     return classifier
 
 
-def export_trees_to_fc(trees, asset_id, description="geemap_rf_export"):
+def _tree_chunks(trees, max_chunk_length):
+    """Returns the properties of the features of trees split into chunks."""
+    return [
+        {
+            "tree": tree[start : start + max_chunk_length],
+            "tree_id": tree_id,
+            "chunk": chunk,
+        }
+        for tree_id, tree in enumerate(t.replace("\n", "#") for t in trees)
+        for chunk, start in enumerate(range(0, len(tree), max_chunk_length))
+    ]
+
+
+def _export_features(properties, asset_id, description):
+    """Starts an export task of features with properties over null island."""
+    # Create a null geometry point.
+    # This is needed to properly export the feature collection.
+    null_island = ee.Geometry.Point([0, 0])
+
+    # Cast as feature collection.
+    fc = ee.FeatureCollection([ee.Feature(null_island, p) for p in properties])
+
+    # Get export task and start.
+    task = ee.batch.Export.table.toAsset(
+        collection=fc, description=description, assetId=asset_id
+    )
+    task.start()
+    return task
+
+
+def export_trees_to_fc(
+    trees, asset_id, description="geemap_rf_export", max_chunk_length=None
+):
     """Starts an export task to create a feature collection of a decision tree.
 
     Creates a feature collection with a property tree which contains the string
@@ -371,25 +356,186 @@ def export_trees_to_fc(trees, asset_id, description="geemap_rf_export"):
         trees (list[str]): List of string representation of the decision trees.
         asset_id (str): ee asset id path to export the feature collection to.
         description (str): optional description to provide export information.
-    """
-    # Create a null geometry point.
-    # This is needed to properly export the feature collection.
-    null_island = ee.Geometry.Point([0, 0])
+        max_chunk_length (int, optional): If set, each tree is split into features
+            with a tree property of at most this length, and tree_id and chunk
+            properties to reassemble them. Read the asset with
+            `fc_to_classifier(fc, chunked=True)`.
 
-    # Create a list of feature over null island.
+    Returns:
+        ee.batch.Task: The started export task.
+    """
     # Set the tree property as the tree string.
     # Encode return values (\n) as #, use to parse later.
-    features = [
-        ee.Feature(null_island, {"tree": tree.replace("\n", "#")}) for tree in trees
-    ]
-    # Cast as feature collection.
-    fc = ee.FeatureCollection(features)
+    if max_chunk_length is None:
+        properties = [{"tree": tree.replace("\n", "#")} for tree in trees]
+    else:
+        properties = _tree_chunks(trees, max_chunk_length)
+    return _export_features(properties, asset_id, description)
 
-    # Get export task and start.
-    task = ee.batch.Export.table.toAsset(
-        collection=fc, description=description, assetId=asset_id
+
+def export_trees_to_fcs(
+    trees: list[str],
+    asset_id: str,
+    description: str = "geemap_rf_export",
+    max_chunk_length: int = MAX_CHUNK_LENGTH,
+    max_request_size: int = MAX_INLINE_SIZE,
+    overwrite: bool = False,
+) -> dict[str, ee.batch.Task]:
+    """Starts export tasks of the trees split into chunks, bounding their size.
+
+    The chunks of the trees are exported to the table assets `{asset_id}_0`,
+    `{asset_id}_1`, etc., with at most `max_request_size` bytes of tree properties
+    in each export request. Read them with `fc_to_classifier(fc, chunked=True)` on
+    the merged feature collections, e.g., from `assets_to_fc`.
+
+    Args:
+        trees: A list of strings (an ensemble of decision trees).
+        asset_id: The prefix of the table assets to export the trees to.
+        description: The prefix of the descriptions of the export tasks.
+        max_chunk_length: The maximum length of the part of a tree in each feature.
+        max_request_size: The maximum size in bytes of the JSON-serialized tree
+            properties in each export request.
+        overwrite: Whether to delete the assets first if they exist.
+
+    Returns:
+        The started export tasks by their asset ID.
+
+    Raises:
+        ValueError: If a single chunk is larger than `max_request_size`.
+    """
+    parts = [[]]
+    part_size = 0
+    for properties in _tree_chunks(trees, max_chunk_length):
+        size = len(json.dumps(properties).encode("utf-8"))
+        if size > max_request_size:
+            raise ValueError(
+                f"A chunk of {size} bytes is larger than max_request_size "
+                f"({max_request_size}). Please reduce max_chunk_length."
+            )
+        if part_size + size > max_request_size:
+            parts.append([])
+            part_size = 0
+        parts[-1].append(properties)
+        part_size += size
+
+    tasks = {}
+    for i, part in enumerate(parts):
+        part_id = f"{asset_id}_{i}"
+        if overwrite:
+            try:
+                ee.data.deleteAsset(part_id)
+            except ee.EEException:
+                pass
+        tasks[part_id] = _export_features(part, part_id, f"{description}_{i}")
+    return tasks
+
+
+def assets_to_fc(asset_ids: list[str]) -> ee.FeatureCollection:
+    """Returns the merged feature collection of table assets."""
+    return ee.FeatureCollection(
+        [ee.FeatureCollection(asset_id) for asset_id in asset_ids]
+    ).flatten()
+
+
+def _trees_asset_file(key: str) -> str:
+    """Returns the cache file of the asset that the trees with a key were saved to."""
+    return os.path.join(coreutils.get_cache_dir("ml", make_dirs=False), f"{key}.json")
+
+
+def _wait_for_task(task, timeout: float, poll_interval: float = 5) -> None:
+    """Waits for an export task to finish, raising an error if it did not succeed."""
+    deadline = time.monotonic() + timeout
+    while task.active():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"The export task did not finish in {timeout} seconds.")
+        time.sleep(poll_interval)
+    status = task.status()
+    if status.get("state") != "COMPLETED":
+        raise RuntimeError(
+            f"The export task failed: {status.get('error_message', status)}"
+        )
+
+
+def trees_to_classifier(
+    trees: list[str],
+    asset_id: str | None = None,
+    max_inline_size: int = MAX_INLINE_SIZE,
+    max_chunk_length: int = MAX_CHUNK_LENGTH,
+    overwrite: bool = False,
+    timeout: float = 3600,
+) -> ee.Classifier:
+    """Returns an ee.Classifier from trees, uploading large ensembles to an asset.
+
+    Ensembles whose serialized size is at most `max_inline_size` bytes are sent
+    inline, like `strings_to_classifier`. Larger ones are exported in chunks to
+    table assets, with at most `max_inline_size` bytes in each export request, so
+    they are uploaded once and read by Earth Engine from the assets. The assets of
+    each ensemble are cached locally, and later calls with the same trees reuse them
+    instead of uploading them again.
+
+    Args:
+        trees: A list of strings (an ensemble of decision trees).
+        asset_id: The prefix of the table assets to upload a large ensemble to, see
+            `export_trees_to_fcs`.
+        max_inline_size: The maximum size in bytes of ensembles sent inline, and of
+            the trees in each export request.
+        max_chunk_length: The maximum length of the part of a tree in each feature.
+        overwrite: Whether to upload the trees again even if they were uploaded
+            before, replacing the assets if they exist.
+        timeout: The maximum number of seconds to wait for the upload.
+
+    Returns:
+        The ensemble decision tree classifier.
+
+    Raises:
+        ValueError: If the ensemble is too large to send inline and `asset_id` is not
+            set.
+    """
+    serialized = json.dumps(trees)
+    size = len(serialized.encode("utf-8"))
+    if size <= max_inline_size:
+        return strings_to_classifier(trees)
+
+    key = hashlib.sha256(f"{max_chunk_length}:{serialized}".encode()).hexdigest()
+    cache_file = _trees_asset_file(key)
+    if not overwrite:
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached_ids = json.load(f)["asset_ids"]
+            for cached_id in cached_ids:
+                ee.data.getAsset(cached_id)
+            return fc_to_classifier(assets_to_fc(cached_ids), chunked=True)
+        except (OSError, ValueError, KeyError, TypeError, ee.EEException):
+            pass
+
+    if asset_id is None:
+        raise ValueError(
+            f"The trees are {size} bytes, which is more than max_inline_size "
+            f"({max_inline_size}). Please provide an asset_id to upload them to."
+        )
+
+    tasks = export_trees_to_fcs(
+        trees,
+        asset_id,
+        "geemap_trees_upload",
+        max_chunk_length=max_chunk_length,
+        max_request_size=max_inline_size,
+        overwrite=overwrite,
     )
-    task.start()
+    deadline = time.monotonic() + timeout
+    for task in tasks.values():
+        _wait_for_task(task, max(deadline - time.monotonic(), 0))
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"asset_ids": list(tasks)}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # The cache is an optimization.
+
+    return fc_to_classifier(assets_to_fc(list(tasks)), chunked=True)
 
 
 def trees_to_csv(trees: list[str], out_csv: str) -> None:
@@ -404,13 +550,15 @@ def trees_to_csv(trees: list[str], out_csv: str) -> None:
     out_path.write_text(content, encoding="utf-8")
 
 
-def csv_to_classifier(in_csv: str) -> ee.Classifier | None:
+def csv_to_classifier(in_csv: str, asset_id: str | None = None) -> ee.Classifier | None:
     """Returns an ee.Classifier from a CSV file.
 
     The file must contain a list of strings (an ensemble of decision trees).
 
     Args:
         in_csv: File path to the input CSV.
+        asset_id: If set, the trees are passed to `trees_to_classifier`, which uploads
+            them to assets with this prefix if they are too large to send inline.
 
     Returns:
         object: ee.Classifier.
@@ -423,6 +571,10 @@ def csv_to_classifier(in_csv: str) -> ee.Classifier | None:
         print(f"{in_csv} could not be found.")
         return None
 
+    if asset_id is not None:
+        trees = [line.strip().replace("#", "\n") for line in lines]
+        return trees_to_classifier(trees, asset_id)
+
     null_island = ee.Geometry.Point([0, 0])
     features = [ee.Feature(null_island, {"tree": line.strip()}) for line in lines]
     rf_fc = ee.FeatureCollection(features)
@@ -16,12 +16,12 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-from .basemaps import xyz_to_plotly
+from .basemaps import plotly_basemaps
 from .common import *
 from . import coreutils
 from . import examples
 
-basemaps = xyz_to_plotly()
+basemaps = plotly_basemaps
 
 
 class Canvas:
@@ -498,8 +498,7 @@ class Map(go.FigureWidget):
                     "The palette must be a list of colors or a string or a Box object."
                 )
 
-        map_id_dict = ee.Image(image).getMapId(vis_params)
-        url = map_id_dict["tile_fetcher"].url_format
+        url = coreutils.ee_tile_url_format(image, vis_params)
         self.add_tile_layer(
             url, name=name, attribution="Google Earth Engine", opacity=opacity, **kwargs
         )
@@ -5,14 +5,17 @@
 # The geemap community will maintain the extra features.                         #
 # *******************************************************************************#
 
+from collections.abc import Callable, Iterator
 import datetime
 import glob
 import importlib.resources
 import io
+import itertools
 import math
 import os
 import re
 import shutil
+import subprocess
 import tempfile
 from typing import Any
 import warnings
@@ -20,13 +23,16 @@ import warnings
 import ee
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
+import requests
 
 from .common import *
+from .common import _map_concurrently
 from . import colormaps
 from . import coreutils
 
 try:
-    from PIL import Image, ImageDraw, ImageFont, ImageSequence
+    from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageSequence
 except:
     pass
 
@@ -406,11 +412,6 @@ def add_text_to_gif(
     """
     warnings.simplefilter("ignore")
 
-    # pytype: disable=attribute-error
-    pkg_dir = str(importlib.resources.files("geemap").joinpath("geemap.py").parent)
-    # pytype: enable=attribute-error
-    default_font = os.path.join(pkg_dir, "data/fonts/arial.ttf")
-
     in_gif = os.path.abspath(in_gif)
     out_gif = os.path.abspath(out_gif)
 
@@ -421,26 +422,7 @@ def add_text_to_gif(
     if not os.path.exists(os.path.dirname(out_gif)):
         os.makedirs(os.path.dirname(out_gif))
 
-    if font_type == "arial.ttf":
-        font = ImageFont.truetype(default_font, font_size)
-    elif font_type == "alibaba.otf":
-        default_font = os.path.join(pkg_dir, "data/fonts/alibaba.otf")
-        font = ImageFont.truetype(default_font, font_size)
-    else:
-        try:
-            font_list = system_fonts(show_full_path=True)
-            font_names = [os.path.basename(f) for f in font_list]
-            if (font_type in font_list) or (font_type in font_names):
-                font = ImageFont.truetype(font_type, font_size)
-            else:
-                print(
-                    "The specified font type could not be found on your system. "
-                    "Using the default font instead."
-                )
-                font = ImageFont.truetype(default_font, font_size)
-        except Exception as e:
-            print(e)
-            font = ImageFont.truetype(default_font, font_size)
+    font = _load_font(font_type, font_size)
 
     color = coreutils.check_color(font_color)
     progress_bar_color = coreutils.check_color(progress_bar_color)
@@ -716,6 +698,456 @@ def reduce_gif_size(in_gif: str, out_gif: str | None = None) -> None:
         ffmpeg.run(stream)
 
 
+def _load_font(font_type: str = "arial.ttf", font_size: int = 20):
+    """Returns a PIL font, falling back to the font shipped with geemap.
+
+    Args:
+        font_type: Font type. Can be "arial.ttf", "alibaba.otf" or a system font.
+        font_size: Font size.
+    """
+    # pytype: disable=attribute-error
+    pkg_dir = str(importlib.resources.files("geemap").joinpath("geemap.py").parent)
+    # pytype: enable=attribute-error
+    default_font = os.path.join(pkg_dir, "data/fonts/arial.ttf")
+
+    if font_type == "arial.ttf":
+        return ImageFont.truetype(default_font, font_size)
+    elif font_type == "alibaba.otf":
+        default_font = os.path.join(pkg_dir, "data/fonts/alibaba.otf")
+        return ImageFont.truetype(default_font, font_size)
+
+    try:
+        font_list = system_fonts(show_full_path=True)
+        font_names = [os.path.basename(f) for f in font_list]
+        if (font_type in font_list) or (font_type in font_names):
+            return ImageFont.truetype(font_type, font_size)
+        print(
+            "The specified font type could not be found on your system. "
+            "Using the default font instead."
+        )
+    except Exception as e:
+        print(e)
+    return ImageFont.truetype(default_font, font_size)
+
+
+def _frame_xy(xy, width: int, height: int) -> tuple[int, int]:
+    """Converts a location like (10, 10) or ('10%', '10%') to pixel coordinates."""
+    if isinstance(xy, tuple) and len(xy) == 2:
+        if all(isinstance(item, int) for item in xy):
+            return xy
+        if all(isinstance(item, str) and "%" in item for item in xy):
+            try:
+                x = int(float(xy[0].replace("%", "")) / 100.0 * width)
+                y = int(float(xy[1].replace("%", "")) / 100.0 * height)
+                return x, y
+            except ValueError:
+                pass
+    raise ValueError(
+        "The specified xy is invalid. "
+        "It must be formatted like this: (10, 10) or ('10%', '10%')"
+    )
+
+
+def _gif_to_array(in_gif: str) -> np.ndarray:
+    """Decodes the frames of a GIF into an array of shape (frames, height, width, 3)."""
+    with Image.open(in_gif) as image:
+        return np.stack(
+            [np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(image)]
+        )
+
+
+def _blend_overlay(
+    frames: np.ndarray, overlay: np.ndarray, xy: tuple[int, int], index=slice(None)
+) -> None:
+    """Alpha blends an RGBA overlay onto the frames in place.
+
+    Args:
+        frames: The frames of shape (frames, height, width, 3).
+        overlay: The RGBA overlay of shape (height, width, 4).
+        xy: The frame coordinates of the top left corner of the overlay.
+        index: The frames to blend the overlay onto. Defaults to all frames.
+    """
+    x, y = xy
+    height, width = frames.shape[1:3]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1 = min(x + overlay.shape[1], width)
+    y1 = min(y + overlay.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    patch = overlay[y0 - y : y1 - y, x0 - x : x1 - x].astype(np.float32)
+    alpha = patch[..., 3:] / 255.0
+    region = frames[index, y0:y1, x0:x1].astype(np.float32)
+    blended = region * (1.0 - alpha) + patch[..., :3] * alpha
+    frames[index, y0:y1, x0:x1] = np.rint(blended).astype(np.uint8)
+
+
+def _text_overlay(text: str, font, color) -> tuple[np.ndarray, tuple[int, int]]:
+    """Renders text to an RGBA overlay and returns it with its offset from xy."""
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    overlay = np.empty((mask.height, mask.width, 4), dtype=np.uint8)
+    overlay[..., :3] = ImageColor.getrgb(color)[:3]
+    overlay[..., 3] = np.asarray(mask)
+    return overlay, (left, top)
+
+
+def _draw_text(frames: np.ndarray, texts: list[str], xy, font, color) -> None:
+    """Draws one text per frame, rendering each distinct text only once."""
+    groups = {}
+    for index, text in enumerate(texts):
+        groups.setdefault(text, []).append(index)
+
+    for text, indices in groups.items():
+        overlay, (left, top) = _text_overlay(text, font, color)
+        index = slice(None) if len(indices) == len(frames) else indices
+        _blend_overlay(frames, overlay, (xy[0] + left, xy[1] + top), index)
+
+
+def _draw_progress_bar(frames: np.ndarray, color, bar_height: int) -> None:
+    """Draws a progress bar along the bottom of the frames in place."""
+    count, height, width = frames.shape[:3]
+    rgb = ImageColor.getrgb(color)[:3]
+    for index in range(count):
+        bar_width = int((index + 1) / count * width)
+        frames[index, height - bar_height :, :bar_width] = rgb
+
+
+def _iter_faded_frames(frames: np.ndarray, steps: int) -> Iterator[np.ndarray]:
+    """Yields the frames with `steps` - 1 cross-faded frames between neighbors."""
+    for index, frame in enumerate(frames):
+        yield frame
+        if steps <= 1 or index + 1 == len(frames):
+            continue
+        current = frame.astype(np.float32)
+        following = frames[index + 1].astype(np.float32)
+        for step in range(1, steps):
+            weight = step / steps
+            yield np.rint(current * (1 - weight) + following * weight).astype(np.uint8)
+
+
+def _save_frames(
+    frames: Callable[[], Iterator[np.ndarray]],
+    out_file: str,
+    fps: float = 10,
+    loop: int = 0,
+) -> None:
+    """Encodes frames to a GIF, WebP or MP4 file based on its extension.
+
+    Args:
+        frames: A function returning an iterator of RGB frame arrays.
+        out_file: The output file path.
+        fps: The frames per second.
+        loop: The number of times to loop the animation. Ignored for mp4.
+    """
+    ext = os.path.splitext(out_file)[1].lower()
+    if ext == ".mp4":
+        if not is_tool("ffmpeg"):
+            print("ffmpeg is not installed on your computer.")
+            return
+        frame_iter = iter(frames())
+        first = next(frame_iter)
+        height, width = first.shape[:2]
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            str(fps),
+            "-i",
+            "-",
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-vcodec",
+            "libx264",
+            "-crf",
+            "25",
+            "-pix_fmt",
+            "yuv420p",
+            out_file,
+        ]
+        with subprocess.Popen(cmd, stdin=subprocess.PIPE) as process:
+            for frame in itertools.chain([first], frame_iter):
+                process.stdin.write(np.ascontiguousarray(frame).tobytes())
+            process.stdin.close()
+        if process.returncode != 0 or not os.path.exists(out_file):
+            raise Exception("Failed to create mp4 file.")
+        return
+
+    images = (Image.fromarray(frame) for frame in frames())
+    first = next(images)
+    options = {"format": "WEBP"} if ext == ".webp" else {"optimize": True}
+    first.save(
+        out_file,
+        save_all=True,
+        append_images=images,
+        duration=int(1000 / fps),
+        loop=loop,
+        **options,
+    )
+
+
+def composite_timelapse(
+    in_gif: str | np.ndarray,
+    out_gif: str,
+    title: str | None = None,
+    title_xy=("2%", "90%"),
+    text_sequence=None,
+    text_xy=("2%", "2%"),
+    font_type: str = "arial.ttf",
+    font_size: int = 20,
+    font_color: str = "white",
+    add_progress_bar: bool = True,
+    progress_bar_color: str = "white",
+    progress_bar_height: int = 5,
+    colorbar: str | None = None,
+    colorbar_xy=None,
+    colorbar_size: tuple[int, int] = (300, 300),
+    fading: float = 0,
+    frames_per_second: float = 10,
+    loop: int = 0,
+    mp4: bool = False,
+    webp: bool = False,
+) -> None:
+    """Adds a title, text, progress bar, colorbar and fading to a GIF in one pass.
+
+    The GIF is decoded once into an array, the overlays are blended onto all frames
+    with array operations, and the result is encoded once for each output format.
+    This is equivalent to chaining add_text_to_gif, add_image_to_gif, gif_fading
+    and gif_to_mp4, without re-encoding the GIF between steps.
+
+    Args:
+        in_gif: The input GIF file, or an array of RGB frames of shape
+            (frames, height, width, 3), which is drawn on in place.
+        out_gif: The output GIF file. Can be the same as in_gif.
+        title: A title drawn on every frame. Defaults to None.
+        title_xy: Top left corner of the title. It can be formatted like this:
+            (10, 10) or ('15%', '25%').
+        text_sequence (int, str, list, optional): Animated text, such as dates. It can
+            be an integer to count from, a string, or a list with one string per frame.
+            Defaults to None, which draws no text.
+        text_xy: Top left corner of the text. It can be formatted like this: (10, 10)
+            or ('15%', '25%').
+        font_type: Font type.
+        font_size: Font size.
+        font_color: Font color. It can be a string (e.g., 'red'), rgb tuple (e.g., (255,
+            127, 0)), or hex code (e.g., '#ff00ff').
+        add_progress_bar: Whether to add a progress bar at the bottom of the frames.
+        progress_bar_color: Color for the progress bar.
+        progress_bar_height: Height of the progress bar.
+        colorbar: File path to a colorbar or logo image to paste on every frame.
+            Defaults to None.
+        colorbar_xy: Top left corner of the colorbar. Defaults to the lower right
+            corner of the frames.
+        colorbar_size: The maximum size of the colorbar.
+        fading: The duration in seconds of the cross-fade between frames. Defaults to
+            0, which adds no fading.
+        frames_per_second: Animation speed.
+        loop: The number of times to loop the animation. 0 loops forever.
+        mp4: Whether to also create an mp4 file next to out_gif.
+        webp: Whether to also create an animated WebP file next to out_gif.
+    """
+    if isinstance(in_gif, np.ndarray):
+        frames = in_gif
+    else:
+        in_gif = os.path.abspath(in_gif)
+        if not os.path.exists(in_gif):
+            raise FileNotFoundError(f"{in_gif} does not exist.")
+        frames = _gif_to_array(in_gif)
+    out_gif = check_file_path(out_gif)
+
+    count, height, width = frames.shape[:3]
+    font = _load_font(font_type, font_size)
+    color = coreutils.check_color(font_color)
+
+    if title is not None:
+        xy = _frame_xy(title_xy, width, height)
+        _draw_text(frames, [title] * count, xy, font, color)
+
+    if text_sequence is not None:
+        if isinstance(text_sequence, str):
+            try:
+                text_sequence = int(text_sequence)
+            except ValueError:
+                text_sequence = [text_sequence] * count
+        if isinstance(text_sequence, int):
+            text_sequence = range(text_sequence, text_sequence + count)
+        texts = [str(text) for text in text_sequence]
+        if len(texts) != count:
+            raise ValueError(
+                f"The length of the text sequence must be equal to the number "
+                f"({count}) of frames in the gif."
+            )
+        xy = _frame_xy(text_xy, width, height)
+        _draw_text(frames, texts, xy, font, color)
+
+    if add_progress_bar:
+        _draw_progress_bar(
+            frames, coreutils.check_color(progress_bar_color), progress_bar_height
+        )
+
+    if colorbar is not None:
+        with Image.open(colorbar) as image:
+            logo = image.convert("RGBA")
+        logo.thumbnail(colorbar_size, Image.LANCZOS)
+        if colorbar_xy is None:
+            xy = (width - logo.width - 10, height - logo.height - 10)
+        else:
+            xy = _frame_xy(colorbar_xy, width, height)
+        _blend_overlay(frames, np.asarray(logo), xy)
+
+    steps = max(int(round(fading * frames_per_second)), 1) if fading else 1
+
+    def frame_iter():
+        return _iter_faded_frames(frames, steps)
+
+    _save_frames(frame_iter, out_gif, frames_per_second, loop)
+    if mp4:
+        _save_frames(frame_iter, out_gif.replace(".gif", ".mp4"), frames_per_second)
+    if webp:
+        _save_frames(
+            frame_iter, out_gif.replace(".gif", ".webp"), frames_per_second, loop
+        )
+
+
+def _is_high_resolution(dimensions: int | str) -> bool:
+    """Returns True if the dimensions exceed the 768 pixel limit of getVideoThumbURL."""
+    if isinstance(dimensions, int):
+        return dimensions > 768
+    return any(int(dim) > 768 for dim in str(dimensions).split("x"))
+
+
+def _frame_size(
+    dimensions: int | str, extent_width: float, extent_height: float
+) -> tuple[int, int]:
+    """Returns the (width, height) in pixels of frames covering the given extent.
+
+    A single number is used as the size of the longer side and the other side is
+    computed by proportional scaling, as Earth Engine does for thumbnails.
+    """
+    if isinstance(dimensions, str) and "x" in dimensions:
+        width, height = (int(dim) for dim in dimensions.split("x"))
+        return width, height
+    size = int(dimensions)
+    if extent_width >= extent_height:
+        return size, max(int(round(size * extent_height / extent_width)), 1)
+    return max(int(round(size * extent_width / extent_height)), 1), size
+
+
+def _thumbnail_grid(
+    width: int, height: int, tile_size: int = 768
+) -> list[tuple[int, int, int, int]]:
+    """Splits a frame into pixel windows (x0, y0, x1, y1) of at most tile_size."""
+    columns = math.ceil(width / tile_size)
+    rows = math.ceil(height / tile_size)
+    xs = [round(width * i / columns) for i in range(columns + 1)]
+    ys = [round(height * j / rows) for j in range(rows + 1)]
+    return [
+        (xs[i], ys[j], xs[i + 1], ys[j + 1])
+        for j in range(rows)
+        for i in range(columns)
+    ]
+
+
+def get_image_collection_frames(
+    collection: ee.ImageCollection,
+    region=None,
+    dimensions: int | str = 1920,
+    bands: list[str] | None = None,
+    crs: str = "EPSG:3857",
+    tile_size: int = 768,
+    max_workers: int = 8,
+    timeout: int = 300,
+    proxies: dict | None = None,
+) -> np.ndarray:
+    """Fetches visualized frames of an ImageCollection as an array of RGB frames.
+
+    Each frame is split into a grid of thumbnails no larger than tile_size, so frames
+    can be larger than the 768 pixel limit of getVideoThumbURL. The thumbnails of all
+    frames are requested concurrently and stitched in memory, without writing
+    intermediate images to disk.
+
+    Args:
+        collection: The collection of visualized 8-bit images, e.g., the output of
+            ee.Image.visualize().
+        region (ee.Geometry, optional): The region to render. Defaults to the
+            geometry of the first image.
+        dimensions: a number or pair of numbers (in format 'WIDTHxHEIGHT') Dimensions
+            of the frames, in pixels. If only one number is passed, it is used as the
+            longer side, and the other side is computed by proportional scaling.
+        bands: The bands to render. Defaults to ['vis-red', 'vis-green', 'vis-blue'].
+        crs: The coordinate reference system of the frames.
+        tile_size: The maximum width and height of each thumbnail request.
+        max_workers: The maximum number of thumbnails to fetch concurrently.
+        timeout: The number of seconds after which a request will be terminated.
+        proxies: A dictionary of proxy servers to use for the requests.
+
+    Returns:
+        np.ndarray: The frames, of shape (frames, height, width, 3).
+    """
+    if not isinstance(collection, ee.ImageCollection):
+        raise TypeError("The collection must be an ee.ImageCollection.")
+    if bands is None:
+        bands = ["vis-red", "vis-green", "vis-blue"]
+
+    if region is None:
+        region = collection.first().geometry()
+    elif isinstance(region, (ee.Feature, ee.FeatureCollection)):
+        region = region.geometry()
+    ring = ee.Geometry(region).bounds(1, crs).getInfo()["coordinates"][0]
+    xmin, xmax = min(x for x, _ in ring), max(x for x, _ in ring)
+    ymin, ymax = min(y for _, y in ring), max(y for _, y in ring)
+
+    width, height = _frame_size(dimensions, xmax - xmin, ymax - ymin)
+    x_res, y_res = (xmax - xmin) / width, (ymax - ymin) / height
+    windows = _thumbnail_grid(width, height, tile_size)
+
+    count = collection.size().getInfo()
+    images = collection.toList(count)
+    frames = np.zeros((count, height, width, 3), dtype=np.uint8)
+
+    def fetch_tile(task: tuple[int, tuple[int, int, int, int]]) -> None:
+        index, (x0, y0, x1, y1) = task
+        coords = [
+            xmin + x0 * x_res,
+            ymax - y1 * y_res,
+            xmin + x1 * x_res,
+            ymax - y0 * y_res,
+        ]
+        tile_region = ee.Geometry.Rectangle(coords, crs, False)
+        url = ee.Image(images.get(index)).getThumbURL(
+            {
+                "bands": bands,
+                "min": 0,
+                "max": 255,
+                "region": tile_region,
+                "dimensions": f"{x1 - x0}x{y1 - y0}",
+                "crs": crs,
+                "format": "png",
+            }
+        )
+        r = requests.get(url, timeout=timeout, proxies=proxies)
+        if r.status_code != 200:
+            raise Exception(r.json()["error"]["message"])
+        with Image.open(io.BytesIO(r.content)) as image:
+            tile = image.convert("RGB")
+        if tile.size != (x1 - x0, y1 - y0):
+            tile = tile.resize((x1 - x0, y1 - y0))
+        frames[index, y0:y1, x0:x1] = np.asarray(tile)
+
+    tasks = [(index, window) for index in range(count) for window in windows]
+    _map_concurrently(fetch_tile, tasks, max_workers)
+    return frames
+
+
 def create_timeseries(
     collection,
     start_date: str,
@@ -877,6 +1309,8 @@ def create_timelapse(
     fading: bool = False,
     parallel_scale: int = 1,
     step: int = 1,
+    webp: bool = False,
+    max_workers: int = 8,
 ):
     """Create a timelapse from any ee.ImageCollection.
 
@@ -960,6 +1394,9 @@ def create_timelapse(
             parallel_scale (e.g. 2 or 4) may enable computations that run out of memory
             with the default.
         step: The step size to use when creating the date sequence.
+        webp: Whether to create an animated WebP file.
+        max_workers: The maximum number of thumbnails to fetch concurrently when
+            dimensions exceed 768 pixels and frames are assembled from thumbnail tiles.
 
     Returns:
         str: File path to the timelapse gif.
@@ -998,8 +1435,6 @@ def create_timelapse(
     else:
         out_gif = check_file_path(out_gif)
 
-    out_dir = os.path.dirname(out_gif)
-
     if bands is None:
         names = col.first().bandNames().getInfo()
         if len(names) < 3:
@@ -1018,16 +1453,15 @@ def create_timelapse(
     elif palette is not None:
         raise Exception("The palette must be a string or a list of strings.")
 
-    if vis_params is None:
-        img = col.first().select(bands)
+    def stretch() -> dict[str, float]:
         scale = collection.first().select(0).projection().nominalScale().multiply(10)
-        min_value = min(
-            image_min_value(img, region=region, scale=scale).getInfo().values()
+        return coreutils.image_vis_stats(
+            col.first(), region=region, bands=bands, scale=scale
         )
-        max_value = max(
-            image_max_value(img, region=region, scale=scale).getInfo().values()
-        )
-        vis_params = {"bands": bands, "min": min_value, "max": max_value}
+
+    if vis_params is None:
+        stats = stretch()
+        vis_params = {"bands": bands, "min": stats["min"], "max": stats["max"]}
 
         if len(bands) == 1:
             if palette is not None:
@@ -1037,22 +1471,10 @@ def create_timelapse(
     elif isinstance(vis_params, dict):
         if "bands" not in vis_params:
             vis_params["bands"] = bands
-        if "min" not in vis_params:
-            img = col.first().select(bands)
-            scale = (
-                collection.first().select(0).projection().nominalScale().multiply(10)
-            )
-            vis_params["min"] = min(
-                image_min_value(img, region=region, scale=scale).getInfo().values()
-            )
-        if "max" not in vis_params:
-            img = col.first().select(bands)
-            scale = (
-                collection.first().select(0).projection().nominalScale().multiply(10)
-            )
-            vis_params["max"] = max(
-                image_max_value(img, region=region, scale=scale).getInfo().values()
-            )
+        if "min" not in vis_params or "max" not in vis_params:
+            stats = stretch()
+            vis_params.setdefault("min", stats["min"])
+            vis_params.setdefault("max", stats["max"])
         if palette is None and (len(bands) == 1) and ("palette" not in vis_params):
             vis_params["palette"] = colormaps.palettes.ndvi
         elif palette is not None and ("palette" not in vis_params):
@@ -1089,74 +1511,27 @@ def create_timelapse(
     else:
         video_args["bands"] = ["vis-gray"]
 
-    if (
-        isinstance(dimensions, int)
-        and dimensions > 768
-        or isinstance(dimensions, str)
-        and any(dim > 768 for dim in list(map(int, dimensions.split("x"))))
-    ):
-        count = col.size().getInfo()
-        basename = os.path.basename(out_gif)[:-4]
-        names = [
-            os.path.join(
-                out_dir, f"{basename}_{str(i+1).zfill(int(len(str(count))))}.jpg"
-            )
-            for i in range(count)
-        ]
-        get_image_collection_thumbnails(
+    frames = None
+    if _is_high_resolution(dimensions):
+        frames = get_image_collection_frames(
             col,
-            out_dir,
-            vis_params={
-                "min": 0,
-                "max": 255,
-                "bands": video_args["bands"],
-            },
+            region=region,
             dimensions=dimensions,
-            names=names,
-        )
-        make_gif(
-            names,
-            out_gif,
-            fps=frames_per_second,
-            loop=loop,
-            mp4=False,
-            clean_up=True,
+            bands=video_args["bands"],
+            crs=crs,
+            max_workers=max_workers,
         )
     else:
         download_ee_video(col, video_args, out_gif)
 
-    if title is not None and isinstance(title, str):
-        add_text_to_gif(
-            out_gif,
-            out_gif,
-            xy=title_xy,
-            text_sequence=title,
-            font_type=font_type,
-            font_size=font_size,
-            font_color=font_color,
-            add_progress_bar=add_progress_bar,
-            progress_bar_color=progress_bar_color,
-            progress_bar_height=progress_bar_height,
-            duration=1000 / frames_per_second,
-            loop=loop,
-        )
-    if add_text:
-        if text_sequence is None:
-            text_sequence = col.aggregate_array("system:date").getInfo()
-        add_text_to_gif(
-            out_gif,
-            out_gif,
-            xy=text_xy,
-            text_sequence=text_sequence,
-            font_type=font_type,
-            font_size=font_size,
-            font_color=font_color,
-            add_progress_bar=add_progress_bar,
-            progress_bar_color=progress_bar_color,
-            progress_bar_height=progress_bar_height,
-            duration=1000 / frames_per_second,
-            loop=loop,
-        )
+    if not isinstance(title, str):
+        title = None
+    if not add_text:
+        text_sequence = None
+    elif text_sequence is None:
+        text_sequence = col.aggregate_array("system:date").getInfo()
+
+    colorbar = None
     if add_colorbar:
         colorbar = save_colorbar(
             None,
@@ -1174,19 +1549,31 @@ def create_timelapse(
             dpi=colorbar_dpi,
             show_colorbar=False,
         )
-        add_image_to_gif(out_gif, out_gif, colorbar, colorbar_xy, colorbar_size)
-
-    if os.path.exists(out_gif):
-        reduce_gif_size(out_gif)
-
-    if isinstance(fading, bool):
-        fading = int(fading)
-    if fading > 0:
-        gif_fading(out_gif, out_gif, duration=fading, verbose=False)
 
-    if mp4:
-        out_mp4 = out_gif.replace(".gif", ".mp4")
-        gif_to_mp4(out_gif, out_mp4)
+    if frames is not None or os.path.exists(out_gif):
+        composite_timelapse(
+            out_gif if frames is None else frames,
+            out_gif,
+            title=title,
+            title_xy=title_xy,
+            text_sequence=text_sequence,
+            text_xy=text_xy,
+            font_type=font_type,
+            font_size=font_size,
+            font_color=font_color,
+            add_progress_bar=add_progress_bar
+            and (title is not None or text_sequence is not None),
+            progress_bar_color=progress_bar_color,
+            progress_bar_height=progress_bar_height,
+            colorbar=colorbar,
+            colorbar_xy=colorbar_xy,
+            colorbar_size=colorbar_size,
+            fading=int(fading) if isinstance(fading, bool) else fading,
+            frames_per_second=frames_per_second,
+            loop=loop,
+            mp4=mp4,
+            webp=webp,
+        )
 
     return out_gif
 
@@ -5325,6 +5712,111 @@ def vector_to_gif(
         print(f"Done. The GIF is saved to {out_gif}.")
 
 
+def _samples_to_array(
+    rows: list[list[Any]], num_points: int, bands: list[str]
+) -> dict[str, Any]:
+    """Arranges sampled rows into a time x point x band array.
+
+    Args:
+        rows: Rows of [point_index, system:time_start, system:date, *band values].
+        num_points: The number of sampled points.
+        bands: The sampled bands.
+
+    Returns:
+        dict: The sorted "times" in milliseconds, the matching "dates" and the
+            "values" array of shape (times, points, bands). Missing samples are NaN.
+    """
+    dates = {}
+    for row in rows:
+        dates.setdefault(row[1], row[2])
+    times = sorted(dates)
+    time_index = {time: index for index, time in enumerate(times)}
+
+    values = np.full((len(times), num_points, len(bands)), np.nan)
+    for row in rows:
+        for band_index, value in enumerate(row[3:]):
+            if value is not None:
+                values[time_index[row[1]], int(row[0]), band_index] = value
+
+    return {
+        "times": times,
+        "dates": [dates[time] for time in times],
+        "values": values,
+    }
+
+
+def sample_time_series(
+    collection: ee.ImageCollection,
+    points: list[list[float]],
+    bands: list[str],
+    scale: float = 30,
+    crs: str = "EPSG:4326",
+) -> dict[str, Any]:
+    """Samples all points in all images of a collection with one request.
+
+    The points are sampled with ee.Image.sampleRegions for every image and the
+    samples are fetched with a single reduceColumns call, instead of one request per
+    point, band and property.
+
+    Args:
+        collection: The image collection to sample. Images should have the
+            'system:time_start' and 'system:date' properties.
+        points: List of [x, y] coordinates to sample.
+        bands: The bands to sample.
+        scale: The scale in meters at which to sample.
+        crs: The coordinate reference system of the points.
+
+    Returns:
+        dict: The sorted "times" in milliseconds, the matching "dates" and the
+            "values" array of shape (times, points, bands). Missing samples are NaN.
+    """
+    features = []
+    for index, point in enumerate(points):
+        if crs == "EPSG:4326":
+            geometry = ee.Geometry.Point([point[0], point[1]])
+        else:
+            geometry = ee.Geometry.Point([point[0], point[1]], crs)
+        features.append(ee.Feature(geometry, {"point_index": index}))
+    point_collection = ee.FeatureCollection(features)
+
+    def sample_image(image):
+        properties = {
+            "system:time_start": image.get("system:time_start"),
+            "system:date": image.get("system:date"),
+        }
+        return (
+            image.select(bands)
+            .sampleRegions(point_collection, ["point_index"], scale)
+            .map(lambda feature: feature.set(properties))
+        )
+
+    selectors = ["point_index", "system:time_start", "system:date"] + list(bands)
+    rows = (
+        collection.map(sample_image)
+        .flatten()
+        .reduceColumns(ee.Reducer.toList(len(selectors)), selectors)
+        .get("list")
+        .getInfo()
+    )
+    return _samples_to_array(rows, len(points), list(bands))
+
+
+def _valid_samples(
+    samples: dict[str, Any], point_index: int, band_index: int = 0
+) -> tuple[list[datetime.datetime], list[float], list[str]]:
+    """Returns the datetimes, values and date strings of one point and band."""
+    values = samples["values"][:, point_index, band_index]
+    valid = [index for index, value in enumerate(values) if not np.isnan(value)]
+    return (
+        [
+            datetime.datetime.fromtimestamp(samples["times"][index] / 1000)
+            for index in valid
+        ],
+        [float(values[index]) for index in valid],
+        [samples["dates"][index] for index in valid],
+    )
+
+
 def sentinel1_timelapse_with_samples(
     roi,
     out_gif=None,
@@ -5665,6 +6157,10 @@ def sentinel1_timelapse_with_samples(
 
     if sample_points is not None and len(sample_points) > 0:
         try:
+            samples = sample_time_series(
+                ts_collection, sample_points, [band], 30, sample_point_crs
+            )
+
             for i, point in enumerate(sample_points):
                 if sample_point_crs == "EPSG:4326":
                     geometry = ee.Geometry.Point([point[0], point[1]])
@@ -5673,55 +6169,19 @@ def sentinel1_timelapse_with_samples(
 
                 point_geometries.append(geometry)
 
-                # Sample the time series at this point.
-                def sample_point(image):
-                    sampled = image.sample(geometry, 30)
-                    return sampled.first().set(
-                        {
-                            "system:time_start": image.get("system:time_start"),
-                            "system:date": image.get("system:date"),
-                        }
-                    )
-
-                sampled = ts_collection.map(sample_point)
-
-                # Get the time series data with error handling.
-                try:
-                    time_series = sampled.aggregate_array("system:time_start").getInfo()
-                    values = sampled.aggregate_array(band).getInfo()
-                    dates = sampled.aggregate_array("system:date").getInfo()
-
-                    # Filter out null values.
-                    valid_data = [
-                        (t, v, d)
-                        for t, v, d in zip(time_series, values, dates)
-                        if v is not None
-                    ]
-
-                    if valid_data:
-                        time_series, values, dates = zip(*valid_data)
-
-                        # Convert timestamps to datetime objects.
-                        datetimes = [
-                            datetime.datetime.fromtimestamp(ts / 1000)
-                            for ts in time_series
-                        ]
-
-                        sample_data[f"Point_{i+1}"] = {
-                            "dates": datetimes,
-                            "values": list(values),
-                            "date_strings": list(dates),
-                            "color": marker_colors[i],
-                            "geometry": geometry,
-                        }
-
-                        print(f"Point {i+1}: {len(values)} valid samples")
-                    else:
-                        print(f"Warning: No valid data for point {i+1}")
-
-                except Exception as e:
-                    print(f"Error sampling point {i+1}: {str(e)}")
-                    continue
+                datetimes, values, dates = _valid_samples(samples, i)
+                if values:
+                    sample_data[f"Point_{i+1}"] = {
+                        "dates": datetimes,
+                        "values": values,
+                        "date_strings": dates,
+                        "color": marker_colors[i],
+                        "geometry": geometry,
+                    }
+
+                    print(f"Point {i+1}: {len(values)} valid samples")
+                else:
+                    print(f"Warning: No valid data for point {i+1}")
 
         except Exception as e:
             print(f"Error during point sampling: {str(e)}")
@@ -6728,6 +7188,10 @@ def sentinel2_timelapse_with_samples(
 
     if sample_points is not None and len(sample_points) > 0:
         try:
+            samples = sample_time_series(
+                ts_collection, sample_points, s2_sample_bands, 30, sample_point_crs
+            )
+
             for i, point in enumerate(sample_points):
                 if sample_point_crs == "EPSG:4326":
                     geometry = ee.Geometry.Point([point[0], point[1]])
@@ -6736,103 +7200,61 @@ def sentinel2_timelapse_with_samples(
 
                 point_geometries.append(geometry)
 
-                # Sample the time series at this point for each band.
+                # Select the samples of this point for each band.
                 for band_idx, band in enumerate(s2_sample_bands):
-
-                    def sample_point_band(image):
-                        sampled = image.select(band).sample(geometry, 30)
-                        return sampled.first().set(
-                            {
-                                "system:time_start": image.get("system:time_start"),
-                                "system:date": image.get("system:date"),
-                            }
-                        )
-
-                    sampled = ts_collection.map(sample_point_band)
-
-                    # Get the time series data with error handling.
-                    try:
-                        time_series = sampled.aggregate_array(
-                            "system:time_start"
-                        ).getInfo()
-                        values = sampled.aggregate_array(band).getInfo()
-                        dates = sampled.aggregate_array("system:date").getInfo()
-
-                        # Filter out null values.
-                        valid_data = [
-                            (t, v, d)
-                            for t, v, d in zip(time_series, values, dates)
-                            if v is not None
-                        ]
-
-                        if valid_data:
-                            time_series, values, dates = zip(*valid_data)
-
-                            # Convert timestamps to datetime objects.
-                            datetimes = [
-                                datetime.datetime.fromtimestamp(ts / 1000)
-                                for ts in time_series
-                            ]
-
-                            # Create unique key for point and band combination.
-                            point_band_key = f"Point_{i+1}_{band}"
-                            if len(s2_sample_bands) == 1:
-                                point_band_key = f"Point_{i+1}"
-
-                            # Get display name for band.
-                            band_display = chart_band_labels.get(band, band)
-                            if len(s2_sample_bands) > 1:
-                                label = f"Point {i+1} ({band_display})"
-                            else:
-                                label = f"Point {i+1}"
-
-                            # Color assignment for multi-band sampling.
-                            if len(s2_sample_bands) > 1:
-                                base_color = (
-                                    marker_colors[i]
-                                    if i < len(marker_colors)
-                                    else "red"
+                    datetimes, values, dates = _valid_samples(samples, i, band_idx)
+                    if values:
+                        # Create unique key for point and band combination.
+                        point_band_key = f"Point_{i+1}_{band}"
+                        if len(s2_sample_bands) == 1:
+                            point_band_key = f"Point_{i+1}"
+
+                        # Get display name for band.
+                        band_display = chart_band_labels.get(band, band)
+                        if len(s2_sample_bands) > 1:
+                            label = f"Point {i+1} ({band_display})"
+                        else:
+                            label = f"Point {i+1}"
+
+                        # Color assignment for multi-band sampling.
+                        if len(s2_sample_bands) > 1:
+                            base_color = (
+                                marker_colors[i] if i < len(marker_colors) else "red"
+                            )
+                            # Modify color for different bands.
+                            if band_idx == 0:
+                                color = base_color
+                            elif band_idx == 1:
+                                color = (
+                                    f"dark{base_color}"
+                                    if base_color != "red"
+                                    else "darkred"
                                 )
-                                # Modify color for different bands.
-                                if band_idx == 0:
-                                    color = base_color
-                                elif band_idx == 1:
-                                    color = (
-                                        f"dark{base_color}"
-                                        if base_color != "red"
-                                        else "darkred"
-                                    )
-                                else:
-                                    color = (
-                                        f"light{base_color}"
-                                        if base_color != "red"
-                                        else "lightcoral"
-                                    )
                             else:
                                 color = (
-                                    marker_colors[i]
-                                    if i < len(marker_colors)
-                                    else "red"
+                                    f"light{base_color}"
+                                    if base_color != "red"
+                                    else "lightcoral"
                                 )
-
-                            sample_data[point_band_key] = {
-                                "dates": datetimes,
-                                "values": list(values),
-                                "date_strings": list(dates),
-                                "color": color,
-                                "geometry": geometry,
-                                "label": label,
-                                "band": band,
-                                "point_idx": i,
-                            }
-
-                            print(f"Point {i+1} ({band}): {len(values)} valid samples")
                         else:
-                            print(f"Warning: No valid data for point {i+1} ({band})")
+                            color = (
+                                marker_colors[i] if i < len(marker_colors) else "red"
+                            )
 
-                    except Exception as e:
-                        print(f"Error sampling point {i+1} ({band}): {str(e)}")
-                        continue
+                        sample_data[point_band_key] = {
+                            "dates": datetimes,
+                            "values": values,
+                            "date_strings": dates,
+                            "color": color,
+                            "geometry": geometry,
+                            "label": label,
+                            "band": band,
+                            "point_idx": i,
+                        }
+
+                        print(f"Point {i+1} ({band}): {len(values)} valid samples")
+                    else:
+                        print(f"Warning: No valid data for point {i+1} ({band})")
 
         except Exception as e:
             print(f"Error during point sampling: {str(e)}")
@@ -7860,6 +8282,10 @@ def landsat_timelapse_with_samples(
 
     if sample_points is not None and len(sample_points) > 0:
         try:
+            samples = sample_time_series(
+                ts_collection, sample_points, landsat_sample_bands, 30, sample_point_crs
+            )
+
             for i, point in enumerate(sample_points):
                 if sample_point_crs == "EPSG:4326":
                     geometry = ee.Geometry.Point([point[0], point[1]])
@@ -7868,103 +8294,61 @@ def landsat_timelapse_with_samples(
 
                 point_geometries.append(geometry)
 
-                # Sample the time series at this point for each band.
+                # Select the samples of this point for each band.
                 for band_idx, band in enumerate(landsat_sample_bands):
-
-                    def sample_point_band(image):
-                        sampled = image.select(band).sample(geometry, 30)
-                        return sampled.first().set(
-                            {
-                                "system:time_start": image.get("system:time_start"),
-                                "system:date": image.get("system:date"),
-                            }
-                        )
-
-                    sampled = ts_collection.map(sample_point_band)
-
-                    # Get the time series data with error handling.
-                    try:
-                        time_series = sampled.aggregate_array(
-                            "system:time_start"
-                        ).getInfo()
-                        values = sampled.aggregate_array(band).getInfo()
-                        dates = sampled.aggregate_array("system:date").getInfo()
-
-                        # Filter out null values.
-                        valid_data = [
-                            (t, v, d)
-                            for t, v, d in zip(time_series, values, dates)
-                            if v is not None
-                        ]
-
-                        if valid_data:
-                            time_series, values, dates = zip(*valid_data)
-
-                            # Convert timestamps to datetime objects.
-                            datetimes = [
-                                datetime.datetime.fromtimestamp(ts / 1000)
-                                for ts in time_series
-                            ]
-
-                            # Create unique key for point and band combination.
-                            point_band_key = f"Point_{i+1}_{band}"
-                            if len(landsat_sample_bands) == 1:
-                                point_band_key = f"Point_{i+1}"
-
-                            # Get display name for band.
-                            band_display = chart_band_labels.get(band, band)
-                            if len(landsat_sample_bands) > 1:
-                                label = f"Point {i+1} ({band_display})"
-                            else:
-                                label = f"Point {i+1}"
-
-                            # Color assignment for multi-band sampling.
-                            if len(landsat_sample_bands) > 1:
-                                base_color = (
-                                    marker_colors[i]
-                                    if i < len(marker_colors)
-                                    else "red"
+                    datetimes, values, dates = _valid_samples(samples, i, band_idx)
+                    if values:
+                        # Create unique key for point and band combination.
+                        point_band_key = f"Point_{i+1}_{band}"
+                        if len(landsat_sample_bands) == 1:
+                            point_band_key = f"Point_{i+1}"
+
+                        # Get display name for band.
+                        band_display = chart_band_labels.get(band, band)
+                        if len(landsat_sample_bands) > 1:
+                            label = f"Point {i+1} ({band_display})"
+                        else:
+                            label = f"Point {i+1}"
+
+                        # Color assignment for multi-band sampling.
+                        if len(landsat_sample_bands) > 1:
+                            base_color = (
+                                marker_colors[i] if i < len(marker_colors) else "red"
+                            )
+                            # Modify color for different bands.
+                            if band_idx == 0:
+                                color = base_color
+                            elif band_idx == 1:
+                                color = (
+                                    f"dark{base_color}"
+                                    if base_color != "red"
+                                    else "darkred"
                                 )
-                                # Modify color for different bands.
-                                if band_idx == 0:
-                                    color = base_color
-                                elif band_idx == 1:
-                                    color = (
-                                        f"dark{base_color}"
-                                        if base_color != "red"
-                                        else "darkred"
-                                    )
-                                else:
-                                    color = (
-                                        f"light{base_color}"
-                                        if base_color != "red"
-                                        else "lightcoral"
-                                    )
                             else:
                                 color = (
-                                    marker_colors[i]
-                                    if i < len(marker_colors)
-                                    else "red"
+                                    f"light{base_color}"
+                                    if base_color != "red"
+                                    else "lightcoral"
                                 )
-
-                            sample_data[point_band_key] = {
-                                "dates": datetimes,
-                                "values": list(values),
-                                "date_strings": list(dates),
-                                "color": color,
-                                "geometry": geometry,
-                                "label": label,
-                                "band": band,
-                                "point_idx": i,
-                            }
-
-                            print(f"Point {i+1} ({band}): {len(values)} valid samples")
                         else:
-                            print(f"Warning: No valid data for point {i+1} ({band})")
+                            color = (
+                                marker_colors[i] if i < len(marker_colors) else "red"
+                            )
 
-                    except Exception as e:
-                        print(f"Error sampling point {i+1} ({band}): {str(e)}")
-                        continue
+                        sample_data[point_band_key] = {
+                            "dates": datetimes,
+                            "values": values,
+                            "date_strings": dates,
+                            "color": color,
+                            "geometry": geometry,
+                            "label": label,
+                            "band": band,
+                            "point_idx": i,
+                        }
+
+                        print(f"Point {i+1} ({band}): {len(values)} valid samples")
+                    else:
+                        print(f"Warning: No valid data for point {i+1} ({band})")
 
         except Exception as e:
             print(f"Error during point sampling: {str(e)}")
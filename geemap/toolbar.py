@@ -14,7 +14,7 @@ import importlib.resources
 import math
 import os
 import pathlib
-from typing import Any
+from typing import Any, TYPE_CHECKING
 import webbrowser
 
 import anywidget
@@ -31,11 +31,15 @@ import traitlets
 
 from . import common
 from . import coreutils
-from . import geemap
 from . import map_widgets
 from . import timelapse
 from .conversion import js_snippet_to_py
 
+if TYPE_CHECKING:
+    # Only used in annotations. Importing it at runtime would form a cycle, since
+    # geemap.geemap imports core, which imports this module.
+    from . import geemap
+
 
 def js_path() -> pathlib.Path:
     """Returns the path to the JavaScript files."""
@@ -27,7 +27,7 @@ class Image:
         return List(["B1", "B2"])
 
     def reduceRegion(self, *_, **__):
-        return Dictionary({"B1": 42, "B2": 3.14})
+        return ReduceRegionResult({"B1": 42, "B2": 3.14})
 
     def getInfo(self):
         return {
@@ -69,12 +69,18 @@ class Dictionary:
         self.data = data
 
     def getInfo(self):
-        return self.data
+        return {
+            key: value.getInfo() if hasattr(value, "getInfo") else value
+            for key, value in self.data.items()
+        }
 
 
 class ReduceRegionResult:
+    def __init__(self, data=None):
+        self.data = data
+
     def getInfo(self):
-        return
+        return self.data
 
 
 class Geometry:
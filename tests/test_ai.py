@@ -0,0 +1,201 @@
+"""Tests for the ai module."""
+
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+try:
+    from geemap import ai
+
+    HAS_AI = True
+except ImportError:
+    # The ai module needs the packages of the geemap[ai] extra.
+    HAS_AI = False
+
+_EMBEDDINGS = {
+    "WATER": [1.0, 0.0, 0.0],
+    "FOREST": [0.0, 2.0, 0.0],
+    "WETLAND": [3.0, 3.0, 0.0],
+    "CITY": [0.0, 0.0, 0.5],
+}
+
+_QUERIES = {
+    "lakes": [2.0, 0.0, 0.0],
+    "swamps": [1.0, 0.5, 0.0],
+}
+
+
+# The spatial and temporal extents of the datasets.
+_EXTENTS = {
+    "WATER": ([-180, -90, 180, 90], "2000-01-01", "2020-12-31"),
+    "FOREST": ([-10, 40, 10, 60], "1990-01-01", "2000-12-31"),
+    "WETLAND": ([100, 0, 120, 20], "2015-01-01", "2020-12-31"),
+    "CITY": ([-180, -90, 180, 90], "2018-01-01", "2022-12-31"),
+}
+
+
+def _create_catalog():
+    collections = [
+        ai.Collection(
+            {
+                "id": dataset_id,
+                "extent": {
+                    "spatial": {"bbox": [bbox]},
+                    "temporal": {
+                        "interval": [[f"{start}T00:00:00Z", f"{end}T00:00:00Z"]]
+                    },
+                },
+            }
+        )
+        for dataset_id, (bbox, start, end) in _EXTENTS.items()
+    ]
+    return mock.Mock(collections=ai.CollectionList(collections))
+
+
+def _interval(start_year, end_year):
+    return (
+        datetime.datetime(start_year, 1, 1, tzinfo=datetime.timezone.utc),
+        datetime.datetime(end_year, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+
+
+def _fake_embed_query(text):
+    return _QUERIES[text]
+
+
+def _create_index():
+    return ai.DatasetEmbeddingIndex(
+        list(_EMBEDDINGS), np.array(list(_EMBEDDINGS.values())), _fake_embed_query
+    )
+
+
+@unittest.skipIf(not HAS_AI, "geemap[ai] not installed")
+class TestDatasetEmbeddingIndex(unittest.TestCase):
+    """Tests for the DatasetEmbeddingIndex class in the `ai` module."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(
+            os.environ, {"GEEMAP_CACHE_DIR": self.cache_dir.name}
+        )
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.cache_dir.cleanup()
+        super().tearDown()
+
+    def test_normalizes_rows(self):
+        index = _create_index()
+        self.assertEqual(index.embeddings.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(index.embeddings, axis=1), 1)
+
+    def test_search(self):
+        index = _create_index()
+        matches = index.search("swamps", 2)
+        self.assertEqual(
+            [dataset_id for dataset_id, _ in matches], ["WETLAND", "WATER"]
+        )
+        self.assertAlmostEqual(matches[0][1], 3 / np.sqrt(10), places=5)
+        self.assertAlmostEqual(matches[1][1], 2 / np.sqrt(5), places=5)
+
+        matches = index.search("lakes", 10)
+        self.assertEqual(
+            [dataset_id for dataset_id, _ in matches],
+            ["WATER", "WETLAND", "FOREST", "CITY"],
+        )
+
+    def test_search_ids(self):
+        index = _create_index()
+        matches = index.search("lakes", 2, ids={"FOREST", "CITY", "UNKNOWN"})
+        self.assertEqual(
+            sorted(dataset_id for dataset_id, _ in matches), ["CITY", "FOREST"]
+        )
+        self.assertEqual(index.search("lakes", 2, ids=set()), [])
+
+    def test_save_load(self):
+        index = _create_index()
+        path = os.path.join(self.cache_dir.name, "index")
+        index.save(path)
+
+        loaded = ai.DatasetEmbeddingIndex.load(path, _fake_embed_query)
+        self.assertIsInstance(loaded.embeddings, np.memmap)
+        self.assertEqual(loaded.ids.tolist(), list(_EMBEDDINGS))
+        self.assertEqual(loaded.search("swamps", 3), index.search("swamps", 3))
+
+    def test_from_jsonl_cache(self):
+        path = os.path.join(self.cache_dir.name, "embeddings.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for dataset_id, embedding in _EMBEDDINGS.items():
+                f.write(json.dumps({"id": dataset_id, "embedding": embedding}) + "\n")
+
+        index = ai.DatasetEmbeddingIndex.from_jsonl(path, _fake_embed_query)
+        self.assertEqual(index.search("lakes", 1)[0][0], "WATER")
+
+        # A second index of the same file is memory-mapped from the cache.
+        with mock.patch.object(pd, "read_json") as mock_read_json:
+            cached = ai.DatasetEmbeddingIndex.from_jsonl(path, _fake_embed_query)
+        mock_read_json.assert_not_called()
+        self.assertIsInstance(cached.embeddings, np.memmap)
+        self.assertEqual(cached.search("swamps", 4), index.search("swamps", 4))
+
+
+@unittest.skipIf(not HAS_AI, "geemap[ai] not installed")
+class TestEarthEngineDatasetIndex(unittest.TestCase):
+    """Tests for the EarthEngineDatasetIndex class in the `ai` module."""
+
+    def setUp(self):
+        super().setUp()
+        self.index = ai.EarthEngineDatasetIndex(
+            _create_catalog(), _create_index(), llm=None
+        )
+
+    def _search_ids(self, **kwargs):
+        # pylint: disable-next: protected-access
+        matches = self.index._search("swamps", 10, **kwargs)
+        return [dataset_id for dataset_id, _ in matches]
+
+    def test_search(self):
+        self.assertEqual(self._search_ids(), ["WETLAND", "WATER", "FOREST", "CITY"])
+
+    def test_search_bounding_box(self):
+        with mock.patch.object(
+            ai.CollectionList,
+            "filter_by_bounding_box",
+            autospec=True,
+            side_effect=ai.CollectionList.filter_by_bounding_box,
+        ) as mock_filter:
+            ids = self._search_ids(bounding_box=[0, 45, 5, 50])
+        mock_filter.assert_called_once()
+        self.assertEqual(mock_filter.call_args.args[1], ai.BBox(0, 45, 5, 50))
+        self.assertEqual(ids, ["WATER", "FOREST", "CITY"])
+
+    def test_search_temporal_interval(self):
+        with mock.patch.object(
+            ai.CollectionList,
+            "filter_by_interval",
+            autospec=True,
+            side_effect=ai.CollectionList.filter_by_interval,
+        ) as mock_filter:
+            ids = self._search_ids(temporal_interval=_interval(2016, 2017))
+        mock_filter.assert_called_once()
+        self.assertEqual(ids, ["WETLAND", "WATER"])
+
+    def test_find_top_matches(self):
+        collections = self.index.find_top_matches(
+            "swamps",
+            bounding_box=[0, 45, 5, 50],
+            temporal_interval=_interval(2016, 2017),
+        )
+        self.assertEqual([c.public_id() for c in collections], ["WATER"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 """Tests for `basemaps` module."""
 
+import importlib
 import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -20,6 +22,9 @@ from geemap.basemaps import (
 )
 from geemap import common
 
+# `from geemap import basemaps` returns the basemap registry of the map backend.
+basemaps = importlib.import_module("geemap.basemaps")
+
 
 class TestCustomTiles(unittest.TestCase):
 
@@ -135,6 +140,19 @@ class FakeXyz(xyzservices.Bunch):
 @mock.patch.object(xyzservices, "providers", FakeXyz().providers)
 class TestGetXyzDict(unittest.TestCase):
 
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(
+            os.environ, {"GEEMAP_CACHE_DIR": self.cache_dir.name}
+        )
+        self.env.start()
+        basemaps._xyz_index.cache_clear()
+
+    def tearDown(self):
+        basemaps._xyz_index.cache_clear()
+        self.env.stop()
+        self.cache_dir.cleanup()
+
     def test_get_xyz_dict_structure(self):
         """Tests that get_xyz_dict returns correct object structure."""
         xyz_dict = get_xyz_dict()
@@ -169,6 +187,24 @@ class TestGetXyzDict(unittest.TestCase):
         self.assertNotIn("c_France", xyz_dict_no_france.keys())
         self.assertIn("c_France", xyz_dict_all.keys())
 
+    def test_get_xyz_dict_returns_copies(self):
+        """Tests that modifying a returned provider does not change the index."""
+        get_xyz_dict()["a"]["url"] = "modified"
+        self.assertEqual(
+            "https://fake-server.com/tiles/{z}/{x}/{y}", get_xyz_dict()["a"]["url"]
+        )
+
+    def test_get_xyz_dict_cache_file(self):
+        """Tests that the index is saved and reused across sessions."""
+        get_xyz_dict()
+        self.assertTrue(os.path.exists(basemaps._xyz_index_file(True, False)))
+
+        basemaps._xyz_index.cache_clear()
+        with mock.patch.object(basemaps, "_build_xyz_index") as mock_build:
+            xyz_dict = get_xyz_dict()
+        mock_build.assert_not_called()
+        self.assertEqual(["a", "c_1"], list(xyz_dict.keys()))
+
 
 class TestXyzToPlotly(unittest.TestCase):
 
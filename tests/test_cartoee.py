@@ -3,6 +3,7 @@ import tempfile
 import unittest
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 from geemap import cartoee
 
@@ -78,6 +79,26 @@ class TestCartoee(unittest.TestCase):
             cartoee.savefig(fig, str(outfile))
             self.assertTrue(outfile.exists())
 
+    def test_render_gif_frame(self):
+        image = np.zeros((4, 8, 3), dtype=np.uint8)
+        options = {
+            "proj": None,
+            "fig_size": (2, 2),
+            "dpi_plot": 50,
+            "vis_params": {},
+            "colorbar_dict": {},
+            "grid_interval": None,
+            "scale_bar_dict": {},
+            "north_arrow_dict": {},
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = pathlib.Path(tmpdir) / "1.png"
+            # pylint: disable-next: protected-access
+            cartoee._render_gif_frame(
+                str(outfile), [(image, [-10, 10, -5, 5])], "title", options
+            )
+            self.assertTrue(outfile.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,18 +4,22 @@ import base64
 import builtins
 import importlib.util
 import io
+import json
 import math
 import os
 import pathlib
 import shutil
 import sys
 import tempfile
+import time
 import unittest
 from unittest import mock
 import zipfile
 
 import ee
 import ipywidgets
+import numpy as np
+import pandas as pd
 from PIL import Image
 import psutil
 import requests
@@ -25,6 +29,11 @@ from geemap import common
 from tests import fake_ee
 
 
+def _fake_collection_init(self, page, *_, **__):
+    """Stores the page of a collection instead of initializing it."""
+    self.page = page
+
+
 class CommonTest(unittest.TestCase):
 
     def _create_zip_with_tif(self, tif_name: str, content: bytes) -> bytes:
@@ -741,10 +750,161 @@ class CommonTest(unittest.TestCase):
     # TODO: test_ee_to_csv
     # TODO: test_dict_to_csv
     # TODO: test_get_image_thumbnail
-    # TODO: test_get_image_collection_thumbnails
+
+    @mock.patch.object(ee, "Image")
+    @mock.patch.object(common, "get_image_thumbnail")
+    def test_get_image_collection_thumbnails_concurrent(
+        self, mock_thumbnail, unused_mock_image
+    ):
+        collection = mock.MagicMock(spec=ee.ImageCollection)
+        collection.size.return_value.getInfo.return_value = 3
+        collection.aggregate_array.return_value.getInfo.return_value = ["a", "b", "c"]
+        vis_params = {"min": 0, "max": 1}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            common.get_image_collection_thumbnails(
+                collection, tmpdir, vis_params, verbose=False, max_workers=3
+            )
+            out_imgs = sorted(call.args[1] for call in mock_thumbnail.call_args_list)
+            self.assertEqual(
+                out_imgs, [os.path.join(tmpdir, f"{n}.jpg") for n in ["a", "b", "c"]]
+            )
+
+        collection.aggregate_array.assert_called_once_with("system:index")
+        collection.toList.assert_called_once_with(3)
+        self.assertEqual(vis_params, {"min": 0, "max": 1})
+
     # TODO: test_netcdf_to_ee
-    # TODO: test_numpy_to_ee
-    # TODO: test_ee_to_numpy
+
+    def test_numpy_to_json(self):
+        array = np.array([[[0.1, 1e-5], [3, -2]]], dtype=np.float32)
+        text = common._numpy_to_json(array)
+        self.assertEqual(text, "[[[0.1,1e-05],[3.0,-2.0]]]")
+        self.assertEqual(common._numpy_to_json(np.array([True, False])), "[1,0]")
+        array = np.arange(12, dtype=np.int16).reshape(2, 3, 2)
+        self.assertEqual(json.loads(common._numpy_to_json(array)), array.tolist())
+        with self.assertRaisesRegex(ValueError, "NaN or infinite"):
+            common._numpy_to_json(np.array([1.0, np.nan]))
+        with self.assertRaisesRegex(ValueError, "NaN or infinite"):
+            common._numpy_to_json(np.array([[np.inf, 0]], dtype=np.float32))
+
+    @mock.patch.object(ee, "String")
+    @mock.patch.object(ee, "Array")
+    @mock.patch.object(ee, "Image")
+    @mock.patch.object(ee, "Projection")
+    def test_numpy_to_ee(
+        self, unused_mock_projection, mock_image, mock_array, mock_string
+    ):
+        array = np.arange(12, dtype=np.uint8).reshape(2, 3, 2)
+        common.numpy_to_ee(array, "EPSG:4326", [1, 0, 0, 0, -1, 0])
+
+        # All bands are sent as a single JSON string.
+        mock_string.assert_called_once_with(common._numpy_to_json(array))
+        mock_array.assert_called_once_with(mock_string().decodeJSON())
+        self.assertEqual(len(mock_image.cat.call_args.args[0]), 2)
+        mock_image.loadGeoTIFF.assert_not_called()
+
+    @mock.patch.object(common, "_upload_numpy_to_gcs")
+    @mock.patch.object(ee, "String")
+    @mock.patch.object(ee, "Image")
+    def test_numpy_to_ee_staged(self, mock_image, mock_string, mock_upload):
+        mock_upload.return_value = "gs://bucket/geemap/image.tif"
+        array = np.zeros((2, 100, 100), dtype=np.float32)
+        transform = [30, 0, 1000, 0, -30, 2000]
+
+        with mock.patch.object(builtins, "print") as mock_print:
+            self.assertIsNone(
+                common.numpy_to_ee(array, "EPSG:32610", transform, max_inline_bytes=100)
+            )
+            self.assertIn("Cloud Storage bucket", str(mock_print.call_args))
+        mock_upload.assert_not_called()
+
+        common.numpy_to_ee(
+            array, "EPSG:32610", transform, max_inline_bytes=100, bucket="bucket"
+        )
+        mock_string.assert_not_called()
+        mock_upload.assert_called_once_with(
+            array, "bucket", "EPSG:32610", transform, project=None
+        )
+        mock_image.loadGeoTIFF.assert_called_once_with("gs://bucket/geemap/image.tif")
+        mock_image.loadGeoTIFF().rename.assert_called_once_with(
+            ["constant", "constant_1"]
+        )
+
+        # Arrays with nodata values are staged even when they are small.
+        mock_upload.reset_mock()
+        array = np.array([[1.0, np.nan]], dtype=np.float32)
+        with mock.patch.object(builtins, "print") as mock_print:
+            common.numpy_to_ee(array, "EPSG:32610", transform)
+            self.assertIn("NaN or infinite", str(mock_print.call_args))
+        common.numpy_to_ee(array, "EPSG:32610", transform, bucket="bucket")
+        mock_string.assert_not_called()
+        mock_upload.assert_called_once()
+
+    @mock.patch.object(ee.data, "computePixels")
+    def test_ee_to_numpy(self, mock_compute_pixels):
+        struct_array = np.zeros((2, 3), dtype=[("B1", "u1"), ("B2", "u1")])
+        mock_compute_pixels.return_value = struct_array
+        image = mock.MagicMock(spec=ee.Image)
+
+        array = common.ee_to_numpy(image, bands=["B1", "B2"])
+        self.assertEqual(array.shape, (2, 3, 2))
+        self.assertEqual(array.dtype, np.uint8)
+        request = mock_compute_pixels.call_args.args[0]
+        self.assertEqual(request["bandIds"], ["B1", "B2"])
+        self.assertNotIn("grid", request)
+
+    @mock.patch.object(ee.data, "computePixels")
+    def test_ee_to_numpy_chunked(self, mock_compute_pixels):
+        width, height = 5, 7
+        full = np.arange(width * height, dtype="f4").reshape(height, width)
+
+        def compute_pixels(request):
+            if "grid" not in request:
+                raise ee.EEException(
+                    "Total request size must be less than or equal to 50331648 bytes."
+                )
+            grid = request["grid"]
+            transform = grid["affineTransform"]
+            self.assertEqual(grid["crsCode"], "EPSG:32610")
+            col = int((transform["translateX"] - 1000) / 30)
+            row = int((transform["translateY"] - 2000) / -30)
+            rows = grid["dimensions"]["height"]
+            cols = grid["dimensions"]["width"]
+            chunk = np.zeros((rows, cols), dtype=[("B1", "f4"), ("B2", "f4")])
+            chunk["B1"] = full[row : row + rows, col : col + cols]
+            chunk["B2"] = -chunk["B1"]
+            return chunk
+
+        mock_compute_pixels.side_effect = compute_pixels
+        image = mock.MagicMock(spec=ee.Image)
+        image.getInfo.return_value = {
+            "bands": [
+                {
+                    "id": "B1",
+                    "crs": "EPSG:32610",
+                    "crs_transform": [30, 0, 1000, 0, -30, 2000],
+                    "dimensions": [width, height],
+                }
+            ]
+        }
+
+        array = common.ee_to_numpy(image, max_workers=4)
+        self.assertEqual(array.shape, (height, width, 2))
+        np.testing.assert_array_equal(array[..., 0], full)
+        np.testing.assert_array_equal(array[..., 1], -full)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_file = os.path.join(tmpdir, "out.npy")
+            array = common.ee_to_numpy(image, chunk_size=3, out_file=out_file)
+            self.assertIsInstance(array, np.memmap)
+            np.testing.assert_array_equal(np.load(out_file)[..., 0], full)
+            del array
+
+        mock_compute_pixels.side_effect = ee.EEException("Image.load: Not found.")
+        with self.assertRaisesRegex(ee.EEException, "Not found"):
+            common.ee_to_numpy(image)
+
     @unittest.skipUnless(
         importlib.util.find_spec("xee") is not None
         and importlib.util.find_spec("shapely") is not None,
@@ -1063,6 +1223,93 @@ class CommonTest(unittest.TestCase):
     # TODO: test_adjust_longitude
     # TODO: test_zonal_stats
     # TODO: test_zonal_stats_by_group
+
+    @mock.patch.object(ee.FeatureCollection, "__init__", _fake_collection_init)
+    @mock.patch.object(ee.data, "computeFeatures")
+    @mock.patch.object(ee, "Reducer")
+    def test_zonal_stats_batched(self, _, mock_compute_features):
+        zones = mock.MagicMock(spec=ee.FeatureCollection)
+        zones.size.return_value.getInfo.return_value = 7
+        zones.toList.side_effect = lambda size, offset: (offset, size)
+
+        def reduce_regions(collection, tileScale, **_):
+            result = mock.MagicMock()
+            result.map.return_value.page = collection.page
+            result.map.return_value.tile_scale = tileScale
+            return result
+
+        image = mock.MagicMock(spec=ee.Image)
+        image.reduceRegions.side_effect = reduce_regions
+
+        def compute_features(params):
+            offset, size = params["expression"].page
+            if offset == 3 and params["expression"].tile_scale < 4:
+                raise ee.EEException("User memory limit exceeded.")
+            ids = list(range(offset, min(offset + size, 7)))
+            return pd.DataFrame({"geo": [None] * len(ids), "id": ids, "mean": ids})
+
+        mock_compute_features.side_effect = compute_features
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "stats.csv")
+            common.zonal_stats(
+                image, zones, filename, batch_size=3, max_workers=2, verbose=False
+            )
+            df = pd.read_csv(filename)
+        self.assertEqual(df.columns.tolist(), ["id", "mean"])
+        self.assertEqual(df["id"].tolist(), list(range(7)))
+        tile_scales = [c.kwargs["tileScale"] for c in image.reduceRegions.mock_calls]
+        self.assertEqual(sorted(tile_scales), [1.0, 1.0, 1.0, 2.0, 4.0])
+
+    @mock.patch.object(ee.FeatureCollection, "__init__", _fake_collection_init)
+    @mock.patch.object(ee.data, "computeFeatures")
+    @mock.patch.object(ee.Image, "pixelArea")
+    @mock.patch.object(ee, "List")
+    @mock.patch.object(ee, "Dictionary")
+    @mock.patch.object(ee, "Reducer")
+    def test_zonal_stats_by_group_batched(
+        self, _, mock_dictionary, mock_list, mock_pixel_area, mock_compute_features
+    ):
+        zones = mock.MagicMock(spec=ee.FeatureCollection)
+        zones.size.return_value.getInfo.return_value = 5
+        zones.toList.side_effect = lambda size, offset: (offset, size)
+
+        def reduce_regions(collection, tileScale, **_):
+            result = mock.MagicMock()
+            result.map.return_value.map.return_value.page = collection.page
+            return result
+
+        dataset = mock_pixel_area.return_value.divide.return_value.addBands
+        dataset.return_value.reduceRegions.side_effect = reduce_regions
+
+        def compute_features(params):
+            offset, size = params["expression"].page
+            ids = list(range(offset, min(offset + size, 5)))
+            return pd.DataFrame({"geo": [None] * len(ids), "id": ids, "Class_1": ids})
+
+        mock_compute_features.side_effect = compute_features
+
+        image = mock.MagicMock(spec=ee.Image)
+        image.bandNames.return_value.size.return_value.getInfo.return_value = 1
+        image.bandTypes.return_value.get.return_value.getInfo.return_value = {
+            "precision": "int"
+        }
+        class_names = mock_dictionary.return_value.keys().map().sort().map()
+        class_names.getInfo.return_value = ["Class_1"]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "out", "stats.csv")
+            common.zonal_stats_by_group(
+                image, zones, filename, batch_size=2, max_workers=2, verbose=False
+            )
+            df = pd.read_csv(filename)
+        self.assertEqual(df.columns.tolist(), ["id", "Class_1"])
+        self.assertEqual(df["id"].tolist(), list(range(5)))
+        self.assertEqual(mock_compute_features.call_count, 3)
+        # The classes are evaluated once, not per batch.
+        class_names.getInfo.assert_called_once()
+        mock_list.assert_called_once_with(["Class_1"])
+
     # TODO: test_vec_area
     # TODO: test_vec_area_km2
     # TODO: test_vec_area_mi2
@@ -1130,7 +1377,81 @@ class CommonTest(unittest.TestCase):
     # TODO: test_csv_to_df
     # TODO: test_ee_to_df
     # TODO: test_shp_to_gdf
-    # TODO: test_ee_to_gdf
+
+    def _mock_paged_collection(self, count):
+        """Returns a collection mock whose pages are fetched by computeFeatures."""
+        collection = mock.MagicMock(spec=ee.FeatureCollection)
+        collection.size.return_value.getInfo.return_value = count
+        collection.map.return_value = collection
+        collection.toList.side_effect = lambda size, offset: (offset, size)
+
+        def compute_features(params):
+            offset, size = params["expression"].page
+            ids = list(range(offset, min(offset + size, count)))
+            if params["fileFormat"] == "PANDAS_DATAFRAME":
+                return pd.DataFrame({"id": ids, "geo": [None] * len(ids)})
+            import geopandas as gpd
+            import shapely
+
+            return gpd.GeoDataFrame(
+                {"id": ids}, geometry=[shapely.Point(i, i) for i in ids]
+            )
+
+        return collection, compute_features
+
+    @mock.patch.object(ee.FeatureCollection, "__init__", _fake_collection_init)
+    @mock.patch.object(ee.data, "computeFeatures")
+    def test_ee_to_df_chunked(self, mock_compute_features):
+        collection, compute_features = self._mock_paged_collection(7)
+        mock_compute_features.side_effect = compute_features
+
+        df = common.ee_to_df(collection, chunk_size=3, max_workers=2)
+        self.assertEqual(df["id"].tolist(), list(range(7)))
+        self.assertNotIn("geo", df.columns)
+        self.assertEqual(mock_compute_features.call_count, 3)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("geopandas") is not None, "geopandas not installed"
+    )
+    @mock.patch.object(ee.FeatureCollection, "__init__", _fake_collection_init)
+    @mock.patch.object(ee.data, "computeFeatures")
+    def test_ee_to_gdf_chunked(self, mock_compute_features):
+        import shapely
+
+        collection, compute_features = self._mock_paged_collection(5)
+        mock_compute_features.side_effect = compute_features
+
+        gdf = common.ee_to_gdf(collection, chunk_size=2)
+        self.assertEqual(gdf["id"].tolist(), list(range(5)))
+        self.assertEqual(gdf.crs, "EPSG:4326")
+        self.assertEqual(gdf.geometry[4], shapely.Point(4, 4))
+        collection.first.assert_not_called()
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("geopandas") is not None
+        and importlib.util.find_spec("pyarrow") is not None,
+        "geopandas or pyarrow not installed",
+    )
+    @mock.patch.object(ee.FeatureCollection, "__init__", _fake_collection_init)
+    @mock.patch.object(ee.data, "computeFeatures")
+    def test_ee_to_parquet(self, mock_compute_features):
+        import geopandas as gpd
+        import shapely
+
+        collection, compute_features = self._mock_paged_collection(5)
+        mock_compute_features.side_effect = compute_features
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "out.parquet")
+            common.ee_to_parquet(collection, filename, chunk_size=2)
+            gdf = gpd.read_parquet(filename)
+            self.assertEqual(gdf["id"].tolist(), list(range(5)))
+            self.assertEqual(gdf.geometry[3], shapely.Point(3, 3))
+            self.assertEqual(gdf.crs, "OGC:CRS84")
+
+            common.ee_to_parquet(collection, filename, chunk_size=2, geometry=False)
+            df = pd.read_parquet(filename)
+            self.assertEqual(df.columns.tolist(), ["id"])
 
     def test_delete_shp(self):
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -1146,7 +1467,70 @@ class CommonTest(unittest.TestCase):
                 self.assertFalse(os.path.exists(os.path.join(tmpdir, "test" + ext)))
 
     # TODO: test_df_to_ee
-    # TODO: test_gdf_to_ee
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("geopandas") is not None, "geopandas not installed"
+    )
+    @mock.patch.object(ee, "FeatureCollection")
+    def test_gdf_to_ee(self, mock_feature_collection):
+        import geopandas as gpd
+        import shapely
+
+        gdf = gpd.GeoDataFrame(
+            {
+                "name": ["a", "b", None],
+                "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+            },
+            geometry=[
+                shapely.Point(1.123456789, 2),
+                shapely.LineString([(0, 0), (1, 1)]),
+                None,
+            ],
+            crs="EPSG:4326",
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.object(os, "getcwd", return_value=tmpdir):
+                common.gdf_to_ee(gdf, geodesic=False, precision=1e-3)
+            self.assertEqual(os.listdir(tmpdir), [])
+
+        geo_json = mock_feature_collection.call_args.args[0]
+        features = geo_json["features"]
+        self.assertEqual(geo_json["type"], "FeatureCollection")
+        self.assertEqual(features[0]["geometry"]["coordinates"], [1.123, 2.0])
+        self.assertNotIn("geodesic", features[0]["geometry"])
+        self.assertFalse(features[1]["geometry"]["geodesic"])
+        self.assertIsNone(features[2]["geometry"])
+        self.assertEqual(features[1]["properties"]["name"], "b")
+        self.assertIsNone(features[2]["properties"]["name"])
+        self.assertTrue(features[0]["properties"]["date"].startswith("2024-01-01"))
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("geopandas") is not None, "geopandas not installed"
+    )
+    @mock.patch.object(ee, "FeatureCollection")
+    def test_gdf_to_ee_batches(self, mock_feature_collection):
+        import geopandas as gpd
+        import shapely
+
+        gdf = gpd.GeoDataFrame(
+            {"id": range(10)},
+            geometry=[shapely.Point(i, i) for i in range(10)],
+            crs="EPSG:4326",
+        )
+        feature_size = len(json.dumps(common._gdf_to_features(gdf)[0]))
+
+        batches = common.gdf_to_ee_batches(gdf, max_bytes=feature_size * 4)
+        self.assertEqual(len(batches), 3)
+        sizes = [
+            len(call.args[0]["features"])
+            for call in mock_feature_collection.call_args_list
+        ]
+        self.assertEqual(sizes, [4, 4, 2])
+
+        with self.assertRaisesRegex(ValueError, "exceeds max_bytes"):
+            common.gdf_to_ee_batches(gdf, max_bytes=10)
+
     # TODO: test_vector_to_geojson
     # TODO: test_vector_to_ee
     # TODO: test_extract_pixel_values
@@ -1324,8 +1708,104 @@ class CommonTest(unittest.TestCase):
     # TODO: test_dynamic_world_s2
     # TODO: test_download_ee_image
     # TODO: test_download_ee_image_tiles
-    # TODO: test_download_ee_image_tiles_parallel
-    # TODO: test_download_ee_image_collection
+
+    @mock.patch.object(ee, "Feature")
+    @mock.patch.object(common, "download_ee_image")
+    def test_download_ee_image_tiles_parallel_resume(
+        self, mock_download, unused_mock_feature
+    ):
+        """Tests that download_ee_image_tiles_parallel skips completed tiles."""
+
+        def fake_download(image, filename, *_, **__):
+            if filename.endswith("2.tif") and mock_download.failures:
+                mock_download.failures -= 1
+                raise ee.EEException("Too many requests")
+            with open(filename, "wb") as f:
+                f.write(b"tif content")
+
+        mock_download.side_effect = fake_download
+        mock_download.failures = 2
+        image = mock.MagicMock(spec=ee.Image)
+        image.serialize.return_value = "image-expression"
+        features = mock.MagicMock(spec=ee.FeatureCollection)
+        features.size.return_value.getInfo.return_value = 3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            args = dict(
+                out_dir=tmpdir,
+                job_args={"n_jobs": 1},
+                ee_init=False,
+                max_retries=2,
+                backoff_factor=0,
+            )
+            failed = common.download_ee_image_tiles_parallel(image, features, **args)
+            self.assertEqual(failed, [os.path.join(tmpdir, "2.tif")])
+            self.assertEqual(mock_download.call_count, 4)
+
+            manifest = os.path.join(tmpdir, ".geemap_manifest.jsonl")
+            records = common._read_download_manifest(manifest)
+            self.assertEqual(records["1.tif"]["status"], "completed")
+            self.assertEqual(records["1.tif"]["size"], len(b"tif content"))
+            self.assertEqual(records["2.tif"]["status"], "failed")
+            self.assertEqual(records["2.tif"]["attempts"], 2)
+
+            # A rerun only retries the failed tile, which succeeds on its second try.
+            mock_download.reset_mock()
+            mock_download.failures = 1
+            failed = common.download_ee_image_tiles_parallel(image, features, **args)
+            self.assertEqual(failed, [])
+            self.assertEqual(mock_download.call_count, 2)
+            self.assertTrue(mock_download.call_args.args[1].endswith("2.tif"))
+
+            records = common._read_download_manifest(manifest)
+            self.assertEqual(records["2.tif"]["status"], "completed")
+            self.assertNotIn("error", records["2.tif"])
+
+            # A tile whose content no longer matches its checksum is downloaded again.
+            with open(os.path.join(tmpdir, "3.tif"), "wb") as f:
+                f.write(b"tif_content")
+            mock_download.reset_mock()
+            common.download_ee_image_tiles_parallel(image, features, **args)
+            mock_download.assert_called_once()
+            self.assertTrue(mock_download.call_args.args[1].endswith("3.tif"))
+
+            # Different parameter values do not reuse the manifest.
+            mock_download.reset_mock()
+            common.download_ee_image_tiles_parallel(image, features, **args, extra="a")
+            mock_download.reset_mock()
+            common.download_ee_image_tiles_parallel(image, features, **args, extra="b")
+            self.assertEqual(mock_download.call_count, 3)
+
+            # A different image does not reuse the manifest.
+            mock_download.reset_mock()
+            image.serialize.return_value = "other-expression"
+            common.download_ee_image_tiles_parallel(image, features, **args)
+            self.assertEqual(mock_download.call_count, 3)
+
+    @mock.patch.object(ee, "Image")
+    @mock.patch.object(common, "download_ee_image")
+    def test_download_ee_image_collection_concurrent(
+        self, mock_download, unused_mock_image
+    ):
+        collection = mock.MagicMock(spec=ee.ImageCollection)
+        collection.size.return_value.getInfo.return_value = 3
+        collection.aggregate_array.return_value.getInfo.return_value = ["a", "b", "c"]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            common.download_ee_image_collection(collection, tmpdir, max_workers=2)
+            filenames = sorted(call.args[1] for call in mock_download.call_args_list)
+            self.assertEqual(
+                filenames, [os.path.join(tmpdir, f"{n}.tif") for n in ["a", "b", "c"]]
+            )
+
+        # Image names are fetched with a single request.
+        collection.aggregate_array.assert_called_once_with("system:index")
+        collection.toList.assert_called_once_with(3)
+
+        mock_download.side_effect = ee.EEException("Too many requests")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaisesRegex(Exception, "Too many requests"):
+                common.download_ee_image_collection(collection, tmpdir, max_workers=2)
 
     def test_get_palette_colors(self):
         # Test with n_class.
@@ -1673,7 +2153,92 @@ class CommonTest(unittest.TestCase):
         image.addBands.assert_called_once_with(scaled_optical, None, True)
         image.updateMask.assert_called_once_with(qa_mask)
 
-    # TODO: test_tms_to_geotiff
+    def test_tile_cache_fetch(self):
+        session = mock.Mock()
+        session.get.return_value = mock.Mock(
+            status_code=200,
+            content=b"tile",
+            headers={"Cache-Control": "max-age=3600", "ETag": '"v1"'},
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = common.TileCache(tmpdir)
+            url = "https://tiles.example.com/1/0/0.png"
+            self.assertEqual(cache.fetch(url, session), b"tile")
+            self.assertEqual(cache.fetch(url, session), b"tile")
+            session.get.assert_called_once()
+            self.assertEqual(cache.size(), 4)
+
+            # Expired tiles are revalidated with their ETag.
+            content, meta = cache.get(url)
+            cache.put(url, content, {**meta, "expires": 0})
+            session.get.reset_mock()
+            session.get.return_value = mock.Mock(
+                status_code=304, content=b"", headers={}
+            )
+            self.assertEqual(cache.fetch(url, session), b"tile")
+            self.assertEqual(
+                session.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+            )
+            self.assertGreater(cache.get(url)[1]["expires"], time.time())
+
+            # Missing tiles and no-store responses are not cached.
+            session.get.return_value = mock.Mock(
+                status_code=404, content=b"", headers={}
+            )
+            self.assertIsNone(cache.fetch(url + "?missing", session))
+            session.get.return_value = mock.Mock(
+                status_code=200, content=b"x", headers={"Cache-Control": "no-store"}
+            )
+            self.assertEqual(cache.fetch(url + "?private", session), b"x")
+            self.assertIsNone(cache.get(url + "?private")[0])
+
+    def test_tile_cache_eviction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = common.TileCache(tmpdir, max_size=10)
+            cache.put("a", b"12345", {"expires": 0})
+            os.utime(cache._path("a"), (0, 0))
+            cache.put("b", b"12345", {"expires": 0})
+            self.assertEqual(cache.size(), 10)
+
+            cache.put("c", b"123", {"expires": 0})
+            self.assertIsNone(cache.get("a")[0])
+            self.assertEqual(cache.get("c")[0], b"123")
+            self.assertEqual(cache.size(), 8)
+
+            cache.clear()
+            self.assertEqual(cache.size(), 0)
+            self.assertIsNone(cache.get("b")[0])
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("osgeo") is not None, "GDAL is not installed"
+    )
+    @mock.patch.dict(sys.modules, {"httpx": None})
+    @mock.patch.object(requests.Session, "get")
+    def test_tms_to_geotiff(self, mock_get):
+        from osgeo import gdal
+
+        tile = Image.new("RGB", (256, 256), (10, 20, 30))
+        buffer = io.BytesIO()
+        tile.save(buffer, format="PNG")
+        mock_get.return_value = mock.Mock(status_code=200, content=buffer.getvalue())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "out.tif")
+            common.tms_to_geotiff(
+                output,
+                [-122.52, 37.733, -122.3661, 37.8095],
+                zoom=13,
+                source="https://tiles.example.com/{z}/{x}/{y}.png",
+                quiet=True,
+            )
+            with gdal.Open(output) as dataset:
+                self.assertEqual(dataset.RasterCount, 3)
+                self.assertEqual(dataset.RasterXSize, 897)
+                self.assertEqual(dataset.RasterYSize, 564)
+                self.assertEqual(dataset.GetRasterBand(1).DataType, gdal.GDT_Byte)
+                self.assertEqual(dataset.GetRasterBand(3).ReadAsArray().max(), 30)
+
     # TODO: test_tif_to_jp2
     # TODO: test_ee_to_geotiff
     # TODO: test_create_grid
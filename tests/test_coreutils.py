@@ -159,6 +159,76 @@ class TestHelpers(unittest.TestCase):
         except ValueError:
             self.fail("file id is not a valid UUID4")
 
+    def test_get_cache_dir(self):
+        """Tests get_cache_dir."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.dict(os.environ, {"GEEMAP_CACHE_DIR": tmpdir}):
+                path = coreutils.get_cache_dir("tiles")
+                self.assertEqual(path, os.path.join(tmpdir, "tiles"))
+                self.assertTrue(os.path.isdir(path))
+
+            env = {"GEEMAP_CACHE_DIR": "", "XDG_CACHE_HOME": tmpdir}
+            with mock.patch.dict(os.environ, env):
+                path = coreutils.get_cache_dir(make_dirs=False)
+                self.assertEqual(path, os.path.join(tmpdir, "geemap"))
+                self.assertFalse(os.path.exists(path))
+
+    def test_ee_cache_key(self):
+        """Tests ee_cache_key."""
+        image = mock.MagicMock()
+        image.serialize.return_value = "image-expression"
+        key = coreutils.ee_cache_key(image, {"min": 0, "max": 1})
+        self.assertIn("image-expression", key)
+        self.assertEqual(key, coreutils.ee_cache_key(image, {"max": 1, "min": 0}))
+        self.assertNotEqual(key, coreutils.ee_cache_key(image, {"min": 0}))
+
+    @mock.patch.object(ee, "Reducer")
+    def test_image_vis_stats(self, _):
+        """Tests image_vis_stats computes stats once and caches them."""
+        image = mock.MagicMock()
+        image.serialize.return_value = "vis-stats-image"
+        image.select.return_value = image
+        image.reduceRegion.return_value.getInfo.return_value = {
+            "B1_min": 1,
+            "B1_max": 10,
+            "B1_mean": 4,
+            "B1_stdDev": 2,
+            "B1_p98": 9,
+            "B2_min": 0,
+            "B2_max": 8,
+            "B2_mean": 6,
+            "B2_stdDev": 4,
+            "B2_p98": 7,
+        }
+
+        stats = coreutils.image_vis_stats(image, bands=["B1", "B2"], percentiles=[98])
+        self.assertEqual(stats, {"min": 0, "max": 10, "mean": 5, "stdDev": 3, "p98": 9})
+        coreutils.image_vis_stats(image, bands=["B1", "B2"], percentiles=[98])
+        image.reduceRegion.assert_called_once()
+
+        image.reduceRegion.return_value.getInfo.return_value = {"B1_min": None}
+        with self.assertRaises(ValueError):
+            coreutils.image_vis_stats(image, bands=["B1"])
+
+    def test_ee_tile_url_format(self):
+        """Tests ee_tile_url_format reuses map IDs of identical layers."""
+        image = mock.MagicMock()
+        image.serialize.return_value = "tile-url-image"
+        with mock.patch.object(ee, "Image") as mock_image:
+            get_map_id = mock_image.return_value.getMapId
+            get_map_id.return_value = {"tile_fetcher": mock.Mock(url_format="url")}
+
+            self.assertEqual(coreutils.ee_tile_url_format(image, {"min": 0}), "url")
+            self.assertEqual(coreutils.ee_tile_url_format(image, {"min": 0}), "url")
+            get_map_id.assert_called_once()
+
+            coreutils.ee_tile_url_format(image, {"min": 1})
+            self.assertEqual(get_map_id.call_count, 2)
+
+            with mock.patch.object(coreutils, "_TILE_URL_CACHE_TTL", 0):
+                coreutils.ee_tile_url_format(image, {"min": 0})
+            self.assertEqual(get_map_id.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
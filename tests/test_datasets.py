@@ -1,7 +1,11 @@
 """Tests for `datasets` module."""
 
+import json
 import os
+import tempfile
+import time
 import unittest
+from unittest import mock
 
 from geemap import datasets
 
@@ -9,11 +13,66 @@ from geemap import datasets
 class DatasetsTest(unittest.TestCase):
     """Tests for `datasets` module."""
 
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"GEEMAP_CACHE_DIR": self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_get_data_csv(self):
         data_csv = datasets.get_data_csv()
         self.assertTrue(os.path.exists(data_csv))
         self.assertEqual(os.path.basename(data_csv), "ee_data_catalog.csv")
 
+    def test_get_data_dict(self):
+        data_dict = datasets.get_data_dict(
+            ["COPERNICUS/S2", "COPERNICUS/S1_GRD", "NASA/NASADEM_HGT/001"]
+        )
+        self.assertEqual(data_dict["COPERNICUS"]["S2"], "COPERNICUS/S2")
+        self.assertEqual(data_dict["COPERNICUS"]["S1_GRD"], "COPERNICUS/S1_GRD")
+        self.assertEqual(data_dict["NASA_NASADEM_HGT_001"], "NASA/NASADEM_HGT/001")
+
+    @mock.patch.object(datasets, "get_data_list")
+    def test_load_catalog_index(self, mock_get_data_list):
+        mock_get_data_list.return_value = ["COPERNICUS/S2"]
+
+        self.assertEqual(datasets.load_catalog_index(), ["COPERNICUS/S2"])
+        self.assertTrue(os.path.exists(datasets.get_catalog_index_path()))
+
+        # A fresh index is read from the cache without downloading.
+        mock_get_data_list.return_value = ["COPERNICUS/S1_GRD"]
+        self.assertEqual(datasets.load_catalog_index(), ["COPERNICUS/S2"])
+        self.assertEqual(mock_get_data_list.call_count, 1)
+
+    @mock.patch.object(datasets, "get_data_list")
+    def test_load_catalog_index_stale(self, mock_get_data_list):
+        mock_get_data_list.return_value = ["COPERNICUS/S1_GRD"]
+        index = {
+            "version": datasets.CATALOG_INDEX_VERSION,
+            "updated": time.time() - datasets.CATALOG_INDEX_MAX_AGE - 1,
+            "datasets": ["COPERNICUS/S2"],
+        }
+        with open(datasets.get_catalog_index_path(), "w") as f:
+            json.dump(index, f)
+
+        with mock.patch.object(datasets.threading, "Thread") as mock_thread:
+            self.assertEqual(datasets.load_catalog_index(), ["COPERNICUS/S2"])
+        mock_thread.assert_called_once()
+        mock_get_data_list.assert_not_called()
+
+        mock_thread.call_args.kwargs["target"]()
+        self.assertEqual(datasets.load_catalog_index(), ["COPERNICUS/S1_GRD"])
+
+    @mock.patch.object(datasets, "get_data_list")
+    def test_load_catalog_index_offline(self, mock_get_data_list):
+        mock_get_data_list.side_effect = OSError("offline")
+
+        data_list = datasets.load_catalog_index()
+        self.assertIn("AAFC/ACI", data_list)
+        self.assertIn("users/giswqs/public/countries", data_list)
+        self.assertFalse(os.path.exists(datasets.get_catalog_index_path()))
+
 
 if __name__ == "__main__":
     unittest.main()
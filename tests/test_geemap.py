@@ -2,9 +2,32 @@
 """Tests for `geemap` package."""
 
 import unittest
+from unittest import mock
 
+import ee
 import geemap
+from geemap import geemap as geemap_module
+from geemap import geojson_layers
 import ipyleaflet
+import ipywidgets
+import pandas as pd
+
+
+def _wait(prefetcher):
+    """Waits for the requests of a prefetcher with one worker to finish."""
+    # Warming the tiles of a frame queues its tile requests, so wait twice.
+    for _ in range(2):
+        prefetcher.executor.submit(lambda: None).result()
+
+
+class _FakeImage:
+    def __init__(self, value):
+        self.value = value
+
+
+def _fake_tile_url_format(image, vis_params):
+    del vis_params  # Unused.
+    return f"https://tiles/{image.value}/{{z}}/{{x}}/{{y}}"
 
 
 class TestGeemap(unittest.TestCase):
@@ -14,6 +37,178 @@ class TestGeemap(unittest.TestCase):
         m = geemap.Map(ee_initialize=False)
         self.assertIsInstance(m, ipyleaflet.Map)
 
+    def test_add_points_from_xy(self):
+        m = geemap.Map(ee_initialize=False)
+        df = pd.DataFrame(
+            {"longitude": [0, 1, 2], "latitude": [0, 1, 2], "kind": ["a", "b", "a"]}
+        )
+        m.add_points_from_xy(df, color_column="kind", add_legend=False)
+
+        cluster = m.layers[-1]
+        self.assertIsInstance(cluster, ipyleaflet.MarkerCluster)
+        self.assertEqual(len(cluster.markers), 3)
+        self.assertEqual(cluster.markers[2].location, [2, 2])
+        # Points of the same category share an icon.
+        self.assertIs(cluster.markers[0].icon, cluster.markers[2].icon)
+        self.assertIsNot(cluster.markers[0].icon, cluster.markers[1].icon)
+
+    def test_add_points_from_xy_max_markers(self):
+        m = geemap.Map(ee_initialize=False)
+        df = pd.DataFrame({"longitude": [0, 1, 2], "latitude": [0, 1, 2]})
+        m.add_points_from_xy(df, popup=["longitude"], max_markers=2)
+
+        layer = m.layers[-1]
+        self.assertIsInstance(layer, geojson_layers.ViewportGeoJSON)
+        features = layer.spatial_index.features
+        self.assertEqual(len(features), 3)
+        self.assertEqual(features[1]["properties"]["popup"], "<b>longitude</b>: 1<br>")
+
+
+class TestFramePrefetcher(unittest.TestCase):
+    """Tests for the time slider frame prefetcher."""
+
+    def setUp(self):
+        super().setUp()
+        self.frame_url = mock.Mock(
+            side_effect=lambda i: f"https://tiles/{i}/{{z}}/{{x}}/{{y}}"
+        )
+        self.progress = ipywidgets.IntProgress(max=3)
+        self.prefetcher = geemap_module._FramePrefetcher(
+            self.frame_url, 3, max_workers=1, prefetch_tiles=2, progress=self.progress
+        )
+        self.addCleanup(self.prefetcher.close)
+
+    def test_resolve_all(self):
+        self.prefetcher.resolve_all()
+        _wait(self.prefetcher)
+
+        self.assertEqual(
+            sorted(call.args for call in self.frame_url.call_args_list),
+            [(0,), (1,), (2,)],
+        )
+        self.assertEqual(self.progress.value, 3)
+        self.assertEqual(self.progress.layout.display, "none")
+
+        # The resolved URLs are cached.
+        self.assertEqual(self.prefetcher.url(1), "https://tiles/1/{z}/{x}/{y}")
+        self.assertEqual(self.frame_url.call_count, 3)
+
+    def test_resolve_all_error(self):
+        self.frame_url.side_effect = [
+            "https://tiles/0/{z}/{x}/{y}",
+            ee.EEException("Too many requests"),
+            "https://tiles/2/{z}/{x}/{y}",
+        ]
+        with self.assertLogs(level="WARNING") as logs:
+            self.prefetcher.resolve_all()
+            _wait(self.prefetcher)
+        self.assertIn("Failed to resolve frame 1: Too many requests", logs.output[0])
+        self.assertEqual(self.progress.value, 3)
+
+    @mock.patch.object(geemap_module.requests, "get")
+    def test_prefetch_next(self, mock_get):
+        # The bounds are within tile (0, 0) at zoom level 1.
+        bounds = [[10, -170], [80, -10]]
+        self.prefetcher.prefetch_next(2, bounds, 1)
+        _wait(self.prefetcher)
+
+        urls = sorted(call.args[0] for call in mock_get.call_args_list)
+        self.assertEqual(urls, ["https://tiles/0/1/0/0", "https://tiles/1/1/0/0"])
+
+        # The tiles of a frame, bounds and zoom level are only requested once.
+        self.prefetcher.prefetch_next(2, bounds, 1)
+        _wait(self.prefetcher)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(geemap_module.requests, "get")
+    def test_prefetch_next_error(self, mock_get):
+        mock_get.return_value.raise_for_status.side_effect = OSError("Not found")
+        with self.assertLogs(level="WARNING") as logs:
+            self.prefetcher.prefetch_next(0, [[10, -170], [80, -10]], 1)
+            _wait(self.prefetcher)
+        self.assertIn(
+            "Failed to prefetch tile https://tiles/1/1/0/0: Not found", logs.output[0]
+        )
+
+    @mock.patch.object(geemap_module.requests, "get")
+    def test_close(self, mock_get):
+        self.prefetcher.close()
+        self.prefetcher.resolve_all()
+        self.prefetcher.prefetch_next(0, [[10, -170], [80, -10]], 1)
+        self.frame_url.assert_not_called()
+        mock_get.assert_not_called()
+
+
+@mock.patch.object(ee, "Image", _FakeImage)
+@mock.patch.object(
+    geemap_module.ee_tile_layers, "_get_tile_url_format", _fake_tile_url_format
+)
+class TestAddTimeSlider(unittest.TestCase):
+    """Tests for the prefetching of Map.add_time_slider."""
+
+    def setUp(self):
+        super().setUp()
+        self.map = geemap.Map(ee_initialize=False)
+        self.map.addLayer = mock.Mock()
+        self.map.set_trait("bounds", ((10, -170), (80, -10)))
+        self.map.zoom = 1
+        self.collection = mock.MagicMock(spec=ee.ImageCollection)
+        self.collection.size.return_value.getInfo.return_value = 3
+        self.collection.toList.return_value.get.side_effect = lambda i: i
+
+        self.prefetchers = []
+        prefetcher_class = geemap_module._FramePrefetcher
+
+        def create_prefetcher(*args, **kwargs):
+            self.prefetchers.append(prefetcher_class(*args, **kwargs))
+            return self.prefetchers[-1]
+
+        patcher = mock.patch.object(
+            geemap_module, "_FramePrefetcher", side_effect=create_prefetcher
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _add_time_slider(self, **kwargs):
+        self.map.add_time_slider(
+            self.collection, labels=["a", "b", "c"], max_workers=1, **kwargs
+        )
+        (prefetcher,) = self.prefetchers
+        _wait(prefetcher)
+        return prefetcher
+
+    @mock.patch.object(geemap_module.requests, "get")
+    def test_prefetch(self, mock_get):
+        prefetcher = self._add_time_slider(prefetch_tiles=1)
+        self.assertEqual(
+            [prefetcher.url(i) for i in range(3)],
+            [f"https://tiles/{i}/{{z}}/{{x}}/{{y}}" for i in range(3)],
+        )
+
+        slider = self.map.slider_ctrl.widget.children[0]
+        with mock.patch.object(prefetcher, "_frame_url") as mock_frame_url:
+            slider.value = 2
+            _wait(prefetcher)
+        mock_frame_url.assert_not_called()
+
+        image = self.map.addLayer.call_args.args[0]
+        self.assertEqual(image.value, 1)
+        mock_get.assert_called_once_with("https://tiles/2/1/0/0", timeout=60)
+
+    def test_close(self):
+        prefetcher = self._add_time_slider(prefetch=False)
+        close_btn = self.map.slider_ctrl.widget.children[-1]
+        with mock.patch.object(prefetcher, "close") as mock_close:
+            close_btn.click()
+        mock_close.assert_called()
+        self.assertNotIn(self.map.slider_ctrl, self.map.controls)
+
+    def test_remove_control(self):
+        prefetcher = self._add_time_slider(prefetch=False)
+        with mock.patch.object(prefetcher, "close") as mock_close:
+            self.map.remove(self.map.slider_ctrl)
+        mock_close.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+"""Tests for the geojson_layers module."""
+
+import unittest
+
+from geemap import geojson_layers
+
+
+def _square(west, south, size):
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [west, south],
+                [west + size, south],
+                [west + size, south + size],
+                [west, south + size],
+                [west, south],
+            ]
+        ],
+    }
+
+
+def _feature_collection(*geometries):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": geometry, "properties": {"id": i}}
+            for i, geometry in enumerate(geometries)
+        ],
+    }
+
+
+class TestGeoJSONLayers(unittest.TestCase):
+
+    def test_geometry_bounds(self):
+        # pylint: disable-next: protected-access
+        bounds = geojson_layers._geometry_bounds(_square(1, 2, 3))
+        self.assertEqual(bounds, [1, 2, 4, 5])
+        point = {"type": "Point", "coordinates": [1, 2]}
+        # pylint: disable-next: protected-access
+        self.assertEqual(geojson_layers._geometry_bounds(point), [1, 2, 1, 2])
+
+    def test_index_query(self):
+        index = geojson_layers.GeoJSONIndex(
+            _feature_collection(
+                _square(0, 0, 1),
+                _square(10, 10, 5),
+                {"type": "Point", "coordinates": [0.5, 20]},
+                None,
+            )
+        )
+        self.assertEqual(index.query(-1, -1, 2, 2).tolist(), [0])
+        self.assertEqual(index.query(-1, -1, 12, 30).tolist(), [0, 1, 2])
+        self.assertEqual(index.query(-1, -1, 12, 30, max_features=1).tolist(), [1])
+        self.assertEqual(index.query_point(0.5, 20).tolist(), [2])
+
+    def test_simplify_geometry(self):
+        line = {
+            "type": "LineString",
+            "coordinates": [[0, 0], [0.1, 0.1], [0.2, 0.2], [1.5, 1.5], [3, 3]],
+        }
+        simplified = geojson_layers.simplify_geometry(line, 1)
+        self.assertEqual(simplified["coordinates"], [[0, 0], [1.5, 1.5], [3, 3]])
+
+    def test_simplify_geometry_keeps_valid_rings(self):
+        square = _square(0, 0, 0.1)
+        simplified = geojson_layers.simplify_geometry(square, 1)
+        self.assertEqual(simplified, square)
+
+    def test_viewport_geojson(self):
+        calls = []
+
+        def feature_style(feature):
+            calls.append(feature["properties"]["id"])
+            return {"fillColor": "red"}
+
+        layer = geojson_layers.ViewportGeoJSON(
+            _feature_collection(_square(0, 0, 1), _square(10, 10, 1)),
+            feature_style=feature_style,
+        )
+        self.assertEqual(layer.data["features"], [])
+
+        layer.update_view(((-1, -1), (2, 2)), 5)
+        features = layer.data["features"]
+        self.assertEqual([f["properties"]["id"] for f in features], [0])
+        self.assertEqual(features[0]["properties"]["style"], {"fillColor": "red"})
+
+        # Styles are computed once per feature, even across zoom levels.
+        layer.update_view(((-1, -1), (12, 12)), 6)
+        self.assertEqual(len(layer.data["features"]), 2)
+        self.assertEqual(calls, [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for the import time of the `geemap` package."""
+
+import json
+import subprocess
+import sys
+import unittest
+
+_IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import geemap
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+# Modules that must only be imported when a map or helper is first used.
+_DEFERRED_MODULES = [
+    "geemap.geemap",
+    "geemap.foliumap",
+    "geemap.common",
+    "geemap.conversion",
+    "geemap.timelapse",
+    "geemap.toolbar",
+    "bqplot",
+    "matplotlib",
+    "plotly",
+    "xarray",
+]
+
+# About three times the import time, so the benchmark fails if the heavy modules
+# are imported eagerly again, which takes several seconds.
+_MAX_IMPORT_SECONDS = 2.0
+
+# Imports each module of the core, toolbar and map_widgets import cycle first, as
+# in a fresh interpreter. Only the geemap modules are removed between the imports,
+# so the other dependencies are imported once.
+_CYCLE_SCRIPT = """
+import importlib
+import sys
+
+for module in ["core", "toolbar", "map_widgets", "geemap", "foliumap"]:
+    for name in [name for name in sys.modules if name.split(".")[0] == "geemap"]:
+        del sys.modules[name]
+    importlib.import_module(f"geemap.{module}")
+"""
+
+
+def _import_geemap() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestImport(unittest.TestCase):
+    """Tests for the lazy import of the geemap package."""
+
+    def test_import_defers_heavy_modules(self):
+        modules = set(_import_geemap()["modules"])
+        for module in _DEFERRED_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_import_time(self):
+        self.assertLess(_import_geemap()["elapsed"], _MAX_IMPORT_SECONDS)
+
+    def test_import_cycle_modules(self):
+        result = subprocess.run(
+            [sys.executable, "-c", _CYCLE_SCRIPT], capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -372,6 +372,7 @@ class TestLegend(unittest.TestCase):
 
 
 @mock.patch.object(ee, "Algorithms", fake_ee.Algorithms)
+@mock.patch.object(ee, "Dictionary", fake_ee.Dictionary)
 @mock.patch.object(ee, "FeatureCollection", fake_ee.FeatureCollection)
 @mock.patch.object(ee, "Feature", fake_ee.Feature)
 @mock.patch.object(ee, "Geometry", fake_ee.Geometry)
@@ -387,6 +388,13 @@ class TestInspector(unittest.TestCase):
 
         self.map_fake = fake_map.FakeMap()
         self.inspector = map_widgets.Inspector(self.map_fake)
+        self.inspector._debounce_seconds = 0
+
+    def _click(self, latlon):
+        """Clicks the map and waits for the inspector queries to finish."""
+        self.map_fake.click(latlon, "click")
+        # The done callbacks of a query run on the worker thread before its next task.
+        self.inspector._executor.submit(lambda: None).result()
 
     def test_inspector_no_map(self):
         """Tests that a valid map must be passed in."""
@@ -408,7 +416,7 @@ class TestInspector(unittest.TestCase):
 
     def test_map_empty_click(self):
         """Tests that clicking the map triggers inspection."""
-        self.map_fake.click((1, 2), "click")
+        self._click((1, 2))
 
         self.assertEqual(self.map_fake.cursor_style, "crosshair")
 
@@ -453,7 +461,7 @@ class TestInspector(unittest.TestCase):
                 "vis_params": None,
             },
         }
-        self.map_fake.click((1, 2), "click")
+        self._click((1, 2))
 
         expected_point_info = coreutils.new_tree_node(
             "Point (2.00, 1.00) at 1024m/px",
@@ -519,8 +527,8 @@ class TestInspector(unittest.TestCase):
             },
         }
         self.map_fake.scale = 32
-        self.map_fake.click((1, 2), "click")
-        self.map_fake.click((4, 1), "click")
+        self._click((1, 2))
+        self._click((4, 1))
 
         expected_point_info = coreutils.new_tree_node(
             "Point (1.00, 4.00) at 32m/px",
@@ -538,7 +546,7 @@ class TestInspector(unittest.TestCase):
         """Tests that nodes are expanded when the expand boolean is true."""
         self.inspector.expand_points = True
 
-        self.map_fake.click((4, 1), "click")
+        self._click((4, 1))
 
         expected_point_info = coreutils.new_tree_node(
             "Point (1.00, 4.00) at 1024m/px",
@@ -553,6 +561,124 @@ class TestInspector(unittest.TestCase):
         )
         self.assertEqual(self.inspector.point_info, expected_point_info)
 
+    def test_map_click_single_request(self):
+        """Tests that all layers are queried with one request and cached."""
+        self.map_fake.ee_layers = {
+            "test-map-1": {
+                "ee_object": ee.Image(1),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+            "test-map-2": {
+                "ee_object": ee.Image(2),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+            "test-map-3": {
+                "ee_object": ee.FeatureCollection([]),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+        }
+        get_info = fake_ee.Dictionary.getInfo
+        with mock.patch.object(
+            fake_ee.Dictionary, "getInfo", autospec=True, side_effect=get_info
+        ) as mock_get_info:
+            self._click((1, 2))
+            self.assertEqual(mock_get_info.call_count, 1)
+            self.assertEqual(len(self.inspector.pixel_info["children"]), 2)
+            self.assertEqual(len(self.inspector.object_info["children"]), 1)
+
+            # The same pixel at the same zoom level is served from the cache.
+            self._click((1, 2))
+            self.assertEqual(mock_get_info.call_count, 1)
+            self.assertEqual(len(self.inspector.pixel_info["children"]), 2)
+
+            self.map_fake.zoom = 8
+            self._click((1, 2))
+            self.assertEqual(mock_get_info.call_count, 2)
+
+    def test_map_click_object_cache(self):
+        """Tests that objects are not served from the cache of another point."""
+        self.map_fake.ee_layers = {
+            "test-map-1": {
+                "ee_object": ee.Image(1),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+            "test-map-2": {
+                "ee_object": ee.FeatureCollection([]),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+        }
+        get_info = fake_ee.Dictionary.getInfo
+        with mock.patch.object(
+            fake_ee.Dictionary, "getInfo", autospec=True, side_effect=get_info
+        ) as mock_get_info:
+            self._click((1, 2))
+            self.assertEqual(len(mock_get_info.call_args.args[0].data), 2)
+
+            # Another point in the same pixel only queries the objects again.
+            self._click((1.0001, 2))
+            self.assertEqual(mock_get_info.call_count, 2)
+            self.assertEqual(len(mock_get_info.call_args.args[0].data), 1)
+            self.assertEqual(len(self.inspector.pixel_info["children"]), 1)
+            self.assertEqual(len(self.inspector.object_info["children"]), 1)
+
+    def test_map_click_debounce(self):
+        """Tests that only the last of clicks in quick succession is queried."""
+        self.inspector._debounce_seconds = 0.5
+        self.map_fake.ee_layers = {
+            "test-map-1": {
+                "ee_object": ee.Image(1),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+        }
+        get_info = fake_ee.Dictionary.getInfo
+        with mock.patch.object(
+            fake_ee.Dictionary, "getInfo", autospec=True, side_effect=get_info
+        ) as mock_get_info:
+            self.map_fake.click((1, 2), "click")
+            self._click((4, 1))
+
+        mock_get_info.assert_called_once()
+        self.assertEqual(len(self.inspector.pixel_info["children"]), 1)
+        self.assertEqual(
+            self.inspector.point_info["children"][1]["label"], "Latitude: 4"
+        )
+        self.assertEqual(self.map_fake.cursor_style, "crosshair")
+
+    def test_map_click_error(self):
+        """Tests that a failed query is shown in the inspector."""
+        self.map_fake.ee_layers = {
+            "test-map-1": {
+                "ee_object": ee.Image(1),
+                "ee_layer": fake_map.FakeEeTileLayer(visible=True),
+                "vis_params": None,
+            },
+        }
+        with (
+            mock.patch.object(
+                fake_ee.Dictionary,
+                "getInfo",
+                side_effect=ee.EEException("Too many requests"),
+            ),
+            self.assertLogs(level="WARNING") as logs,
+        ):
+            self._click((1, 2))
+
+        expected_pixel_info = coreutils.new_tree_node(
+            "Pixels",
+            [coreutils.new_tree_node("Error: Too many requests")],
+            top_level=True,
+            expanded=True,
+        )
+        self.assertEqual(self.inspector.pixel_info, expected_pixel_info)
+        self.assertIn("Too many requests", logs.output[0])
+        self.assertEqual(self.map_fake.cursor_style, "crosshair")
+
 
 def _create_fake_map() -> fake_map.FakeMap:
     ret = fake_map.FakeMap()
@@ -1,6 +1,9 @@
+import json
 import multiprocessing
+import os
 import pathlib
 import tempfile
+import types
 import unittest
 from unittest import mock
 
@@ -104,6 +107,38 @@ class TestML(unittest.TestCase):
         mock_ensemble.assert_called_once()
         mock_fc.aggregate_array.assert_called_with("tree")
 
+    @mock.patch.object(ee.Classifier, "decisionTreeEnsemble")
+    @mock.patch.object(ee, "String")
+    @mock.patch.object(ee.Filter, "eq")
+    def test_fc_to_classifier_chunked(self, mock_eq, mock_ee_string, mock_ensemble):
+        mock_fc = mock.MagicMock()
+        tree_ids = mock_fc.aggregate_array.return_value.distinct.return_value
+
+        classifier = ml.fc_to_classifier(mock_fc, chunked=True)
+        self.assertEqual(classifier, mock_ensemble.return_value)
+        mock_fc.aggregate_array.assert_called_once_with("tree_id")
+        mock_ensemble.assert_called_once_with(
+            tree_ids.map.return_value.map.return_value
+        )
+
+        # Each tree is the concatenation of its chunks sorted by chunk number.
+        join_chunks = tree_ids.map.call_args.args[0]
+        tree = join_chunks(3)
+        mock_eq.assert_called_once_with("tree_id", 3)
+        mock_fc.filter.assert_called_once_with(mock_eq.return_value)
+        chunks = mock_fc.filter.return_value.sort
+        chunks.assert_called_once_with("chunk")
+        chunks.return_value.aggregate_array.assert_called_once_with("tree")
+        iterate = chunks.return_value.aggregate_array.return_value.iterate
+        self.assertEqual(tree, iterate.return_value)
+        concatenate, first = iterate.call_args.args
+        self.assertEqual(first, "")
+        self.assertEqual(
+            concatenate("chunk", "tree"), mock_ee_string.return_value.cat.return_value
+        )
+        mock_ee_string.assert_called_with("tree")
+        mock_ee_string.return_value.cat.assert_called_once_with("chunk")
+
     @mock.patch.object(ee.batch.Export.table, "toAsset")
     @mock.patch.object(ee, "FeatureCollection")
     @mock.patch.object(ee, "Feature")
@@ -125,6 +160,117 @@ class TestML(unittest.TestCase):
         )
         mock_task.start.assert_called_once()
 
+    @mock.patch.object(ee.batch.Export.table, "toAsset")
+    @mock.patch.object(ee, "FeatureCollection")
+    @mock.patch.object(ee, "Feature")
+    @mock.patch.object(ee.Geometry, "Point")
+    def test_export_trees_to_fc_chunked(
+        self, mock_point, mock_feature, mock_fc, mock_to_asset
+    ):
+        mock_point.return_value = "mocked_point"
+        trees = ["ab\ncd\n", "e\n"]
+        task = ml.export_trees_to_fc(trees, "users/test/test_rf", max_chunk_length=4)
+
+        self.assertEqual(task, mock_to_asset.return_value)
+        properties = [call.args[1] for call in mock_feature.call_args_list]
+        self.assertEqual(
+            properties,
+            [
+                {"tree": "ab#c", "tree_id": 0, "chunk": 0},
+                {"tree": "d#", "tree_id": 0, "chunk": 1},
+                {"tree": "e#", "tree_id": 1, "chunk": 0},
+            ],
+        )
+
+    @mock.patch.object(ee.batch.Export.table, "toAsset")
+    @mock.patch.object(ee, "FeatureCollection")
+    @mock.patch.object(ee, "Feature")
+    @mock.patch.object(ee.Geometry, "Point")
+    def test_export_trees_to_fcs(
+        self, mock_point, mock_feature, mock_fc, mock_to_asset
+    ):
+        mock_feature.side_effect = lambda geometry, properties: properties
+        mock_fc.side_effect = lambda features: features
+        trees = ["abcdefghij\n"] * 5
+
+        tasks = ml.export_trees_to_fcs(
+            trees, "users/test/rf", max_chunk_length=4, max_request_size=100
+        )
+
+        # The 15 chunks are split into several requests of at most 100 bytes.
+        self.assertGreater(mock_to_asset.call_count, 1)
+        self.assertEqual(list(tasks), [f"users/test/rf_{i}" for i in range(len(tasks))])
+        features = []
+        for call, asset_id in zip(mock_to_asset.call_args_list, tasks):
+            self.assertEqual(call.kwargs["assetId"], asset_id)
+            collection = call.kwargs["collection"]
+            size = sum(len(json.dumps(feature)) for feature in collection)
+            self.assertLessEqual(size, 100)
+            features.extend(collection)
+        self.assertEqual(
+            [(f["tree_id"], f["chunk"], f["tree"]) for f in features],
+            [
+                (tree_id, chunk, tree)
+                for tree_id in range(5)
+                for chunk, tree in enumerate(["abcd", "efgh", "ij#"])
+            ],
+        )
+        self.assertEqual(mock_to_asset.return_value.start.call_count, len(tasks))
+
+    @mock.patch.object(ee.batch.Export.table, "toAsset")
+    def test_export_trees_to_fcs_chunk_too_large(self, mock_to_asset):
+        with self.assertRaisesRegex(ValueError, "reduce max_chunk_length"):
+            ml.export_trees_to_fcs(["tree1\n"], "users/test/rf", max_request_size=10)
+        mock_to_asset.assert_not_called()
+
+    @mock.patch.object(ml, "strings_to_classifier")
+    def test_trees_to_classifier_inline(self, mock_strings_to_classifier):
+        trees = ["tree1\n", "tree2\n"]
+        classifier = ml.trees_to_classifier(trees)
+        self.assertEqual(classifier, mock_strings_to_classifier.return_value)
+        mock_strings_to_classifier.assert_called_once_with(trees)
+
+    def test_trees_to_classifier_requires_asset_id(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch.dict(os.environ, {"GEEMAP_CACHE_DIR": temp_dir}):
+                with self.assertRaisesRegex(ValueError, "provide an asset_id"):
+                    ml.trees_to_classifier(["tree1\n"], max_inline_size=1)
+
+    @mock.patch.object(ml, "fc_to_classifier")
+    @mock.patch.object(ml, "export_trees_to_fcs")
+    @mock.patch.object(ee, "FeatureCollection")
+    @mock.patch.object(ee.data, "getAsset")
+    def test_trees_to_classifier_upload_cached(
+        self, mock_get_asset, mock_fc, mock_export, mock_fc_to_classifier
+    ):
+        task = mock.MagicMock()
+        task.active.return_value = False
+        task.status.return_value = {"state": "COMPLETED"}
+        mock_export.return_value = {"users/test/rf_0": task, "users/test/rf_1": task}
+        trees = ["tree1\n", "tree2\n"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch.dict(os.environ, {"GEEMAP_CACHE_DIR": temp_dir}):
+                ml.trees_to_classifier(trees, "users/test/rf", max_inline_size=10)
+                mock_export.assert_called_once()
+                self.assertEqual(mock_export.call_args.kwargs["max_request_size"], 10)
+
+                # The second call reuses the uploaded assets.
+                mock_fc.reset_mock()
+                classifier = ml.trees_to_classifier(
+                    trees, "users/test/other", max_inline_size=10
+                )
+                mock_export.assert_called_once()
+                mock_get_asset.assert_has_calls(
+                    [mock.call("users/test/rf_0"), mock.call("users/test/rf_1")]
+                )
+                mock_fc.assert_has_calls(
+                    [mock.call("users/test/rf_0"), mock.call("users/test/rf_1")]
+                )
+                mock_fc_to_classifier.assert_called_with(
+                    mock_fc.return_value.flatten.return_value, chunked=True
+                )
+                self.assertEqual(classifier, mock_fc_to_classifier.return_value)
+
     def test_trees_to_csv(self):
         trees = ["tree1\n", "tree2\n"]
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -158,6 +304,78 @@ class TestML(unittest.TestCase):
         classifier = ml.csv_to_classifier("non_existent_file.csv")
         self.assertIsNone(classifier)
 
+    @unittest.skipIf(not HAS_SKLEARN, "sklearn not installed")
+    def test_tree_to_string_lines(self):
+        # Node 0 splits on f1 into leaf 1 and node 2, which splits on f2 into leaves.
+        tree = types.SimpleNamespace(
+            children_left=np.array([1, -1, 3, -1, -1]),
+            children_right=np.array([2, -1, 4, -1, -1]),
+            feature=np.array([0, -2, 1, -2, -2]),
+            threshold=np.array([0.5, -2.0, 0.5, -2.0, -2.0]),
+            impurity=np.array([0.5, 0.0, 0.5, 0.0, 0.0]),
+            n_node_samples=np.array([4, 2, 2, 1, 1]),
+            value=np.array([[[0.5]], [[0.1]], [[0.7]], [[0.6]], [[0.8]]]),
+        )
+        estimator = types.SimpleNamespace(tree_=tree)
+
+        tree_str = ml.tree_to_string(
+            estimator, feature_names=["f1", "f2"], output_mode="REGRESSION"
+        )
+        self.assertEqual(
+            tree_str,
+            "1) root 4 9999 9999 (1.0)\n"
+            "  2) f1 <= 0.500000 2 0.0000 0.1 *\n"
+            "  3) f1 > 0.500000 4 0.5000 0.5\n"
+            "    6) f2 <= 0.500000 1 0.0000 0.6 *\n"
+            "    7) f2 > 0.500000 1 0.0000 0.8 *\n",
+        )
+
+        compact_str = ml.tree_to_string(
+            estimator,
+            feature_names=["f1", "f2"],
+            output_mode="REGRESSION",
+            compact=True,
+        )
+        self.assertEqual(
+            compact_str, "\n".join(line.strip() for line in tree_str.split("\n"))
+        )
+
+    def test_tree_to_string_single_leaf(self):
+        # A bootstrapped tree can be a single leaf, whose squeezed values are 0-d.
+        tree = types.SimpleNamespace(
+            children_left=np.array([-1]),
+            children_right=np.array([-1]),
+            feature=np.array([-2]),
+            threshold=np.array([-2.0]),
+            impurity=np.array([0.0]),
+            n_node_samples=np.array([2]),
+            value=np.array([[[0.9]]]),
+        )
+        estimator = types.SimpleNamespace(tree_=tree)
+
+        for output_mode in ["INFER", "REGRESSION"]:
+            tree_str = ml.tree_to_string(
+                estimator, feature_names=["f1", "f2"], output_mode=output_mode
+            )
+            self.assertEqual(tree_str, "1) root 2 9999 9999 (0.0)\n")
+
+    @unittest.skipIf(not HAS_SKLEARN, "sklearn not installed")
+    def test_rf_to_strings_serial(self):
+        X = np.array([[0, 0], [1, 1], [0, 1], [1, 0]])
+        y = np.array([0.1, 0.9, 0.8, 0.2])
+        rf = sklearn.ensemble.RandomForestRegressor(n_estimators=3, random_state=42)
+        rf.fit(X, y)
+
+        trees = ml.rf_to_strings(
+            rf, feature_names=["f1", "f2"], output_mode="REGRESSION"
+        )
+        self.assertEqual(len(trees), 3)
+        for tree, estimator in zip(trees, rf.estimators_):
+            self.assertEqual(
+                tree,
+                ml.tree_to_string(estimator, ["f1", "f2"], output_mode="REGRESSION"),
+            )
+
     @unittest.skipIf(not HAS_SKLEARN, "sklearn not installed")
     def test_tree_to_string_infer_classification(self):
         X = np.array([[0, 0], [1, 1], [0, 1], [1, 0]])
@@ -0,0 +1,125 @@
+"""Tests for the timelapse module."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from geemap import timelapse
+
+
+def _write_gif(path: str, count: int = 3, size: tuple[int, int] = (64, 48)) -> None:
+    frames = [Image.new("RGB", size, (40 * i, 0, 0)) for i in range(count)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100)
+
+
+class TimelapseTest(unittest.TestCase):
+
+    def test_frame_xy(self):
+        self.assertEqual(timelapse._frame_xy((5, 6), 100, 50), (5, 6))
+        self.assertEqual(timelapse._frame_xy(("10%", "50%"), 100, 50), (10, 25))
+        with self.assertRaises(ValueError):
+            timelapse._frame_xy(("10", "50"), 100, 50)
+
+    def test_composite_timelapse(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_gif = os.path.join(tmpdir, "in.gif")
+            out_gif = os.path.join(tmpdir, "out.gif")
+            logo = os.path.join(tmpdir, "logo.png")
+            _write_gif(in_gif)
+            Image.new("RGBA", (10, 10), (0, 0, 255, 255)).save(logo)
+
+            timelapse.composite_timelapse(
+                in_gif,
+                out_gif,
+                title="Title",
+                text_sequence=["2000", "2001", "2002"],
+                font_size=10,
+                progress_bar_color="white",
+                progress_bar_height=2,
+                colorbar=logo,
+                colorbar_xy=(0, 0),
+                fading=0.2,
+                frames_per_second=10,
+                webp=True,
+            )
+
+            with Image.open(out_gif) as image:
+                frames = [
+                    np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(image)
+                ]
+            self.assertTrue(os.path.exists(out_gif.replace(".gif", ".webp")))
+
+        # Two faded frames are inserted between the three source frames.
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(frames[0].shape, (48, 64, 3))
+        # The progress bar grows with each source frame.
+        self.assertEqual(frames[0][-1, 20].tolist(), [255, 255, 255])
+        self.assertNotEqual(frames[0][-1, 30].tolist(), [255, 255, 255])
+        self.assertEqual(frames[4][-1, 63].tolist(), [255, 255, 255])
+        # The colorbar is pasted on every frame.
+        self.assertEqual(frames[2][5, 5].tolist(), [0, 0, 255])
+        # The faded frame is between its neighbors.
+        self.assertLess(frames[0][24, 32, 0], frames[1][24, 32, 0])
+        self.assertLess(frames[1][24, 32, 0], frames[2][24, 32, 0])
+
+    def test_composite_timelapse_from_array(self):
+        frames = np.zeros((2, 20, 30, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_gif = os.path.join(tmpdir, "out.gif")
+            timelapse.composite_timelapse(
+                frames, out_gif, progress_bar_color="white", progress_bar_height=2
+            )
+            with Image.open(out_gif) as image:
+                self.assertEqual(image.n_frames, 2)
+                self.assertEqual(image.size, (30, 20))
+
+    def test_is_high_resolution(self):
+        self.assertFalse(timelapse._is_high_resolution(768))
+        self.assertTrue(timelapse._is_high_resolution(769))
+        self.assertFalse(timelapse._is_high_resolution("768x500"))
+        self.assertTrue(timelapse._is_high_resolution("500x1000"))
+
+    def test_frame_size(self):
+        self.assertEqual(timelapse._frame_size(1000, 200.0, 100.0), (1000, 500))
+        self.assertEqual(timelapse._frame_size(1000, 100.0, 200.0), (500, 1000))
+        self.assertEqual(timelapse._frame_size("1920x1080", 1.0, 1.0), (1920, 1080))
+
+    def test_thumbnail_grid(self):
+        windows = timelapse._thumbnail_grid(1920, 1080, 768)
+        self.assertEqual(len(windows), 6)
+        self.assertTrue(
+            all(x1 - x0 <= 768 and y1 - y0 <= 768 for x0, y0, x1, y1 in windows)
+        )
+        # The windows cover the frame exactly once.
+        coverage = np.zeros((1080, 1920), dtype=int)
+        for x0, y0, x1, y1 in windows:
+            coverage[y0:y1, x0:x1] += 1
+        self.assertTrue((coverage == 1).all())
+
+    def test_samples_to_array(self):
+        rows = [
+            [1, 2000, "2001", 3.0, 4.0],
+            [0, 1000, "2000", 1.0, 2.0],
+            [0, 2000, "2001", 5.0, None],
+        ]
+        samples = timelapse._samples_to_array(rows, 3, ["B1", "B2"])
+        self.assertEqual(samples["times"], [1000, 2000])
+        self.assertEqual(samples["dates"], ["2000", "2001"])
+        values = samples["values"]
+        self.assertEqual(values.shape, (2, 3, 2))
+        self.assertEqual(values[0, 0].tolist(), [1.0, 2.0])
+        self.assertEqual(values[1, 1].tolist(), [3.0, 4.0])
+        self.assertTrue(np.isnan(values[1, 0, 1]))
+        self.assertTrue(np.isnan(values[:, 2]).all())
+
+        datetimes, band_values, dates = timelapse._valid_samples(samples, 0, 1)
+        self.assertEqual(band_values, [2.0])
+        self.assertEqual(dates, ["2000"])
+        self.assertEqual(len(datetimes), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()